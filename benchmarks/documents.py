@@ -0,0 +1,127 @@
+"""
+Synthetic JSON documents for the jsoncolor benchmarks.
+
+Each shape stresses a different part of the pipeline:
+
+    deep     deeply nested objects and arrays
+    wide     a single object with very many keys
+    numbers  long arrays of integers and floats
+    strings  string-heavy records with escapes and non-ASCII text
+    ndjson   newline-delimited records (JSON Lines)
+
+Documents are generated as text, element by element, so that even 1 GB
+documents can be written to disk without building them in memory first.
+"""
+
+import json
+import random
+import re
+
+SHAPES = ('deep', 'wide', 'numbers', 'strings', 'ndjson')
+
+UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def parse_size(text):
+    """Convert a size such as '64K', '16M' or '1G' to a number of bytes."""
+    m = re.match(r'^\s*(\d+)\s*([KMG]?)B?\s*$', text.upper())
+    if m is None:
+        raise ValueError('invalid size: {!r}'.format(text))
+    return int(m.group(1)) * UNITS[m.group(2)]
+
+
+def format_size(size):
+    """Convert a number of bytes to the shortest of '1G', '64K', '100'."""
+    for unit in ('G', 'M', 'K'):
+        if size >= UNITS[unit] and size % UNITS[unit] == 0:
+            return '{}{}'.format(size // UNITS[unit], unit)
+    return str(size)
+
+
+def _deep(rnd, i):
+    depth = rnd.randint(8, 32)
+    node = {'leaf': i, 'ok': True}
+    for level in range(depth):
+        if level % 2:
+            node = [level, node, None]
+        else:
+            node = {'level': level, 'child': node}
+    return node
+
+
+def _wide(rnd, i):
+    return 'key_{:09d}'.format(i), rnd.choice(
+        [i, i * 0.5, 'value {}'.format(i), True, None])
+
+
+def _numbers(rnd, i):
+    return rnd.randint(-10 ** 9, 10 ** 9) if i % 2 else rnd.random() * 1e6
+
+
+def _strings(rnd, i):
+    words = ' '.join(rnd.choice(('lorem', 'ipsum', 'd\u00f6lor', 'sit',
+                                 '"amet"', 'tab\there', '\u2603'))
+                     for _ in range(rnd.randint(5, 40)))
+    return {'id': 'req-{}'.format(i), 'message': words,
+            'path': 'C:\\logs\\{}.txt'.format(i)}
+
+
+def _record(rnd, i):
+    return {'ts': 1500000000 + i, 'level': rnd.choice(('info', 'warn')),
+            'msg': 'request {} done'.format(i), 'ms': rnd.random() * 100,
+            'tags': ['api', 'v2'], 'user': None}
+
+
+def iter_document(shape, size, seed=0):
+    """
+    Generate a synthetic document as text.
+
+    Args:
+        shape (str): one of SHAPES
+        size (int): approximate size in bytes (the document is closed as
+            soon as it reaches this size)
+        seed (int): random seed, so documents are reproducible
+
+    Yields:
+        pieces of indented json text (ndjson: one compact record per line)
+    """
+    rnd = random.Random(seed)
+    written, i = 0, 0
+    if shape == 'ndjson':
+        while written < size:
+            line = json.dumps(_record(rnd, i), separators=(',', ':')) + '\n'
+            written += len(line)
+            i += 1
+            yield line
+        return
+
+    if shape == 'wide':
+        opener, closer = '{', '\n}\n'
+    else:
+        opener, closer = '[', '\n]\n'
+    yield opener
+    written = len(opener) + len(closer)
+    while written < size:
+        if shape == 'wide':
+            key, value = _wide(rnd, i)
+            piece = '\n  {}: {}'.format(json.dumps(key), json.dumps(value))
+        else:
+            item = {'deep': _deep, 'numbers': _numbers,
+                    'strings': _strings}[shape](rnd, i)
+            piece = '\n  ' + json.dumps(item, indent=2).replace(
+                '\n', '\n  ')
+        if i:
+            piece = ',' + piece
+        written += len(piece)
+        i += 1
+        yield piece
+    yield closer
+
+
+def write_document(path, shape, size, seed=0):
+    """Write a synthetic document to path; return its size in bytes."""
+    total = 0
+    with open(path, 'w', encoding='utf-8') as fileobj:
+        for piece in iter_document(shape, size, seed):
+            total += fileobj.write(piece)
+    return total
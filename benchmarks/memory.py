@@ -0,0 +1,251 @@
+"""
+Peak-memory benchmark for the jsoncolor entry points.
+
+Measures how much memory each public entry point needs on top of its
+input, for synthetic documents of several sizes (see documents.py):
+
+    format_json    format_json(data)
+    render_json    render_json(data, escapes=...)
+    highlighter    highlighter(format_json(data), style)
+    output         cli.output(data, ctx, 2) on a color terminal
+    stream         cli.stream_output(jsonfile, ctx, 2)
+    raw            cli.raw_output(jsonfile, ctx)
+
+Every measurement runs in a fresh interpreter.  Two peaks are recorded:
+the tracemalloc peak of the call (python allocations only) and the growth
+of the process' maximum resident set size during the call.  Both are
+divided by the size of the input document to get bytes per input byte.
+
+Budgets are set per entry point, in bytes per input byte, and apply to
+--metric (tracemalloc by default).  A fixed --allowance is added on top so
+that buffers of constant size do not fail small documents.  The exit
+status is 1 if any entry point goes over its budget:
+
+    python benchmarks/memory.py --sizes 1M,16M --budget output=12
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from documents import SHAPES, format_size, parse_size, write_document  # noqa
+
+ENTRY_POINTS = ('format_json', 'render_json', 'highlighter', 'output',
+                'stream', 'raw')
+
+# peak memory allowed per input byte
+BUDGETS = {
+    'format_json': 7.0,
+    'render_json': 12.0,
+    'highlighter': 16.0,
+    'output': 2.0,
+    'stream': 0.25,
+    'raw': 0.25,
+}
+
+# peak memory allowed regardless of the input size
+ALLOWANCE = 4 * 1024 * 1024
+
+# entry points that take a file object instead of a python object
+FILE_ENTRY_POINTS = ('stream', 'raw')
+
+
+def max_rss():
+    """Return the maximum resident set size of this process in bytes."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def entry_point(name, path):
+    """Prepare an entry point; return a callable that runs it once."""
+    import click
+    import click._termui_impl
+
+    from jsoncolor import cli
+    from jsoncolor.config import CONFIG
+    from jsoncolor.core import create_escape_codes
+    from jsoncolor.core import create_style_class
+    from jsoncolor.core import format_json
+    from jsoncolor.core import highlighter
+    from jsoncolor.core import render_json
+
+    style = CONFIG['styles']['solarized']
+    # behave as if stdin and stdout were a terminal: indented and colored
+    click._termui_impl.isatty = lambda stream: True
+    sys.stdout = open(os.devnull, 'w')
+    ctx = click.Context(cli.main, color=True)
+
+    if name in FILE_ENTRY_POINTS:
+        def run():
+            with open(path, 'rb') as jsonfile:
+                if name == 'stream':
+                    cli.stream_output(jsonfile, ctx, 2, style)
+                else:
+                    cli.raw_output(jsonfile, ctx, style)
+        return run
+
+    with open(path, 'rb') as fileobj:
+        data = json.loads(fileobj.read())
+    if name == 'format_json':
+        return lambda: format_json(data)
+    if name == 'render_json':
+        escapes = create_escape_codes(style)
+        return lambda: render_json(data, escapes=escapes)
+    if name == 'highlighter':
+        text = format_json(data)
+        style_class = create_style_class(style)
+        highlighter('{}', style_class)
+        return lambda: highlighter(text, style_class)
+    return lambda: cli.output(data, ctx, 2, style)
+
+
+def measure(name, path):
+    """Run an entry point in this process; return the peaks in bytes."""
+    import gc
+    import tracemalloc
+
+    run = entry_point(name, path)
+    gc.collect()
+    before = max_rss()
+    run()
+    rss = max(0, max_rss() - before)
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'tracemalloc': peak, 'rss': rss}
+
+
+def measure_child(name, path):
+    """Run measure() in a fresh interpreter."""
+    out = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), '--child', name, path],
+        universal_newlines=True)
+    return json.loads(out)
+
+
+def parse_budget(text):
+    """Convert 'ENTRY=BYTES' to an (entry, bytes per input byte) tuple."""
+    name, _, value = text.partition('=')
+    if name not in ENTRY_POINTS:
+        raise argparse.ArgumentTypeError('unknown entry point: ' + name)
+    return name, float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='jsoncolor peak-memory benchmark')
+    parser.add_argument('--shapes', default='deep,wide,numbers,strings',
+                        help='comma-separated shapes [%(default)s]')
+    parser.add_argument('--sizes', default='64K,1M,8M',
+                        help='comma-separated sizes [%(default)s]')
+    parser.add_argument('--entry-points', default=','.join(ENTRY_POINTS),
+                        help='comma-separated entry points [%(default)s]')
+    parser.add_argument('--max-pygments-size', type=parse_size,
+                        default=parse_size('4M'),
+                        help='largest document run through highlighter()')
+    parser.add_argument('--metric', choices=('tracemalloc', 'rss'),
+                        default='tracemalloc',
+                        help='peak checked against the budgets')
+    parser.add_argument('--budget', type=parse_budget, action='append',
+                        default=[], metavar='ENTRY=BYTES',
+                        help='peak bytes allowed per input byte')
+    parser.add_argument('--budget-file', default=None,
+                        help='json file of {entry point: bytes per byte}')
+    parser.add_argument('--allowance', type=parse_size,
+                        default=ALLOWANCE,
+                        help='peak bytes allowed on top of the budget')
+    parser.add_argument('-o', '--output', default='memory.json')
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    opts = parser.parse_args(argv)
+
+    if opts.child:
+        print(json.dumps(measure(*opts.child)), file=sys.__stdout__)
+        return 0
+
+    budgets = dict(BUDGETS)
+    if opts.budget_file:
+        with open(opts.budget_file) as fileobj:
+            budgets.update(json.load(fileobj))
+    budgets.update(opts.budget)
+
+    for shape in opts.shapes.split(','):
+        if shape not in SHAPES or shape == 'ndjson':
+            parser.error('unsupported shape: ' + shape)
+
+    results, failures = [], []
+    print('{:<8} {:>6} {:<12} {:>12} {:>10} {:>12} {:>10} {:>8}'.format(
+        'shape', 'size', 'entry', 'tracemalloc', 'per byte', 'rss',
+        'per byte', 'budget'))
+    with tempfile.TemporaryDirectory() as tmp:
+        for shape in opts.shapes.split(','):
+            for size in [parse_size(s) for s in opts.sizes.split(',')]:
+                path = os.path.join(tmp, '{}-{}.json'.format(shape, size))
+                write_document(path, shape, size)
+                nbytes = os.path.getsize(path)
+                for name in opts.entry_points.split(','):
+                    if (name == 'highlighter' and
+                            nbytes > opts.max_pygments_size):
+                        continue
+                    peaks = measure_child(name, path)
+                    result = {
+                        'shape': shape, 'size': format_size(size),
+                        'entry': name, 'bytes': nbytes,
+                        'tracemalloc': peaks['tracemalloc'],
+                        'rss': peaks['rss'],
+                        'tracemalloc_per_byte': round(
+                            peaks['tracemalloc'] / nbytes, 3),
+                        'rss_per_byte': round(peaks['rss'] / nbytes, 3),
+                        'budget': budgets.get(name),
+                    }
+                    flag = ''
+                    if result['budget'] is not None and peaks[opts.metric] > (
+                            result['budget'] * nbytes + opts.allowance):
+                        failures.append(result)
+                        flag = '  OVER'
+                    results.append(result)
+                    print('{shape:<8} {size:>6} {entry:<12} {tracemalloc:>12}'
+                          ' {tracemalloc_per_byte:>10.2f} {rss:>12}'
+                          ' {rss_per_byte:>10.2f} {budget:>8}'
+                          .format(**result) + flag)
+                os.remove(path)
+
+    report = {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'metric': opts.metric,
+            'allowance': opts.allowance,
+        },
+        'results': results,
+    }
+    with open(opts.output, 'w') as fileobj:
+        json.dump(report, fileobj, indent=2)
+    print('\nresults saved to ' + opts.output)
+
+    for result in failures:
+        print('{entry} over budget on {shape} {size}: {value:.2f} bytes per'
+              ' input byte (budget {budget} + {allowance} bytes)'.format(
+                  value=result[opts.metric + '_per_byte'],
+                  allowance=opts.allowance, **result),
+              file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Start-up benchmark for the jsoncolor command-line interface.
+
+Runs `python -X importtime -m jsoncolor` several times on a tiny document
+and reports the median wall time and the import time spent in each
+top-level package.  Exits with status 1 if the median wall time exceeds
+--max-ms, so it can guard against start-up regressions in CI.
+
+Usage:
+    python benchmarks/startup.py [--runs N] [--max-ms MS] [-- CLI ARGS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+JSONFILE = os.path.join(ROOT, 'tests', 'data', 'test.json')
+
+
+def run_once(cli_args):
+    """Run the CLI once; return (wall seconds, {package: import usec})."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [ROOT, env.get('PYTHONPATH')]))
+    cmd = [sys.executable, '-X', 'importtime', '-m', 'jsoncolor'] + cli_args
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+                          env=env, universal_newlines=True)
+    wall = time.perf_counter() - start
+    packages = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        if own.strip().isdigit():
+            name = name.strip().split('.')[0]
+            packages[name] = packages.get(name, 0) + int(own)
+    return wall, packages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='fail if the median wall time is above this')
+    parser.add_argument('--top', type=int, default=10,
+                        help='number of packages to list')
+    parser.add_argument('cli_args', nargs='*',
+                        default=['--nocolor', JSONFILE])
+    args = parser.parse_args(argv)
+
+    walls, imports = [], {}
+    for _ in range(args.runs):
+        wall, packages = run_once(args.cli_args)
+        walls.append(wall)
+        for name, usec in packages.items():
+            imports.setdefault(name, []).append(usec)
+
+    median = statistics.median(walls) * 1000
+    print('jsoncolor {}: median {:.1f} ms over {} runs'.format(
+        ' '.join(args.cli_args), median, args.runs))
+    ranked = sorted(imports.items(), key=lambda i: -statistics.median(i[1]))
+    for name, usecs in ranked[:args.top]:
+        print('  {:<30} {:8.1f} ms'.format(
+            name, statistics.median(usecs) / 1000))
+    if args.max_ms is not None and median > args.max_ms:
+        print('FAIL: above budget of {} ms'.format(args.max_ms))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
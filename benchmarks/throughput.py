@@ -0,0 +1,250 @@
+"""
+Throughput benchmark for the jsoncolor core and command-line interface.
+
+Generates synthetic documents (see documents.py) and times every stage of
+the pipeline on them, plus the end-to-end CLI, reporting MB/s and latency
+percentiles.  Results are saved as JSON so that two commits can be
+compared:
+
+    python benchmarks/throughput.py --sizes 1K,1M,16M -o before.json
+    git checkout other-commit
+    python benchmarks/throughput.py --sizes 1K,1M,16M -o after.json \\
+        --compare before.json --tolerance 10
+
+With --compare the exit status is 1 if any stage got slower (median
+latency) by more than --tolerance percent.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from documents import SHAPES, format_size, parse_size, write_document  # noqa
+from jsoncolor.config import CONFIG  # noqa
+from jsoncolor.core import create_escape_codes  # noqa
+from jsoncolor.core import create_style_class  # noqa
+from jsoncolor.core import format_json  # noqa
+from jsoncolor.core import highlighter  # noqa
+from jsoncolor.core import iter_raw  # noqa
+from jsoncolor.core import render_json  # noqa
+from jsoncolor.lines import iter_lines  # noqa
+from jsoncolor.stream import iter_chunks  # noqa
+from jsoncolor.stream import iter_stream  # noqa
+from jsoncolor.stream import read_chunks  # noqa
+
+STYLE = CONFIG['styles']['solarized']
+
+CLI_STAGES = {
+    'cli': ['--nocolor'],
+    'cli --stream': ['--stream'],
+    'cli --raw': ['--raw'],
+    'cli --lines': ['--lines'],
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_cli(path, args):
+    """Run the jsoncolor command on path with its output discarded."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [ROOT, env.get('PYTHONPATH')]))
+    subprocess.run([sys.executable, '-m', 'jsoncolor'] + args + [path],
+                   stdout=subprocess.DEVNULL, stdin=subprocess.DEVNULL,
+                   env=env, check=True)
+
+
+def stage_functions(shape, path, size, opts):
+    """Return {stage: callable} for one document."""
+    escapes = create_escape_codes(STYLE)
+    style = create_style_class(STYLE)
+    stages = {}
+    state = {}
+
+    def load():
+        with open(path, 'rb') as fileobj:
+            state['data'] = json.loads(fileobj.read())
+
+    def consume(chunks):
+        for _ in chunks:
+            pass
+
+    def file_stage(make):
+        def run():
+            with open(path, 'rb') as fileobj:
+                consume(make(fileobj))
+        return run
+
+    if shape != 'ndjson' and size <= opts.max_object_size:
+        load()
+        data = state['data']
+        text = format_json(data)
+        stages['parse'] = load
+        stages['format_json'] = lambda: format_json(data)
+        stages['render_json'] = lambda: render_json(data, escapes=escapes)
+        if size <= opts.max_pygments_size:
+            stages['highlighter'] = lambda: highlighter(text, style)
+    if shape != 'ndjson':
+        stages['stream'] = file_stage(
+            lambda f: iter_stream(read_chunks(f), escapes=escapes))
+    else:
+        stages['lines'] = file_stage(
+            lambda f: iter_lines(f, escapes=escapes, jobs=opts.jobs))
+    stages['raw'] = file_stage(lambda f: iter_raw(iter_chunks(f), escapes))
+
+    if not opts.no_cli:
+        for name, args in CLI_STAGES.items():
+            if (name == 'cli --lines') != (shape == 'ndjson'):
+                continue
+            if name == 'cli' and size > opts.max_object_size:
+                continue
+            stages[name] = (lambda a: lambda: run_cli(path, a))(args)
+    return stages
+
+
+def measure(func, size, opts):
+    """Time func repeatedly; return a result dict."""
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    runs = opts.repeat or max(3, min(50, int(opts.budget / max(first, 1e-6))))
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    p50 = percentile(times, 50)
+    return {
+        'runs': runs,
+        'mb_per_s': round(size / p50 / 1e6, 3),
+        'p50_ms': round(p50 * 1000, 4),
+        'p90_ms': round(percentile(times, 90) * 1000, 4),
+        'p99_ms': round(percentile(times, 99) * 1000, 4),
+    }
+
+
+def git_commit():
+    """Return the abbreviated hash of the checked out commit, or None."""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            stderr=subprocess.DEVNULL, universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Print the change in median latency; return the regressions."""
+    old = {(r['shape'], r['size'], r['stage']): r
+           for r in baseline['results']}
+    regressions = []
+    print('\n{:<8} {:>6} {:<14} {:>10} {:>10} {:>8}'.format(
+        'shape', 'size', 'stage', 'before ms', 'after ms', 'change'))
+    for r in results:
+        before = old.get((r['shape'], r['size'], r['stage']))
+        if before is None:
+            continue
+        change = (r['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100
+        flag = ''
+        if change > tolerance:
+            regressions.append(r)
+            flag = '  SLOWER'
+        print('{:<8} {:>6} {:<14} {:>10.2f} {:>10.2f} {:>+7.1f}%{}'.format(
+            r['shape'], r['size'], r['stage'], before['p50_ms'],
+            r['p50_ms'], change, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='jsoncolor throughput benchmark')
+    parser.add_argument('--shapes', default=','.join(SHAPES),
+                        help='comma-separated shapes [%(default)s]')
+    parser.add_argument('--sizes', default='1K,64K,1M,16M',
+                        help='comma-separated sizes, up to 1G '
+                             '[%(default)s]')
+    parser.add_argument('--stages', default=None,
+                        help='comma-separated stages [all]')
+    parser.add_argument('--repeat', type=int, default=None,
+                        help='runs per stage [adaptive]')
+    parser.add_argument('--budget', type=float, default=2.0,
+                        help='seconds per stage for adaptive runs')
+    parser.add_argument('--max-object-size', type=parse_size,
+                        default=parse_size('256M'),
+                        help='largest document loaded as a python object')
+    parser.add_argument('--max-pygments-size', type=parse_size,
+                        default=parse_size('16M'),
+                        help='largest document run through highlighter()')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='processes for the lines stage')
+    parser.add_argument('--no-cli', action='store_true',
+                        help='skip the end-to-end CLI stages')
+    parser.add_argument('-o', '--output', default='throughput.json')
+    parser.add_argument('--compare', default=None,
+                        help='baseline results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=10.0,
+                        help='allowed slowdown in percent [%(default)s]')
+    opts = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in opts.sizes.split(',')]
+    wanted = opts.stages.split(',') if opts.stages else None
+    results = []
+    print('{:<8} {:>6} {:<14} {:>9} {:>9} {:>9} {:>9}'.format(
+        'shape', 'size', 'stage', 'MB/s', 'p50 ms', 'p90 ms', 'p99 ms'))
+    with tempfile.TemporaryDirectory() as tmp:
+        for shape in opts.shapes.split(','):
+            for size in sizes:
+                path = os.path.join(tmp, '{}-{}.json'.format(shape, size))
+                write_document(path, shape, size)
+                nbytes = os.path.getsize(path)
+                stages = stage_functions(shape, path, nbytes, opts)
+                for stage, func in stages.items():
+                    if wanted and stage not in wanted:
+                        continue
+                    result = measure(func, nbytes, opts)
+                    result.update(shape=shape, size=format_size(size),
+                                  stage=stage, bytes=nbytes)
+                    results.append(result)
+                    print('{shape:<8} {size:>6} {stage:<14} {mb_per_s:>9.2f}'
+                          ' {p50_ms:>9.2f} {p90_ms:>9.2f} {p99_ms:>9.2f}'
+                          .format(**result))
+                os.remove(path)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'results': results,
+    }
+    with open(opts.output, 'w') as fileobj:
+        json.dump(report, fileobj, indent=2)
+    print('\nresults saved to ' + opts.output)
+
+    if opts.compare:
+        with open(opts.compare) as fileobj:
+            baseline = json.load(fileobj)
+        if compare(results, baseline, opts.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,13 @@
 """jsoncolor - A JSON text coloring and highlighting tool."""
 
-from . import core
-
 __version__ = '0.2'
+
+
+def __getattr__(name):
+    # imported on first use, so that the thin client starts without it
+    if name == 'core':
+        import importlib
+
+        return importlib.import_module('jsoncolor.core')
+    raise AttributeError('module {!r} has no attribute {!r}'.format(
+        __name__, name))
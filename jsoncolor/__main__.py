@@ -0,0 +1,5 @@
+"""Allow jsoncolor to be run with `python -m jsoncolor`."""
+
+from jsoncolor.client import main
+
+main(prog_name='jsoncolor')
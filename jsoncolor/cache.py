@@ -0,0 +1,175 @@
+"""
+Render Cache
+
+Colored output of large documents kept on disk, so that opening the same
+document again streams the stored bytes instead of parsing, formatting and
+coloring it.  Entries are addressed by a hash of the input bytes and of
+every setting that changes the output; the least recently used entries
+are removed once the cache grows past its size cap.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+import click
+
+# bumped whenever the rendered output of a document changes
+CACHE_VERSION = 1
+
+CACHE_SIZE = 512 * 1024 * 1024
+
+# inputs smaller than this are rendered faster than they are cached
+MIN_SIZE = 1024 * 1024
+
+CACHE_ENV = 'JSONCOLOR_CACHE_DIR'
+
+SUFFIX = '.out'
+
+
+def cache_dir():
+    """Return $JSONCOLOR_CACHE_DIR, or 'cache' in the config directory."""
+    return (os.environ.get(CACHE_ENV) or
+            os.path.join(click.get_app_dir('jsoncolor'), 'cache'))
+
+
+def render_digest(**settings):
+    """
+    Start the hash of a rendered document.
+
+    Args:
+        settings: everything besides the input that changes the output,
+            e.g. escape codes, indent and compact; json-serializable
+
+    Returns:
+        hashlib hash, to be updated with the input bytes
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    settings['version'] = CACHE_VERSION
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    digest.update(b'\0')
+    return digest
+
+
+class RenderCache:
+    """
+    Directory of rendered documents with a size cap and LRU eviction.
+
+    An entry's modification time is its last use; entries are written to
+    a temporary file and renamed into place, so concurrent runs never see
+    a partial entry.
+    """
+
+    def __init__(self, directory=None, max_size=CACHE_SIZE):
+        """
+        Args:
+            directory (str): cache directory, default: cache_dir()
+            max_size (int): total size in bytes kept in the cache
+        """
+        self.directory = cache_dir() if directory is None else directory
+        self.max_size = max_size
+
+    def path(self, key):
+        """Return the file name of the entry for key."""
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used.
+
+        Returns:
+            file name of the entry, or None on a cache miss
+        """
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    @contextmanager
+    def store(self, key):
+        """
+        Add an entry.
+
+        The entry is only added if the block completes; entries larger
+        than the cache are dropped.
+
+        Yields:
+            binary file object to write the rendered output to
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fileobj:
+                yield fileobj
+            if os.path.getsize(tmp) <= self.max_size:
+                os.replace(tmp, self.path(key))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.evict()
+
+    def entries(self):
+        """Return (mtime, size, path) of every entry, oldest first."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            entries.append((info.st_mtime_ns, info.st_size, path))
+        return sorted(entries)
+
+    def evict(self):
+        """Remove the least recently used entries above the size cap."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """
+        Remove every entry.
+
+        Returns:
+            number of entries removed
+        """
+        count = 0
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+                count += 1
+            except OSError:
+                pass
+        return count
+
+
+class TeeStream:
+    """File object wrapper that also writes everything to a second file."""
+
+    def __init__(self, stream, copy):
+        self._stream = stream
+        self._copy = copy
+
+    def write(self, data):
+        self._copy.write(data.encode() if isinstance(data, str) else data)
+        return self._stream.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
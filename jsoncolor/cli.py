@@ -1,6 +1,8 @@
 """Command-Line Interface."""
 
+import os
 import sys
+from itertools import chain
 
 import click
 import click._termui_impl
@@ -8,13 +10,40 @@ from click import argument
 from click import option
 from click import version_option
 
-from jsoncore.cli import optional_jsonfile
-from jsonconfig import Config
-
-from jsoncolor.core import create_style_class
+from jsoncolor.cache import MIN_SIZE
+from jsoncolor.cache import RenderCache
+from jsoncolor.cache import TeeStream
+from jsoncolor.cache import render_digest
+from jsoncolor.compress import decompress
+from jsoncolor.core import BACKENDS
+from jsoncolor.core import COLOR_DEPTHS
+from jsoncolor.core import create_escape_codes
+from jsoncolor.core import detect_colors
 from jsoncolor.core import format_json
+from jsoncolor.core import get_backend
 from jsoncolor.core import get_color_style
-from jsoncolor.core import highlighter
+from jsoncolor.core import iter_json
+from jsoncolor.core import iter_json_parallel
+from jsoncolor.core import iter_raw
+from jsoncolor.errors import DecompressError
+from jsoncolor.errors import TokenizeError
+from jsoncolor.files import expand_paths
+from jsoncolor.files import iter_files
+from jsoncolor.lines import follow
+from jsoncolor.lines import iter_lines
+from jsoncolor.lines import render_batch
+from jsoncolor.pager import page
+from jsoncolor.selector import READ_SIZE
+from jsoncolor.selector import iter_select
+from jsoncolor.selector import parse_path
+from jsoncolor.stream import iter_chunks
+from jsoncolor.stream import iter_stream
+from jsoncolor.stream import map_file
+from jsoncolor.stream import read_chunks
+from jsoncolor.timings import Timings
+from jsoncolor.timings import count_tokens
+from jsoncolor.writer import BUFFER_SIZE
+from jsoncolor.writer import ChunkWriter
 
 
 SAMPLE = {
@@ -31,26 +60,430 @@ SAMPLE = {
 }
 
 
-def output(data, ctx, indent, style=None):
-    """Output data to stdout."""
+def expand_jsonfiles(ctx, param, value):
+    """
+    Callback for the JSONFILES argument.
+
+    Returns the file names with glob patterns expanded, ('-',) for stdin
+    when data is piped in, or () when there is nothing to read.
+    """
+    if not value and not click._termui_impl.isatty(sys.stdin):
+        return ('-',)
+    return tuple(expand_paths(value))
+
+
+optional_jsonfiles = argument('jsonfiles', nargs=-1,
+                              callback=expand_jsonfiles)
+
+
+def open_file(path):
+    """Open one of JSONFILES in binary mode; '-' is stdin."""
+    if path == '-':
+        return sys.stdin.buffer
+    return open(path, 'rb')
+
+
+def open_jsonfile(path):
+    """
+    Open one of JSONFILES, or return None for no file.
+
+    gzip, bzip2 and xz input is decompressed while it is read.  Parsing is
+    left to the selected output mode.
+    """
+    if path is None:
+        return None
+    try:
+        return decompress(open_file(path))
+    except OSError as err:
+        raise click.BadParameter('{!r}: {}'.format(
+            path, err.strerror or err), param_hint='JSONFILE')
+
+
+def read_json(jsonfile, timings=None, digest=None):
+    """
+    Read the whole content of JSONFILE.
+
+    Args:
+        jsonfile (file): binary file object
+        timings (Timings): records reading as the 'read' stage
+        digest (hashlib hash): updated with the bytes read
+
+    Returns:
+        bytes, or str for memory-mapped files
+    """
+    stats = Timings() if timings is None else timings
+    with stats.measure('read') as stage:
+        mapped = map_file(jsonfile)
+        if mapped is None:
+            content = jsonfile.read()
+            stage.add('bytes_in', len(content))
+            if digest is not None:
+                digest.update(content)
+            return content
+        with mapped:
+            stage.add('bytes_in', len(mapped))
+            if digest is not None:
+                digest.update(mapped)
+            try:
+                return str(mapped, 'utf-8-sig')
+            except ValueError as err:
+                raise click.BadParameter(str(err), param_hint='JSONFILE')
+
+
+def parse_json(content, backend=None, timings=None):
+    """
+    Parse content read by read_json(); None if there is no content.
+
+    Parsing is recorded as the 'parse' stage if timings is given.
+    """
+    if not content.strip():
+        return None
+    stats = Timings() if timings is None else timings
+    try:
+        with stats.measure('parse') as stage:
+            stage.add('bytes_in', len(content))
+            data = get_backend(backend).loads(content)
+    except ValueError as err:
+        raise click.BadParameter(str(err), param_hint='JSONFILE')
+    if timings is not None:
+        stage.add('tokens', count_tokens(data))
+    return data
+
+
+def load_json(jsonfile, backend=None, timings=None):
+    """
+    Parse JSONFILE into a python object; None if there is no content.
+
+    Reading and parsing are recorded as the 'read' and 'parse' stages if
+    timings (a Timings instance) is given.
+    """
+    if jsonfile is None:
+        return None
+    return parse_json(read_json(jsonfile, timings), backend, timings)
+
+
+def layout(indent):
+    """Return (compact, indent) depending on whether stdin is a terminal."""
+    if click._termui_impl.isatty(sys.stdin):
+        return False, 2 if indent is None else indent
+    return indent is None, indent
+
+
+def color_depth(ctx):
+    """Return the color depth set with --colors, detected if 'auto'."""
+    colors = ctx.meta.get('jsoncolor.colors', 'auto')
+    return detect_colors() if colors == 'auto' else colors
+
+
+def color_codes(ctx, style=None):
+    """Return escape codes for style, or None if output is not colored."""
+    if ctx.color and click._termui_impl.isatty(sys.stdout):
+        return create_escape_codes(style, color_depth(ctx))
+    return None
+
+
+def json_backend(ctx):
+    """Return the JSON backend name set with --backend."""
+    return ctx.meta.get('jsoncolor.backend')
+
+
+def timings(ctx):
+    """Return the Timings of this run if --timings is set, else None."""
+    return ctx.meta.get('jsoncolor.timings')
+
+
+def writer(ctx):
+    """Return a buffered writer for stdout, sized by --buffer-size."""
+    out = ChunkWriter(buffer_size=ctx.meta.get('jsoncolor.buffer_size',
+                                               BUFFER_SIZE))
+    if ctx.meta.get('jsoncolor.tee') is not None:
+        out.stream = TeeStream(out.stream, ctx.meta['jsoncolor.tee'])
+    if timings(ctx) is not None:
+        out.stream = timings(ctx).stream('write', out.stream)
+    return out
+
+
+def reading(ctx, chunks):
+    """Return input chunks, timed as the 'read' stage with --timings."""
+    if timings(ctx) is None:
+        return chunks
+    return timings(ctx).iter('read', chunks, 'bytes_in')
+
+
+def write_chunks(ctx, chunks):
+    """
+    Write output chunks to stdout.
+
+    With --timings, producing them is timed as the 'format' stage, apart
+    from the time spent reading input and writing to stdout.
+    """
+    with writer(ctx) as out:
+        if timings(ctx) is None:
+            out.writelines(chunks)
+            return
+        with timings(ctx).measure('format'):
+            out.writelines(chunks)
+            out.flush()
+
+
+def report_timings(ctx, fmt='text'):
+    """Print the --timings report to stderr."""
+    click.echo(timings(ctx).format(fmt), err=True, nl=False)
+
+
+def output(data, ctx, indent, style=None, max_depth=None, max_items=None,
+           max_string=None):
+    """
+    Output data to stdout, as a preview if any max_* limit is set.
+
+    Colored output of a list or dict is rendered in a process pool if
+    --jobs is more than 1.
+    """
     try:
         if data:
-            if click._termui_impl.isatty(sys.stdin):
-                compact = False
-                indent = 2 if indent is None else indent
+            compact, indent = layout(indent)
+            escapes = color_codes(ctx, style)
+            limits = {k: v for k, v in (('max_depth', max_depth),
+                                        ('max_items', max_items),
+                                        ('max_string', max_string))
+                      if v is not None}
+            jobs = ctx.meta.get('jsoncolor.jobs', 1)
+            if escapes is not None and not limits and jobs > 1:
+                chunks = iter_json_parallel(data, compact, indent, escapes,
+                                            jobs)
+            elif escapes is not None or limits:
+                chunks = iter_json(data, compact, indent, escapes, **limits)
             else:
-                compact = indent is None
-            output = format_json(data, compact, indent)
-            if ctx.color and click._termui_impl.isatty(sys.stdout):
-                if style is None:
-                    output = highlighter(output)
-                else:
-                    output = highlighter(output, create_style_class(style))
-            click.echo(output)
+                # lazily, so that --timings charges it to 'format'
+                chunks = map(format_json, [data], [compact], [indent],
+                             [json_backend(ctx)], [True])
+            write_chunks(ctx, chain(chunks, ['\n']))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+def cached_output(jsonfile, ctx, indent, style=None, **limits):
+    """
+    Output JSONFILE like output(), through the render cache.
+
+    Large documents that were output in color before with the same
+    settings are copied from the cache; others are rendered and added to
+    it.  Output without colors is written about as fast as it is read
+    from the cache, and is not cached.
+    """
+    if jsonfile is None:
+        return
+    escapes = color_codes(ctx, style)
+    if escapes is None:
+        data = load_json(jsonfile, json_backend(ctx), timings(ctx))
+        return output(data, ctx, indent, style, **limits)
+    compact, layout_indent = layout(indent)
+    digest = render_digest(escapes=escapes, compact=compact,
+                           indent=layout_indent, limits=limits,
+                           backend=get_backend(json_backend(ctx)).name)
+    content = read_json(jsonfile, timings(ctx), digest)
+    if len(content) < MIN_SIZE:
+        data = parse_json(content, json_backend(ctx), timings(ctx))
+        return output(data, ctx, indent, style, **limits)
+    cache = RenderCache()
+    key = digest.hexdigest()
+    path = cache.get(key)
+    if path is not None:
+        try:
+            with open(path, 'rb') as cached:
+                write_chunks(ctx, iter_chunks(cached))
+        except KeyboardInterrupt:
+            sys.exit(0)
+        return
+    data = parse_json(content, json_backend(ctx), timings(ctx))
+    del content
+    try:
+        os.makedirs(cache.directory, exist_ok=True)
+    except OSError:
+        return output(data, ctx, indent, style, **limits)
+    with cache.store(key) as copy:
+        ctx.meta['jsoncolor.tee'] = copy
+        try:
+            output(data, ctx, indent, style, **limits)
+        finally:
+            del ctx.meta['jsoncolor.tee']
+
+
+def path_output(jsonfile, ctx, indent, steps, style=None, **limits):
+    """
+    Output the values of JSONFILE selected by --path, one per document.
+
+    Only the selected values are parsed; the rest of the input is skipped
+    while it is being read.
+    """
+    try:
+        if jsonfile is not None:
+            compact, indent = layout(indent)
+            escapes = color_codes(ctx, style)
+            backend = json_backend(ctx)
+            chunks = reading(ctx, iter_chunks(jsonfile, READ_SIZE))
+            write_chunks(ctx, iter_selected(ctx, iter_select(chunks, steps),
+                                            compact, indent, escapes,
+                                            backend, limits))
+    except TokenizeError as err:
+        raise click.ClickException(str(err))
     except KeyboardInterrupt:
         sys.exit(0)
 
 
+def iter_selected(ctx, values, compact, indent, escapes, backend, limits):
+    """
+    Format and color selected values.
+
+    Args:
+        values (iterable): json text of each value, from iter_select()
+        limits (dict): max_* limits of a preview
+
+    Yields:
+        output chunks, a newline after each value
+    """
+    loads = get_backend(backend).loads
+    for value in values:
+        if timings(ctx) is not None:
+            data = parse_json(value, backend, timings(ctx))
+        else:
+            try:
+                data = loads(value)
+            except ValueError as err:
+                raise click.BadParameter(str(err), param_hint='JSONFILE')
+        if escapes is None and not limits:
+            yield format_json(data, compact, indent, backend, True)
+        else:
+            yield from iter_json(data, compact, indent, escapes, **limits)
+        yield '\n'
+
+
+def stream_output(jsonfile, ctx, indent, style=None):
+    """Output JSONFILE to stdout while it is being read."""
+    try:
+        if jsonfile is not None:
+            compact, indent = layout(indent)
+            escapes = color_codes(ctx, style)
+            chunks = iter_stream(reading(ctx, read_chunks(jsonfile)),
+                                 compact, indent, escapes)
+            write_chunks(ctx, chunks)
+    except TokenizeError as err:
+        raise click.ClickException(str(err))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+def lines_output(jsonfile, ctx, indent, jobs=None, style=None):
+    """Output each line of JSONFILE to stdout as a separate document."""
+    try:
+        if jsonfile is not None:
+            compact, indent = layout(indent)
+            escapes = color_codes(ctx, style)
+            chunks = iter_lines(reading(ctx, jsonfile), compact, indent,
+                                escapes, jobs, backend=json_backend(ctx))
+            write_chunks(ctx, chunks)
+    except TokenizeError as err:
+        raise click.ClickException(str(err))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+def follow_output(jsonfile, ctx, indent, style=None):
+    """Output records appended to JSONFILE as they are written."""
+    try:
+        if jsonfile is not None:
+            compact, indent = layout(indent)
+            escapes = color_codes(ctx, style)
+            backend = json_backend(ctx)
+            with writer(ctx) as out:
+                for batch in follow(jsonfile):
+                    out.write(render_batch(batch, compact, indent, escapes,
+                                           backend, strict=False))
+                    out.flush()
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+def raw_output(jsonfile, ctx, style=None):
+    """Output JSONFILE to stdout colored as-is, without reformatting it."""
+    try:
+        if jsonfile is not None:
+            escapes = color_codes(ctx, style)
+            write_chunks(ctx, iter_raw(reading(ctx, iter_chunks(jsonfile)),
+                                       escapes))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+def pager_output(jsonfile, ctx, indent, style=None):
+    """Show JSONFILE in a pager, coloring only the lines on screen."""
+    if not click._termui_impl.isatty(sys.stdout):
+        return stream_output(jsonfile, ctx, indent, style)
+    try:
+        if jsonfile is not None:
+            escapes = None
+            if ctx.color:
+                escapes = create_escape_codes(style, color_depth(ctx))
+            page(iter_stream(read_chunks(jsonfile), False, indent or 2),
+                 escapes)
+    except TokenizeError as err:
+        raise click.ClickException(str(err))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+def file_header(path, first=False):
+    """Return the line output before a file with --headers."""
+    name = '(standard input)' if path == '-' else path
+    return '{}==> {} <==\n'.format('' if first else '\n', name)
+
+
+def report_error(path, err):
+    """Print why one of many files could not be output."""
+    if isinstance(err, OSError):
+        err = err.strerror or err
+    elif isinstance(err, click.ClickException):
+        err = err.format_message()
+    click.echo('Error: {}: {}'.format(path, err), err=True)
+
+
+def files_output(paths, ctx, indent, headers=False, style=None, **limits):
+    """
+    Output many JSONFILES in argument order.
+
+    Files are read, parsed and colored concurrently, a few ahead of the
+    one being written.  A file that cannot be output is reported on
+    stderr and the others still are.
+
+    Returns:
+        number of files that could not be output
+    """
+    compact, indent = layout(indent)
+    escapes = color_codes(ctx, style)
+    limits = {k: v for k, v in limits.items() if v is not None}
+    # stdin is read here: worker processes cannot share it
+    sources = (open_file(path).read() if path == '-' else path
+               for path in paths)
+    results = iter_files(sources, compact, indent, escapes,
+                         ctx.meta.get('jsoncolor.jobs'), json_backend(ctx),
+                         limits)
+    failed = 0
+    try:
+        with writer(ctx) as out:
+            for index, (path, (text, err)) in enumerate(zip(paths, results)):
+                if headers:
+                    out.write(file_header(path, first=not index))
+                if err is None:
+                    out.write(text)
+                    continue
+                out.flush()
+                report_error(path, err)
+                failed += 1
+    except KeyboardInterrupt:
+        sys.exit(0)
+    return failed
+
+
 def sample_styles(ctx):
     """Print SAMPLE in all available preset color styles."""
     styles = get_color_style(all_colors=True)
@@ -61,6 +494,8 @@ def sample_styles(ctx):
 
 def set_default(style):
     """Set default color style and save to config file."""
+    from jsonconfig import Config
+
     styles = get_color_style(all_colors=True)
     if style not in styles.keys():
         click.echo('[***] ' + style + ' NOT FOUND!\nAvailable Styles:')
@@ -76,6 +511,8 @@ def set_default(style):
 
 def create_style():
     """Print how to create a new color style."""
+    from jsonconfig import Config
+
     with Config('jsoncolor', 'r') as cfg:
         path = cfg.filename
     click.echo('To create a new color style, edit the configuration file')
@@ -88,8 +525,52 @@ def create_style():
 @option('-d', '--default', 'default', help='Set default color style')
 @option('-n', '--nocolor', is_flag=True, help='Disable syntax highlighting')
 @option('-s', '--styles', is_flag=True, help='Print all preset styles')
+@option('--stream', is_flag=True,
+        help='Color input as it is read, without loading it into memory')
+@option('-r', '--raw', is_flag=True,
+        help='Color input as-is, keeping its formatting')
+@option('-l', '--lines', is_flag=True,
+        help='Color each line as a separate document (JSON Lines)')
+@option('-f', '--follow', is_flag=True,
+        help='Output JSON Lines appended to a growing file, like tail -f')
+@option('-j', '--jobs', type=click.IntRange(1),
+        help='Number of processes for --lines [default: number of CPUs], '
+             'for coloring a large document [default: 1], or for many '
+             'files [default: a thread pool]')
+@option('-p', '--pager', is_flag=True,
+        help='Page through the input, coloring only what is on screen')
+@option('--colors', type=click.Choice(COLOR_DEPTHS + ('auto',)),
+        help='Color depth; auto detects it from COLORTERM and TERM '
+             '[default: auto]')
+@option('--buffer-size', type=click.IntRange(0),
+        help='Bytes of output written at once [default: {}]'
+             .format(BUFFER_SIZE))
+@option('--max-depth', type=click.IntRange(0),
+        help='Collapse containers nested deeper than this')
+@option('--max-items', type=click.IntRange(0),
+        help='Show at most this many items of each container')
+@option('--max-string', type=click.IntRange(0),
+        help='Truncate strings longer than this')
+@option('-H', '--headers', is_flag=True,
+        help='Print the name of each file before its output')
+@option('--path', metavar='PATH',
+        help='Output only the values at PATH, e.g. .data[*].status')
+@option('--backend', type=click.Choice(tuple(BACKENDS) + ('auto',)),
+        help='JSON library used for parsing and formatting '
+             '[default: $JSONCOLOR_BACKEND, or auto]')
+@option('--no-cache', is_flag=True,
+        help='Do not use or fill the cache of rendered documents')
+@option('--clear-cache', is_flag=True,
+        help='Empty the cache of rendered documents')
+@option('--serve', is_flag=True,
+        help='Run a daemon that colors for other jsoncolor calls, on '
+             '$JSONCOLOR_SOCKET or a per-user socket')
+@option('--timings', is_flag=True,
+        help='Print the time spent in each stage to stderr')
+@option('--timings-format', type=click.Choice(['text', 'json']),
+        help='Format of the --timings report [default: text]')
 @version_option(version='0.2', prog_name='JSON Color')
-@optional_jsonfile
+@optional_jsonfiles
 @click.pass_context
 def main(ctx, **kwds):
     """JSON text coloring."""
@@ -98,6 +579,25 @@ def main(ctx, **kwds):
         sys.exit(0)
 
     ctx.color = False if kwds['nocolor'] else True
+    if kwds['colors'] is not None:
+        ctx.meta['jsoncolor.colors'] = kwds['colors']
+    if kwds['jobs'] is not None:
+        ctx.meta['jsoncolor.jobs'] = kwds['jobs']
+    if kwds['buffer_size'] is not None:
+        ctx.meta['jsoncolor.buffer_size'] = kwds['buffer_size']
+    if kwds['timings'] or kwds['timings_format']:
+        ctx.meta['jsoncolor.timings'] = Timings()
+        ctx.call_on_close(lambda: report_timings(
+            ctx, kwds['timings_format'] or 'text'))
+
+    if kwds['serve']:
+        from jsoncolor.daemon import serve
+
+        try:
+            serve(ctx.command)
+        except OSError as err:
+            raise click.ClickException(str(err))
+        sys.exit(0)
 
     if kwds['styles']:
         sample_styles(ctx)
@@ -110,4 +610,102 @@ def main(ctx, **kwds):
         create_style()
         sys.exit(0)
 
-    output(kwds['jsonfile'], ctx, indent=2)
+    if kwds['clear_cache']:
+        count = RenderCache().clear()
+        click.echo('Removed {} cached document{}'.format(
+            count, '' if count == 1 else 's'), err=True)
+        if not kwds['jsonfiles']:
+            sys.exit(0)
+
+    try:
+        ctx.meta['jsoncolor.backend'] = get_backend(kwds['backend']).name
+    except ValueError as err:
+        raise click.BadParameter(str(err), param_hint="'--backend'")
+
+    steps = None
+    if kwds['path'] is not None:
+        try:
+            steps = parse_path(kwds['path'])
+        except ValueError as err:
+            raise click.BadParameter(str(err), param_hint="'--path'")
+        for mode in ('raw', 'lines', 'follow', 'pager', 'stream'):
+            if kwds[mode]:
+                raise click.UsageError('--path cannot be used with --' + mode)
+
+    limits = {k: kwds[k] for k in ('max_depth', 'max_items', 'max_string')}
+    if any(v is not None for v in limits.values()):
+        for mode in ('raw', 'lines', 'follow', 'pager', 'stream'):
+            if kwds[mode]:
+                raise click.UsageError('--max-depth, --max-items and '
+                                       '--max-string cannot be used with '
+                                       '--' + mode)
+
+    paths = kwds['jsonfiles']
+    if len(paths) > 1 or kwds['headers']:
+        for mode in ('follow', 'pager'):
+            if kwds[mode] and len(paths) > 1:
+                raise click.UsageError('--{} takes a single file'.format(mode))
+        failed = each_file(ctx, kwds, steps, limits)
+        sys.exit(1 if failed else 0)
+
+    kwds['jsonfile'] = open_jsonfile(paths[0] if paths else None)
+    try:
+        dispatch(ctx, kwds, steps, limits)
+    except DecompressError as err:
+        raise click.ClickException(str(err))
+
+
+def each_file(ctx, kwds, steps, limits):
+    """
+    Output each of JSONFILES, with a header first if --headers is set.
+
+    Whole documents are output concurrently by files_output(); other
+    modes, and --timings, output one file after the other.
+
+    Returns:
+        number of files that could not be output
+    """
+    paths = kwds['jsonfiles']
+    modes = ('raw', 'follow', 'lines', 'pager', 'stream')
+    if steps is None and timings(ctx) is None and not any(
+            kwds[mode] for mode in modes):
+        return files_output(paths, ctx, indent=2, headers=kwds['headers'],
+                            **limits)
+    failed = 0
+    for index, path in enumerate(paths):
+        if kwds['headers']:
+            click.echo(file_header(path, first=not index), nl=False)
+        try:
+            fileobj = open_file(path)
+            try:
+                dispatch(ctx, dict(kwds, jsonfile=decompress(fileobj)),
+                         steps, limits)
+            finally:
+                # stdin is left open, like a single file
+                if path != '-':
+                    fileobj.close()
+        except (OSError, DecompressError, click.ClickException) as err:
+            report_error(path, err)
+            failed += 1
+    return failed
+
+
+def dispatch(ctx, kwds, steps, limits):
+    """Output JSONFILE in the mode selected by the options of main()."""
+    if kwds['raw']:
+        raw_output(kwds['jsonfile'], ctx)
+    elif kwds['follow']:
+        follow_output(kwds['jsonfile'], ctx, indent=2)
+    elif kwds['lines']:
+        lines_output(kwds['jsonfile'], ctx, indent=2, jobs=kwds['jobs'])
+    elif kwds['pager']:
+        pager_output(kwds['jsonfile'], ctx, indent=2)
+    elif kwds['stream']:
+        stream_output(kwds['jsonfile'], ctx, indent=2)
+    elif steps is not None:
+        path_output(kwds['jsonfile'], ctx, 2, steps, **limits)
+    elif kwds['no_cache']:
+        data = load_json(kwds['jsonfile'], json_backend(ctx), timings(ctx))
+        output(data, ctx, indent=2, **limits)
+    else:
+        cached_output(kwds['jsonfile'], ctx, indent=2, **limits)
@@ -0,0 +1,200 @@
+"""
+Thin Client
+
+Entry point of the jsoncolor command.  When a render daemon started with
+``jsoncolor --serve`` is listening, the command line, working directory,
+environment and stdin are handed to it over a Unix socket and its output
+is copied back, so short calls skip importing and setting up jsoncolor.
+Otherwise, and for options that need the terminal, the command runs in
+this process.
+
+Only the modules needed to talk to the daemon are imported up front.
+"""
+
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import threading
+
+PROTOCOL = 1
+
+SOCKET_ENV = 'JSONCOLOR_SOCKET'
+
+NO_DAEMON_ENV = 'JSONCOLOR_NO_DAEMON'
+
+# environment variables that change the output, passed to the daemon
+ENVIRON = ('TERM', 'COLORTERM', 'JSONCOLOR_BACKEND', 'JSONCOLOR_CACHE_DIR',
+           'XDG_CONFIG_HOME')
+
+# options that wait for input, page or edit the config: run locally
+LOCAL_OPTIONS = ('--serve', '--follow', '--pager', '--create', '--default')
+LOCAL_FLAGS = frozenset('fpcd')
+
+# frames: kind and length, then the data
+FRAME = struct.Struct('>cI')
+EXIT = struct.Struct('>i')
+ACCEPT, REJECT, STDOUT, STDERR, STATUS = b'A', b'R', b'O', b'E', b'X'
+# the command reads stdin: it is only sent then, so that a file argument
+# leaves stdin to the calling script, as it does when running locally
+INPUT = b'I'
+
+CHUNK_SIZE = 64 * 1024
+
+# seconds to wait for a daemon to take a request before running it here
+ACCEPT_TIMEOUT = 1.0
+
+
+def socket_path():
+    """Return $JSONCOLOR_SOCKET, or the socket in a per-user directory."""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    base = (os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or
+            '/tmp')
+    return os.path.join(base, 'jsoncolor-{}'.format(os.getuid()),
+                        'daemon.sock')
+
+
+def private_directory(path):
+    """
+    Tell if path is a directory of this user that no one else can use.
+
+    The socket directory may be in a shared place like /tmp, where another
+    user could have created it first to take over the socket.
+    """
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid() and
+            stat.S_IMODE(info.st_mode) == 0o700)
+
+
+def runs_locally(argv):
+    """Tell if a command line must run in this process."""
+    for arg in argv:
+        if arg == '--':
+            break
+        if arg.startswith('--'):
+            if arg.split('=', 1)[0] in LOCAL_OPTIONS:
+                return True
+        elif arg.startswith('-') and LOCAL_FLAGS.intersection(arg[1:]):
+            return True
+    return False
+
+
+def read_frame(rfile):
+    """Read the next frame; None if the connection was closed."""
+    head = rfile.read(FRAME.size)
+    if len(head) < FRAME.size:
+        return None
+    kind, size = FRAME.unpack(head)
+    data = rfile.read(size)
+    if len(data) < size:
+        return None
+    return kind, data
+
+
+def _isatty(stream):
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def _send_input(stdin, sock):
+    """Copy stdin to the daemon, then signal the end of it."""
+    read = getattr(stdin, 'read1', stdin.read)
+    try:
+        for chunk in iter(lambda: read(CHUNK_SIZE), b''):
+            sock.sendall(chunk)
+    except (OSError, ValueError):
+        pass
+    finally:
+        try:
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+def request(argv, path=None, stdin=None, stdout=None, stderr=None):
+    """
+    Run a command line in the daemon.
+
+    Args:
+        argv (list): command-line arguments, without the program name
+        path (str): socket of the daemon, default: socket_path()
+        stdin, stdout, stderr (file): binary streams, default: those of
+            sys.stdin, sys.stdout and sys.stderr
+
+    Returns:
+        exit status of the command, or None if no daemon took it
+    """
+    if not hasattr(socket, 'AF_UNIX') or os.environ.get(NO_DAEMON_ENV):
+        return None
+    if runs_locally(argv):
+        return None
+    path = socket_path() if path is None else path
+    if not private_directory(os.path.dirname(path) or '.'):
+        return None
+    stdin = sys.stdin.buffer if stdin is None else stdin
+    stdout = sys.stdout.buffer if stdout is None else stdout
+    stderr = sys.stderr.buffer if stderr is None else stderr
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(ACCEPT_TIMEOUT)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    with sock:
+        header = {'version': PROTOCOL, 'argv': list(argv),
+                  'cwd': os.getcwd(),
+                  'environ': {k: os.environ.get(k) for k in ENVIRON},
+                  'stdin_tty': _isatty(stdin),
+                  'stdout_tty': _isatty(stdout),
+                  'stderr_tty': _isatty(stderr)}
+        rfile = sock.makefile('rb')
+        try:
+            sock.sendall(json.dumps(header).encode() + b'\n')
+            frame = read_frame(rfile)
+        except OSError:
+            # socket.timeout included: a stuck daemon
+            return None
+        if frame is None or frame[0] != ACCEPT:
+            return None
+        sock.settimeout(None)
+        while True:
+            try:
+                frame = read_frame(rfile)
+            except OSError:
+                frame = None
+            if frame is None:
+                stderr.write(b'Error: the jsoncolor daemon went away\n')
+                stderr.flush()
+                return 1
+            kind, data = frame
+            if kind == STDOUT:
+                stdout.write(data)
+                stdout.flush()
+            elif kind == STDERR:
+                stderr.write(data)
+                stderr.flush()
+            elif kind == STATUS:
+                return EXIT.unpack(data)[0]
+            elif kind == INPUT:
+                threading.Thread(target=_send_input, args=(stdin, sock),
+                                 daemon=True).start()
+
+
+def main(prog_name=None):
+    """Run jsoncolor in the daemon if one is listening, else locally."""
+    status = request(sys.argv[1:])
+    if status is not None:
+        sys.exit(status)
+    from jsoncolor.cli import main as command
+
+    command(prog_name=prog_name)
@@ -0,0 +1,174 @@
+"""
+Compressed Input
+
+gzip, bzip2 and xz input is recognized by its magic bytes and decompressed
+while it is read, in chunks, so compressed files and pipes are colored
+like plain ones without a temporary file or a separate zcat.  Memory use
+is bounded by the chunk size.
+"""
+
+import bz2
+import io
+import lzma
+import zlib
+
+from jsoncolor.errors import DecompressError
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _GzipDecompressor:
+    """zlib decompressor for one gzip member, with the API of bz2/lzma's."""
+
+    def __init__(self):
+        self._zlib = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    @property
+    def eof(self):
+        return self._zlib.eof
+
+    @property
+    def unused_data(self):
+        return self._zlib.unused_data
+
+    @property
+    def needs_input(self):
+        return not self._zlib.unconsumed_tail
+
+    def decompress(self, data, max_length=-1):
+        data = self._zlib.unconsumed_tail + data
+        return self._zlib.decompress(data, max(max_length, 0))
+
+
+# (magic bytes, format name, decompressor factory)
+FORMATS = (
+    (b'\x1f\x8b', 'gzip', _GzipDecompressor),
+    (b'BZh', 'bzip2', bz2.BZ2Decompressor),
+    (b'\xfd7zXZ\x00', 'xz', lzma.LZMADecompressor),
+)
+
+MAGIC_SIZE = max(len(magic) for magic, _, _ in FORMATS)
+
+ERRORS = (zlib.error, lzma.LZMAError, OSError, EOFError)
+
+
+def detect(head):
+    """
+    Recognize a compression format by its magic bytes.
+
+    Args:
+        head (bytes): first bytes of the input, at least MAGIC_SIZE
+
+    Returns:
+        (name, decompressor factory), or None for uncompressed input
+    """
+    for magic, name, factory in FORMATS:
+        if head.startswith(magic):
+            return name, factory
+    return None
+
+
+class DecompressReader(io.RawIOBase):
+    """
+    Raw binary file that decompresses another file object as it is read.
+
+    Concatenated streams, as written by e.g. ``cat a.gz b.gz`` or pigz,
+    are decompressed one after the other.  There is no fileno(), so the
+    compressed file is never memory-mapped in place of its content.
+    """
+
+    def __init__(self, fileobj, factory, name=None, size=CHUNK_SIZE):
+        """
+        Args:
+            fileobj (file): binary file object of compressed data
+            factory (callable): returns a new decompressor for each stream
+            name (str): format name used in error messages
+            size (int): bytes of compressed data read at once
+        """
+        self._fileobj = fileobj
+        self._factory = factory
+        self._format = name
+        self._size = size
+        self._decompressor = factory()
+        self._eof = False
+        self.name = getattr(fileobj, 'name', None)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def _read(self, size):
+        while not self._eof:
+            decompressor = self._decompressor
+            try:
+                if decompressor.eof:
+                    # the next stream; gzip allows zero padding after one
+                    rest = decompressor.unused_data.lstrip(b'\0')
+                    while not rest:
+                        rest = self._fileobj.read(self._size)
+                        if not rest:
+                            self._eof = True
+                            return b''
+                        rest = rest.lstrip(b'\0')
+                    decompressor = self._decompressor = self._factory()
+                    data = decompressor.decompress(rest, size)
+                elif decompressor.needs_input:
+                    chunk = self._fileobj.read(self._size)
+                    if not chunk:
+                        raise EOFError('compressed input ended before the '
+                                       'end-of-stream marker')
+                    data = decompressor.decompress(chunk, size)
+                else:
+                    data = decompressor.decompress(b'', size)
+            except ERRORS as err:
+                raise DecompressError('Invalid {} input: {}'.format(
+                    self._format, err))
+            if data:
+                return data
+        return b''
+
+    def close(self):
+        if not self.closed:
+            self._fileobj.close()
+        io.RawIOBase.close(self)
+
+
+def _peek(fileobj, size):
+    """Return the first bytes of fileobj without consuming them."""
+    if hasattr(fileobj, 'peek'):
+        return fileobj.peek(size)[:size]
+    if fileobj.seekable():
+        pos = fileobj.tell()
+        head = fileobj.read(size)
+        fileobj.seek(pos)
+        return head
+    return b''
+
+
+def decompress(fileobj, size=CHUNK_SIZE):
+    """
+    Decompress a file object while it is read, if it is compressed.
+
+    Args:
+        fileobj (file): binary file object, e.g. a file or stdin
+        size (int): bytes of compressed data read at once
+
+    Returns:
+        fileobj if it is not compressed, else a buffered binary file object
+            of the decompressed content
+    """
+    if fileobj is None:
+        return None
+    try:
+        found = detect(_peek(fileobj, MAGIC_SIZE))
+    except (AttributeError, OSError, ValueError):
+        return fileobj
+    if found is None:
+        return fileobj
+    name, factory = found
+    return io.BufferedReader(DecompressReader(fileobj, factory, name, size),
+                             size)
@@ -2,8 +2,6 @@
 
 import sys
 
-import jsonconfig
-
 CONFIG = {
     "default": "solarized",
 
@@ -14,6 +12,7 @@ CONFIG = {
             "Name_Tag": "#0087ff",
             "String": "#00afaf",
             "Number": "#af005f",
+            "Comment": "#585858",
         },
     },
     "color_code_source": "http://www.colorhexa.com/"
@@ -22,6 +21,8 @@ CONFIG = {
 
 def config_profile():
     """Create config file for jsoncolor and set default color scheme."""
+    import jsonconfig
+
     with jsonconfig.Config('jsoncolor') as cfg:
         cfg.data = CONFIG
         cfg.kwargs['dump']['indent'] = 4
@@ -40,6 +41,8 @@ def get_color_style(all_colors=False):
         default color scheme if all_colors=False
         dict of all preset colors if all_colors=True
     """
+    import jsonconfig
+
     with jsonconfig.Config('jsoncolor', 'r') as cfg:
         colors = cfg.data
     if not all_colors:
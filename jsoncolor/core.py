@@ -3,19 +3,27 @@ JSON Text Coloring
 
 Functions used to color and highlight JSON content for better viewing on the
 command-line.
+
+pygments is only imported by the functions that need it, so that rendering
+with render_json() (and importing the CLI) stays fast.
 """
 
+import functools
 import json
-from string import hexdigits
-
-import pygments
-import pygments.style
-from pygments.formatters.terminal256 import Terminal256Formatter
-from pygments.lexers import JsonLexer
+import math
+import os
+import re
+from collections import deque
+from collections.abc import Hashable
+from itertools import islice
+from itertools import repeat
+from json.encoder import encode_basestring_ascii
 
 from jsoncolor.config import CONFIG
 from jsoncolor.config import get_color_style
 
+HEX_COLOR_RE = re.compile(r'#[0-9A-Fa-f]*\Z')
+
 
 def validate_style(style):
     """
@@ -31,7 +39,7 @@ def validate_style(style):
     """
     valid = {}
     for k, v in style.items():
-        if (v.startswith('#') and all([d in hexdigits for d in v[1:]])):
+        if HEX_COLOR_RE.match(v):
             valid[k] = v
     return valid
 
@@ -42,7 +50,7 @@ def create_style_class(style=None):
 
     Args:
         style (dict): color style dict with keywords:
-            Token, Keyword, Name_Tag, String, Number
+            Token, Keyword, Name_Tag, String, Number, Comment
 
     Returns:
         StyleClass with appropriate color set for pygments
@@ -50,7 +58,16 @@ def create_style_class(style=None):
     """
     if style is None:
         style = get_color_style()
-    style = validate_style(style)
+    return _style_class(tuple(sorted(validate_style(style).items())))
+
+
+@functools.lru_cache(maxsize=64)
+def _style_class(items):
+    """Build the StyleClass for validated style items; memoized by value."""
+    import pygments.style
+    import pygments.token
+
+    style = dict(items)
 
     class StyleClass(pygments.style.Style):
         styles = {
@@ -64,12 +81,794 @@ def create_style_class(style=None):
                 CONFIG['styles']['solarized']['String']),
             pygments.token.Number: style.get('Number',
                 CONFIG['styles']['solarized']['Number']),
+            pygments.token.Comment: style.get('Comment',
+                CONFIG['styles']['solarized']['Comment']),
         }
 
     return StyleClass
 
 
-def format_json(data, compact=False, indent=2):
+def _xterm_colors():
+    """Build the RGB table of the xterm 256-color palette (minus 254-255)."""
+    colors = [
+        (0x00, 0x00, 0x00), (0xcd, 0x00, 0x00), (0x00, 0xcd, 0x00),
+        (0xcd, 0xcd, 0x00), (0x00, 0x00, 0xee), (0xcd, 0x00, 0xcd),
+        (0x00, 0xcd, 0xcd), (0xe5, 0xe5, 0xe5), (0x7f, 0x7f, 0x7f),
+        (0xff, 0x00, 0x00), (0x00, 0xff, 0x00), (0xff, 0xff, 0x00),
+        (0x5c, 0x5c, 0xff), (0xff, 0x00, 0xff), (0x00, 0xff, 0xff),
+        (0xff, 0xff, 0xff),
+    ]
+    valuerange = (0x00, 0x5f, 0x87, 0xaf, 0xd7, 0xff)
+    for i in range(217):
+        colors.append((valuerange[(i // 36) % 6],
+                       valuerange[(i // 6) % 6],
+                       valuerange[i % 6]))
+    for i in range(1, 22):
+        v = 8 + i * 10
+        colors.append((v, v, v))
+    return colors
+
+
+XTERM_COLORS = _xterm_colors()
+
+STYLE_KEYS = ('Token', 'Keyword', 'Name_Tag', 'String', 'Number',
+              'Comment')
+
+
+COLOR_DEPTHS = ('16', '256', 'truecolor')
+
+# TERM values of terminals limited to the 16 basic colors
+TERMS_16 = ('ansi', 'cygwin', 'linux', 'rxvt', 'vt100', 'vt102', 'vt220',
+            'xterm-16color', 'xterm-color')
+
+
+def detect_colors(environ=None):
+    """
+    Guess the color depth of the terminal from COLORTERM and TERM.
+
+    Args:
+        environ (dict): environment variables, default: os.environ
+
+    Returns:
+        one of COLOR_DEPTHS; '256' unless the environment says otherwise
+    """
+    if environ is None:
+        environ = os.environ
+    term = environ.get('TERM', '')
+    if environ.get('COLORTERM', '') in ('truecolor', '24bit') or \
+            term.endswith('-direct'):
+        return 'truecolor'
+    if '256' not in term and term in TERMS_16:
+        return '16'
+    return '256'
+
+
+@functools.lru_cache(maxsize=4096)
+def closest_color(r, g, b, colors=256):
+    """
+    Find the xterm palette index nearest to an RGB color.
+
+    Uses the same palette and distance metric as pygments'
+    Terminal256Formatter so both renderers pick identical colors.  Results
+    are memoized, so each color is only looked up once.
+
+    Args:
+        r, g, b (int): color components, 0-255
+        colors (int): 256 for the whole palette, 16 for the basic colors
+
+    Returns:
+        index (int) into the xterm 256-color palette
+    """
+    distance = 257 * 257 * 3
+    match = 0
+    for i, (xr, xg, xb) in enumerate(XTERM_COLORS[:colors]):
+        d = (r - xr) ** 2 + (g - xg) ** 2 + (b - xb) ** 2
+        if d < distance:
+            match = i
+            distance = d
+    return match
+
+
+def hex_to_rgb(color):
+    """
+    Convert a '#rgb' or '#rrggbb' color code to an (r, g, b) tuple.
+
+    Returns:
+        None if the color code is not 3 or 6 hexadecimal digits long
+    """
+    digits = color[1:]
+    if len(digits) == 3:
+        digits = ''.join(d * 2 for d in digits)
+    if len(digits) != 6:
+        return None
+    rgb = int(digits, 16)
+    return (rgb >> 16) & 0xff, (rgb >> 8) & 0xff, rgb & 0xff
+
+
+def create_escape_codes(style=None, colors='256'):
+    """
+    Create ANSI escape codes for a color style.
+
+    Args:
+        style (dict): color style dict with keywords:
+            Token, Keyword, Name_Tag, String, Number, Comment (used for
+            the placeholders of collapsed values); default: the default
+            style of the config file, loaded precompiled if possible
+        colors (str): color depth, one of COLOR_DEPTHS
+
+    Returns:
+        dict mapping each style keyword to an (on, off) pair of escape
+            sequences, used by render_json()
+    """
+    if style is None:
+        from jsoncolor.styles import default_escape_codes
+
+        escapes = None
+        if colors in COLOR_DEPTHS:
+            escapes = default_escape_codes(colors)
+        if escapes is not None:
+            return escapes
+        style = get_color_style()
+    items = tuple(sorted(validate_style(style).items()))
+    return dict(_escape_codes(items, colors))
+
+
+@functools.lru_cache(maxsize=64)
+def _escape_codes(items, colors):
+    """Build the escape codes for validated style items; memoized."""
+    if colors not in COLOR_DEPTHS:
+        raise ValueError('colors must be one of {}, not {!r}'.format(
+            ', '.join(COLOR_DEPTHS), colors))
+    style = dict(items)
+    default = CONFIG['styles']['solarized']
+    escapes = {}
+    for key in STYLE_KEYS:
+        rgb = hex_to_rgb(style.get(key, default[key]))
+        if rgb is None:
+            rgb = hex_to_rgb(default[key])
+        if colors == 'truecolor':
+            on = '\x1b[38;2;%d;%d;%dm' % rgb
+        elif colors == '16':
+            i = closest_color(*rgb, colors=16)
+            on = '\x1b[%dm' % (30 + i if i < 8 else 82 + i)
+        else:
+            on = '\x1b[38;5;%dm' % closest_color(*rgb)
+        escapes[key] = (on, '\x1b[39m')
+    return escapes
+
+
+def _floatstr(o):
+    """Serialize a float the way json.dumps does (allow_nan=True)."""
+    if o != o:
+        return 'NaN'
+    if o == float('inf'):
+        return 'Infinity'
+    if o == -float('inf'):
+        return '-Infinity'
+    return float.__repr__(o)
+
+
+def _keystr(key):
+    """Serialize a dict key the way json.dumps does (skipkeys=False)."""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float):
+        return _floatstr(key)
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError('keys must be str, int, float, bool or None, '
+                    'not {}'.format(key.__class__.__name__))
+
+
+def _separators(compact=False, indent=2):
+    """Return (indent, item separator, key separator) as a str triple."""
+    if indent is not None and not isinstance(indent, str):
+        indent = ' ' * indent
+    if compact:
+        return indent, ',', ':'
+    if indent is not None:
+        return indent, ',', ': '
+    return indent, ', ', ': '
+
+
+def iter_json(data, compact=False, indent=2, escapes=None, max_depth=None,
+              max_items=None, max_string=None):
+    """
+    Serialize and colorize data in a single pass.
+
+    Walks the python object once, emitting the same text as format_json()
+    with the escape codes for each token inlined, so no JSON lexing is
+    needed to recover the token types.
+
+    The max_* limits turn the output into a preview: hidden values are
+    replaced by placeholders such as {…42 keys} or […10000 items], colored
+    as Comment, and are never walked or serialized.
+
+    Args:
+        data (dict): python dict
+        compact (boolean): non-indended output
+        indent (int): set indenting for compact=False mode
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+        max_depth (int): collapse containers nested deeper than this
+        max_items (int): show at most this many items per container
+        max_string (int): truncate strings longer than this
+
+    Yields:
+        chunks of json-serialized content
+    """
+    if escapes is None:
+        escapes = dict.fromkeys(STYLE_KEYS, ('', ''))
+
+    def paint(key, text):
+        on, off = escapes[key]
+        return on + text + off if on else text
+
+    indent, item_sep, key_sep = _separators(compact, indent)
+    item_sep = paint('Token', item_sep)
+    key_sep = paint('Token', key_sep)
+    marks = {c: paint('Token', c) for c in '{}[]'}
+    empty = {dict: paint('Token', '{}'), list: paint('Token', '[]')}
+    kw = {True: paint('Keyword', 'true'), False: paint('Keyword', 'false'),
+          None: paint('Keyword', 'null')}
+    num_on, num_off = escapes['Number']
+    str_on, str_off = escapes['String']
+    tag_on, tag_off = escapes['Name_Tag']
+
+    def scalar(o):
+        if isinstance(o, str):
+            return str_on + encode_basestring_ascii(o) + str_off
+        if o is None or o is True or o is False:
+            return kw[o]
+        if isinstance(o, int):
+            return num_on + int.__repr__(o) + num_off
+        if isinstance(o, float):
+            return num_on + _floatstr(o) + num_off
+        raise TypeError('Object of type {} is not JSON serializable'
+                        .format(o.__class__.__name__))
+
+    if max_string is not None:
+        full_scalar = scalar
+        ellipsis = paint('Comment', '\u2026') + str_on + '"' + str_off
+
+        def scalar(o):
+            if isinstance(o, str) and len(o) > max_string:
+                text = encode_basestring_ascii(o[:max_string])[:-1]
+                return str_on + text + str_off + ellipsis
+            return full_scalar(o)
+
+    def placeholder(count, noun, open_='', close=''):
+        noun = noun if count == 1 else noun + 's'
+        return paint('Comment', '{}\u2026{} {}{}'.format(open_, count, noun,
+                                                        close))
+
+    def walk(o, level):
+        if isinstance(o, dict):
+            if not o:
+                yield empty[dict]
+                return
+            open_, close, items = marks['{'], marks['}'], o.items()
+            noun = 'key'
+        elif isinstance(o, (list, tuple)):
+            if not o:
+                yield empty[list]
+                return
+            open_, close, items = marks['['], marks[']'], None
+            noun = 'item'
+        else:
+            yield scalar(o)
+            return
+        if max_depth is not None and level >= max_depth or max_items == 0:
+            brackets = '[]' if items is None else '{}'
+            yield placeholder(len(o), noun, *brackets)
+            return
+        more = 0
+        if max_items is not None and len(o) > max_items:
+            more = len(o) - max_items
+            if items is None:
+                o = islice(o, max_items)
+            else:
+                items = islice(items, max_items)
+        if indent is None:
+            sep, nl, end = item_sep, '', ''
+        else:
+            nl = '\n' + indent * (level + 1)
+            sep, end = item_sep + nl, '\n' + indent * level
+        yield open_ + nl
+        first = True
+        if items is None:
+            for v in o:
+                if not first:
+                    yield sep
+                first = False
+                if isinstance(v, (dict, list, tuple)):
+                    yield from walk(v, level + 1)
+                else:
+                    yield scalar(v)
+        else:
+            for k, v in items:
+                key = tag_on + encode_basestring_ascii(_keystr(k)) + tag_off
+                if first:
+                    yield key + key_sep
+                    first = False
+                else:
+                    yield sep + key + key_sep
+                if isinstance(v, (dict, list, tuple)):
+                    yield from walk(v, level + 1)
+                else:
+                    yield scalar(v)
+        if more:
+            yield ('' if first else sep) + placeholder(more, 'more ' + noun)
+        yield end + close
+
+    return walk(data, 0)
+
+
+def render_json(data, compact=False, indent=2, escapes=None, max_depth=None,
+                max_items=None, max_string=None):
+    """
+    Format and colorize Dict to JSON without re-lexing the output.
+
+    Args:
+        data (dict): python dict
+        compact (boolean): non-indended output
+        indent (int): set indenting for compact=False mode
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+        max_depth (int): collapse containers nested deeper than this
+        max_items (int): show at most this many items per container
+        max_string (int): truncate strings longer than this
+
+    Returns:
+        data formatted to json-serialized content with color coding;
+            identical to format_json() when escapes and the max_* limits
+            are None
+    """
+    return ''.join(iter_json(data, compact, indent, escapes, max_depth,
+                             max_items, max_string))
+
+
+# numbers, NaN and (-)Infinity; a single leading character set keeps the
+# regex engine on its fast path
+RAW_NUMBER_RE = re.compile(rb'([-0-9IN][-0-9.eE+INafinty]*)')
+
+RAW_SPACED_KEY_RE = re.compile(rb'"[ \t\r\n]+:')
+
+# escaped backslashes and quotes are swapped for these same-length
+# placeholders, so that every remaining '"' opens or closes a string
+RAW_PLACEHOLDERS = ((b'\\\\', b'\x01\x01'), (b'\\"', b'\x01\x02'))
+
+
+def _interleave(items, before, after):
+    """Turn [o0, x1, o1, x2, ...] into [o0, b1, x1, a, o1, b2, x2, a, ...]."""
+    k = len(items) // 2
+    out = [None] * (4 * k + 1)
+    out[0::4] = items[0::2]
+    out[1::4] = before if isinstance(before, list) else [before] * k
+    out[2::4] = items[1::2]
+    out[3::4] = [after] * k
+    return out
+
+
+def colorize_raw(data, escapes=None):
+    """
+    Colorize json text as-is, without parsing or re-serializing it.
+
+    The text is scanned with a handful of split/join/replace passes that
+    run in C, instead of per-token python code; strings, keys, numbers and
+    keywords are wrapped in the escape codes of their type.  Invalid json
+    is colored on a best-effort basis.
+
+    Args:
+        data (bytes): json-serialized content (any formatting)
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+
+    Returns:
+        colored bytes; identical to data once the escape codes are removed.
+            Content holding NUL, \x01 or \x02 bytes is returned unchanged.
+    """
+    if escapes is None or not data or b'\x00' in data or b'\x01' in data \
+            or b'\x02' in data:
+        return data
+    codes = {k: v[0].encode('ascii') for k, v in escapes.items()}
+    token = codes['Token']
+    escaped = b'\\' in data
+    if escaped:
+        for old, new in RAW_PLACEHOLDERS:
+            data = data.replace(old, new)
+
+    parts = data.split(b'"')
+    outside = parts[0::2]
+    opens = (codes['String'] + b'"', codes['Name_Tag'] + b'"')
+    if RAW_SPACED_KEY_RE.search(data):
+        keys = [o.lstrip().startswith(b':') for o in outside[1:]]
+    else:
+        keys = map(bytes.startswith, outside[1:], repeat(b':'))
+    opens = list(map(opens.__getitem__, keys))
+
+    text = b'\x00'.join(outside)
+    text = b''.join(_interleave(RAW_NUMBER_RE.split(text), codes['Number'],
+                                token))
+    for word in (b'true', b'false', b'null'):
+        text = text.replace(word, codes['Keyword'] + word + token)
+    parts[0::2] = text.split(b'\x00')
+
+    data = b''.join(_interleave(parts, opens, b'"' + token))
+    if escaped:
+        for old, new in RAW_PLACEHOLDERS:
+            data = data.replace(new, old)
+    return token + data + escapes['Token'][1].encode('ascii')
+
+
+def _raw_cut(data):
+    """Find the last offset in data where a raw chunk can be split."""
+    if b'\\' in data:
+        for old, new in RAW_PLACEHOLDERS:
+            data = data.replace(old, new)
+    parts = data.split(b'"')
+    if len(parts) % 2 == 0:
+        return len(data) - len(parts[-1]) - 1
+    tail = parts[-1]
+    cut = max(tail.rfind(c) for c in (b',', b':', b'[', b']', b'{', b'}'))
+    if cut >= 0:
+        return len(data) - len(tail) + cut + 1
+    if len(parts) == 1:
+        return 0
+    return len(data) - len(tail) - len(parts[-2]) - 2
+
+
+def iter_raw(chunks, escapes=None):
+    """
+    Colorize json text as-is, chunk by chunk.
+
+    Chunks are split again at a point outside of any string or token, so
+    every token gets the same color as with colorize_raw() on the whole
+    content, though escape codes may be repeated or split differently at
+    the chunk boundaries; memory use is bounded by the chunk size plus the
+    longest string.
+
+    Args:
+        chunks (iterable): pieces of json-serialized content, as bytes or
+            memoryview slices
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+
+    Yields:
+        colored bytes
+    """
+    carry = b''
+    for chunk in chunks:
+        if escapes is None:
+            yield bytes(chunk)
+            continue
+        data = carry + chunk if carry else bytes(chunk)
+        cut = _raw_cut(data)
+        carry = data[cut:]
+        if cut:
+            yield colorize_raw(data[:cut], escapes)
+    if carry:
+        yield colorize_raw(carry, escapes)
+
+
+class JSONBackend:
+    """
+    Standard library json module.
+
+    Backends parse and serialize exactly like the standard library: a
+    faster library is only used where its result is known to be the same,
+    and the standard library handles everything else.
+    """
+
+    name = 'json'
+
+    def loads(self, s):
+        """
+        Parse json-serialized content.
+
+        Args:
+            s (str|bytes): json-serialized content
+
+        Returns:
+            python object
+
+        Raises:
+            ValueError: s is not valid JSON
+        """
+        return json.loads(s)
+
+    def dumps(self, data, compact=False, indent=2, parsed=False):
+        """
+        Serialize a python object; the same arguments as format_json().
+
+        Returns:
+            data formatted to json-serialized content
+        """
+        separators = (',', ':') if compact else None
+        return json.dumps(data, indent=indent, separators=separators)
+
+
+class _NonFinite(float):
+    """NaN or Infinity read from json text; fast backends cannot write it."""
+
+
+def _parse_float(text):
+    """Parse a json number or constant, marking NaN and Infinity."""
+    value = float(text)
+    return value if math.isfinite(value) else _NonFinite(value)
+
+
+_DIGITS = bytes.maketrans(b'123456789', b'000000000')
+
+
+def _has_bigint(s):
+    """Tell if json text may hold an integer that does not fit in 64 bits."""
+    if isinstance(s, str):
+        s = s.encode('utf-8', 'surrogatepass')
+    # translate() and find() are much faster than a regular expression
+    digits = bytes(s).translate(_DIGITS)
+    # uint64 holds every 19-digit integer, int64 not every negative one
+    return b'0' * 20 in digits or b'-' + b'0' * 19 in digits
+
+
+class _FastLoads(JSONBackend):
+    """Backend whose loads() rejects or rounds some input json accepts."""
+
+    def __init__(self, module):
+        self.module = module
+
+    def loads(self, s):
+        if not _has_bigint(s):
+            try:
+                return self.module.loads(s)
+            except ValueError:
+                pass
+        return json.loads(s, parse_float=_parse_float,
+                          parse_constant=_parse_float)
+
+
+class ORJSONBackend(_FastLoads):
+    """
+    orjson.
+
+    orjson writes exponents, small numbers and non-ASCII text differently
+    and NaN as null, and cannot write 'indent' other than 2, integers
+    beyond 64 bits, subclasses or non-str keys: its output is escaped
+    like ensure_ascii=True, and the standard library writes what orjson
+    would write differently.  Output holding null is written again by the
+    standard library unless the data was parsed with loads(), which marks
+    NaN and Infinity.
+    """
+
+    name = 'orjson'
+
+    # orjson's exponents (1e16, 1e-7) and small numbers (0.00001)
+    FLOAT_RE = re.compile(rb'[0-9]e|0\.0000')
+
+    NON_ASCII_RE = re.compile('[^\x00-\x7e]')
+
+    def __init__(self):
+        import orjson
+
+        _FastLoads.__init__(self, orjson)
+        self.options = (orjson.OPT_PASSTHROUGH_SUBCLASS |
+                        orjson.OPT_PASSTHROUGH_DATETIME |
+                        orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def dumps(self, data, compact=False, indent=2, parsed=False):
+        if compact and indent is None:
+            options = self.options
+        elif not compact and indent == 2:
+            options = self.options | self.module.OPT_INDENT_2
+        else:
+            return JSONBackend.dumps(self, data, compact, indent)
+        try:
+            out = self.module.dumps(data, option=options)
+        except TypeError:
+            return JSONBackend.dumps(self, data, compact, indent)
+        # null may be NaN or Infinity, which loads() would have marked
+        if (self.FLOAT_RE.search(out) is not None or
+                not parsed and b'null' in out):
+            # free orjson's output before the standard library writes its own
+            del out
+            return JSONBackend.dumps(self, data, compact, indent)
+        if out.isascii() and b'\x7f' not in out:
+            return out.decode('ascii')
+        text = out.decode('utf-8')
+        del out
+        return self.NON_ASCII_RE.sub(_escape_ascii, text)
+
+
+def _escape_ascii(match):
+    """Escape a non-ASCII character the way json.dumps does."""
+    n = ord(match.group())
+    if n < 0x10000:
+        return '\\u{:04x}'.format(n)
+    n -= 0x10000
+    return '\\u{:04x}\\u{:04x}'.format(0xd800 | (n >> 10),
+                                      0xdc00 | (n & 0x3ff))
+
+
+class UJSONBackend(_FastLoads):
+    """
+    ujson; used for parsing only, its output is formatted differently.
+    """
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+
+        _FastLoads.__init__(self, ujson)
+
+
+class SimpleJSONBackend(JSONBackend):
+    """simplejson, which formats exactly like the standard library."""
+
+    name = 'simplejson'
+
+    def __init__(self):
+        import simplejson
+
+        self.module = simplejson
+
+    def loads(self, s):
+        return self.module.loads(s)
+
+    def dumps(self, data, compact=False, indent=2, parsed=False):
+        separators = (',', ':') if compact else None
+        return self.module.dumps(data, indent=indent, separators=separators,
+                                 namedtuple_as_object=False)
+
+
+# in order of preference for 'auto'
+BACKENDS = {
+    'orjson': ORJSONBackend,
+    'ujson': UJSONBackend,
+    'simplejson': SimpleJSONBackend,
+    'json': JSONBackend,
+}
+
+BACKEND_ENV = 'JSONCOLOR_BACKEND'
+
+
+def register_backend(name, backend):
+    """
+    Add a JSON backend, selectable by name.
+
+    Args:
+        name (str): backend name, as given to get_backend()
+        backend (class): JSONBackend subclass; its constructor raises
+            ImportError if the library is not installed
+    """
+    BACKENDS[name] = backend
+    _load_backend.cache_clear()
+
+
+def get_backend(name=None):
+    """
+    Get a JSON backend by name.
+
+    Args:
+        name (str): one of BACKENDS, or 'auto' for the first one that is
+            installed; default: $JSONCOLOR_BACKEND, or 'auto'
+
+    Returns:
+        shared JSONBackend instance
+
+    Raises:
+        ValueError: unknown backend name, or the library is not installed
+    """
+    if name is None:
+        name = os.environ.get(BACKEND_ENV) or 'auto'
+    return _load_backend(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_backend(name):
+    if name == 'auto':
+        for backend in BACKENDS.values():
+            try:
+                return backend()
+            except ImportError:
+                pass
+    if name not in BACKENDS:
+        raise ValueError('unknown JSON backend: {!r} (choose from {})'
+                         .format(name, ', '.join(BACKENDS)))
+    try:
+        return BACKENDS[name]()
+    except ImportError:
+        raise ValueError('JSON backend {!r} is not installed'.format(name))
+
+
+def _frame(data, compact=False, indent=2, escapes=None):
+    """
+    Return the text around and between the top-level items of a list or
+    dict in iter_json() output: (opening, separator, closing).
+    """
+    indent, item_sep, _ = _separators(compact, indent)
+    on, off = (escapes or {}).get('Token', ('', ''))
+    open_, close = '{}' if isinstance(data, dict) else '[]'
+    nl = '' if indent is None else '\n' + indent
+    return (on + open_ + off + nl, on + item_sep + off + nl,
+            ('' if indent is None else '\n') + on + close + off)
+
+
+def _render_items(items, is_dict, compact=False, indent=2, escapes=None):
+    """Render top-level items of a list or dict, without the brackets."""
+    data = dict(items) if is_dict else items
+    opening, _, closing = _frame(data, compact, indent, escapes)
+    text = render_json(data, compact, indent, escapes)
+    return text[len(opening):len(text) - len(closing)]
+
+
+# most batches of top-level items per worker in iter_json_parallel()
+BATCHES_PER_JOB = 4
+
+
+def iter_json_parallel(data, compact=False, indent=2, escapes=None,
+                       jobs=None, batch_size=None):
+    """
+    Serialize and colorize a large list or dict in a process pool.
+
+    The top-level items are rendered in batches by worker processes and
+    joined in order, with at most two batches per worker in flight;
+    nested values are never split.  Output is identical to iter_json().
+
+    Args:
+        data (dict): python dict or list; other values, empty containers
+            and jobs=1 are rendered in this process
+        compact (boolean): non-indended output
+        indent (int): set indenting for compact=False mode
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+        jobs (int): number of worker processes, default: number of CPUs
+        batch_size (int): top-level items per batch, default: enough for
+            BATCHES_PER_JOB batches per worker
+
+    Yields:
+        chunks of json-serialized content
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or not isinstance(data, (dict, list, tuple)) or not data:
+        yield from iter_json(data, compact, indent, escapes)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    is_dict = isinstance(data, dict)
+    if batch_size is None:
+        batch_size = -(-len(data) // (jobs * BATCHES_PER_JOB))
+    items = iter(data.items() if is_dict else data)
+    batches = iter(lambda: list(islice(items, batch_size)), [])
+    opening, separator, closing = _frame(data, compact, indent, escapes)
+    yield opening
+    first = True
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for batch in batches:
+            if len(pending) >= jobs * 2:
+                if not first:
+                    yield separator
+                first = False
+                yield pending.popleft().result()
+            pending.append(pool.submit(_render_items, batch, is_dict,
+                                       compact, indent, escapes))
+        while pending:
+            if not first:
+                yield separator
+            first = False
+            yield pending.popleft().result()
+    yield closing
+
+
+def format_json(data, compact=False, indent=2, backend=None, parsed=False):
     """
     Format Dict to JSON.
 
@@ -77,12 +876,13 @@ def format_json(data, compact=False, indent=2):
         data (dict): python dict
         compact (boolean): non-indended output
         indent (int): set indenting for compact=False mode
+        backend (str): JSON backend name, see get_backend()
+        parsed (boolean): data was returned by the backend's loads()
 
     Returns:
         data formatted to json-serialized content
     """
-    separators = (',', ':') if compact else None
-    return json.dumps(data, indent=indent, separators=separators)
+    return get_backend(backend).dumps(data, compact, indent, parsed)
 
 
 def highlighter(data, style=None):
@@ -99,10 +899,196 @@ def highlighter(data, style=None):
         Json-serialized content without color coding if a ValueError
             from Terminal256Formatter is thrown.
     """
-    if style is None:
-        style = create_style_class(get_color_style())
-    try:
-        formatter = Terminal256Formatter(style=style)
-    except (ValueError):
-        return data
-    return pygments.highlight(data, JsonLexer(), formatter)
+    if isinstance(style, Hashable):
+        return get_highlighter(style).highlight(data)
+    return Highlighter(style).highlight(data)
+
+
+class Highlighter:
+    """
+    Reusable JSON Syntax Highlighter.
+
+    Builds the lexer and formatter for a style once.  Instances are not
+    modified after construction and may be shared across threads.
+    """
+
+    __slots__ = ('style', 'lexer', 'formatter')
+
+    def __init__(self, style=None):
+        """
+        Args:
+            style (StyleClass): Style to be used by Terminal256Formatter,
+                return value from create_style_class(); None for the
+                default style in the config file
+        """
+        from pygments.formatters.terminal256 import Terminal256Formatter
+        from pygments.lexers.data import JsonLexer
+
+        if style is None:
+            style = create_style_class(get_color_style())
+        self.style = style
+        self.lexer = JsonLexer()
+        try:
+            self.formatter = Terminal256Formatter(style=style)
+        except (ValueError):
+            self.formatter = None
+
+    def highlight(self, data):
+        """
+        Highlight json-serialized content.
+
+        Returns:
+            Json-serialized content with proper color coding
+            Json-serialized content without color coding if the style was
+                rejected by Terminal256Formatter.
+        """
+        import pygments
+
+        if self.formatter is None:
+            return data
+        return pygments.highlight(data, self.lexer, self.formatter)
+
+
+@functools.lru_cache(maxsize=64)
+def get_highlighter(style=None):
+    """
+    Get the shared Highlighter for a style.
+
+    Args:
+        style (StyleClass): return value from create_style_class(), or None
+            for the default style in the config file (read on first use)
+
+    Returns:
+        cached Highlighter instance
+    """
+    return Highlighter(style)
+
+
+def _render_many(docs, compact=False, indent=2, escapes=None, backend=None):
+    """Render a batch of documents; json text is parsed first."""
+    loads = get_backend(backend).loads
+    out = []
+    for doc in docs:
+        if isinstance(doc, (str, bytes, bytearray)):
+            doc = loads(doc)
+        out.append(render_json(doc, compact, indent, escapes))
+    return out
+
+
+def highlight_many(docs, style=None, compact=False, indent=2, jobs=None,
+                   batch_size=256, backend=None):
+    """
+    Format and colorize many JSON documents.
+
+    The style is resolved and its escape codes are built once for the
+    whole batch, instead of once per document as with highlighter().
+
+    Args:
+        docs (iterable): python objects, or json-serialized content as
+            str or bytes
+        style (dict): color style dict, as used by create_style_class(),
+            or None for the default style in the config file
+        compact (boolean): non-indended output
+        indent (int): set indenting for compact=False mode
+        jobs (int): number of worker processes; None or 1 renders in this
+            process
+        batch_size (int): number of documents sent to a worker at once
+        backend (str): JSON backend that parses json-serialized content,
+            see get_backend()
+
+    Yields:
+        colored output for each document, in input order
+
+    Raises:
+        ValueError: a str or bytes document is not valid JSON
+    """
+    escapes = create_escape_codes(style)
+    docs = iter(docs)
+    if not jobs or jobs == 1:
+        for doc in docs:
+            yield _render_many([doc], compact, indent, escapes, backend)[0]
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    batches = iter(lambda: list(islice(docs, batch_size)), [])
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for batch in batches:
+            if len(pending) >= jobs * 2:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(_render_many, batch, compact, indent,
+                                       escapes, backend))
+        while pending:
+            yield from pending.popleft().result()
+
+
+# chunks at least this long are rendered in the executor
+OFFLOAD_SIZE = 16 * 1024
+
+
+async def colorize_stream(stream, style=None, compact=False, indent=2,
+                          color=True, executor=None, chunk_size=64 * 1024,
+                          offload_size=OFFLOAD_SIZE):
+    """
+    Format and colorize a JSON byte stream without blocking the event loop.
+
+    Chunks of offload_size or more are rendered in an executor.  The next
+    chunk is only read from the stream once the previous output chunk has
+    been consumed, so a slow consumer holds back the producer instead of
+    letting memory grow.
+
+    Args:
+        stream: asyncio.StreamReader (or anything with an async
+            read(n) method), or an async iterable of bytes
+        style (dict): color style dict, as used by create_style_class(),
+            or None for the default style in the config file
+        compact (boolean): non-indended output
+        indent (int): set indenting for compact=False mode
+        color (boolean): False for output without color codes
+        executor (Executor): executor for the rendering, default: the
+            event loop's default executor
+        chunk_size (int): number of bytes per read
+        offload_size (int): smallest chunk rendered in the executor
+
+    Yields:
+        colored output, one piece per input chunk
+
+    Raises:
+        TokenizeError: the stream is not valid JSON
+    """
+    import asyncio
+    import codecs
+
+    from jsoncolor.stream import StreamRenderer
+
+    loop = asyncio.get_running_loop()
+    escapes = None
+    if color:
+        escapes = await loop.run_in_executor(executor, create_escape_codes,
+                                             style)
+    renderer = StreamRenderer(compact, indent, escapes)
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+    async def chunks():
+        if hasattr(stream, 'read'):
+            while True:
+                chunk = await stream.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            async for chunk in stream:
+                yield chunk
+
+    async for chunk in chunks():
+        text = decoder.decode(chunk)
+        if len(text) >= offload_size:
+            out = await loop.run_in_executor(executor, renderer.feed, text)
+        else:
+            out = renderer.feed(text)
+        if out:
+            yield out
+    out = renderer.feed(decoder.decode(b'', final=True)) + renderer.close()
+    if out:
+        yield out
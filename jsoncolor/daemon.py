@@ -0,0 +1,263 @@
+"""
+Render Daemon
+
+``jsoncolor --serve`` keeps a process with jsoncolor imported, the JSON
+backend loaded and the styles compiled, listening on a Unix socket.  It
+runs the command line of each thin client (jsoncolor.client) in a forked
+child, with the client's working directory, environment and streams, so a
+call costs a fork and a round trip instead of starting and setting up
+jsoncolor, and a client that streams stdin does not hold up the others.
+
+Styles are looked up for every request through jsoncolor.styles, which
+compiles them again once the config file changes.
+"""
+
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import traceback
+
+from jsoncolor.client import ACCEPT
+from jsoncolor.client import ENVIRON
+from jsoncolor.client import EXIT
+from jsoncolor.client import FRAME
+from jsoncolor.client import INPUT
+from jsoncolor.client import PROTOCOL
+from jsoncolor.client import REJECT
+from jsoncolor.client import STATUS
+from jsoncolor.client import STDERR
+from jsoncolor.client import STDOUT
+from jsoncolor.client import private_directory
+from jsoncolor.client import socket_path
+from jsoncolor.core import COLOR_DEPTHS
+from jsoncolor.core import get_backend
+from jsoncolor.styles import default_escape_codes
+
+CHUNK_SIZE = 64 * 1024
+
+# seconds a child waits for the header of a connection that sends nothing
+HEADER_TIMEOUT = 10
+
+
+class _Output(io.RawIOBase):
+    """Stream sending what is written to the client as frames of a kind."""
+
+    def __init__(self, wfile, kind, tty=False):
+        self._wfile = wfile
+        self._kind = kind
+        self._tty = tty
+        self._broken = False
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return self._tty
+
+    def write(self, data):
+        if data and not self._broken:
+            try:
+                self._wfile.write(FRAME.pack(self._kind, len(data)) +
+                                  bytes(data))
+            except OSError:
+                # the client is gone; finish the command quietly
+                self._broken = True
+        return len(data)
+
+
+class _Input(io.RawIOBase):
+    """Stream of the client's stdin, requested once it is first read."""
+
+    def __init__(self, rfile, wfile, tty=False):
+        self._rfile = rfile
+        self._wfile = wfile
+        self._tty = tty
+        self._requested = False
+
+    def readable(self):
+        return True
+
+    def isatty(self):
+        return self._tty
+
+    def readinto(self, buffer):
+        if not self._requested:
+            self._requested = True
+            self._wfile.write(FRAME.pack(INPUT, 0))
+        data = self._rfile.read1(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def run(command, header, rfile, wfile):
+    """
+    Run a command line of a client in this process.
+
+    Args:
+        command (click.Command): jsoncolor.cli.main
+        header (dict): request of the client, see client.request()
+        rfile, wfile (file): binary streams of the connection
+
+    Returns:
+        exit status of the command
+    """
+    saved = sys.stdin, sys.stdout, sys.stderr, os.getcwd()
+    environ = {k: os.environ.get(k) for k in ENVIRON}
+    try:
+        os.chdir(header['cwd'])
+        for key in ENVIRON:
+            value = header['environ'].get(key)
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        sys.stdin = io.TextIOWrapper(io.BufferedReader(
+            _Input(rfile, wfile, header['stdin_tty'])), 'utf-8')
+        sys.stdout = io.TextIOWrapper(io.BufferedWriter(
+            _Output(wfile, STDOUT, header['stdout_tty']), CHUNK_SIZE),
+            'utf-8')
+        sys.stderr = io.TextIOWrapper(io.BufferedWriter(
+            _Output(wfile, STDERR, header['stderr_tty'])), 'utf-8',
+            line_buffering=True)
+        try:
+            command.main(args=header['argv'], prog_name='jsoncolor')
+            status = 0
+        except SystemExit as exc:
+            status = exc.code
+            if status is None:
+                status = 0
+            elif not isinstance(status, int):
+                print(status, file=sys.stderr)
+                status = 1
+        except Exception:
+            traceback.print_exc()
+            status = 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+        return status
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved[:3]
+        os.chdir(saved[3])
+        for key, value in environ.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+class RenderHandler(socketserver.StreamRequestHandler):
+    """Run the command line of one client."""
+
+    def handle(self):
+        self.connection.settimeout(HEADER_TIMEOUT)
+        try:
+            header = json.loads(self.rfile.readline().decode('utf-8'))
+        except (OSError, ValueError):
+            return
+        self.connection.settimeout(None)
+        if not isinstance(header, dict) or header.get('version') != PROTOCOL:
+            # an older or newer client runs the command itself
+            self.wfile.write(FRAME.pack(REJECT, 0))
+            return
+        self.wfile.write(FRAME.pack(ACCEPT, 0))
+        status = run(self.server.command, header, self.rfile, self.wfile)
+        try:
+            self.wfile.write(FRAME.pack(STATUS, EXIT.size) +
+                             EXIT.pack(status))
+        except OSError:
+            pass
+
+
+class RenderServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server running each request in a forked child.
+
+    Requests swap sys.stdin, sys.stdout, the working directory and the
+    environment of the process, so they must never share one, as threads
+    would.  Children inherit everything loaded before serving.
+    """
+
+    def __init__(self, path, command):
+        """
+        Args:
+            path (str): socket file; its directory is created private
+            command (click.Command): jsoncolor.cli.main
+
+        Raises:
+            OSError: the directory cannot be created, or is not private
+        """
+        self.command = command
+        self._bound = False
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if not private_directory(directory):
+            raise OSError('{} must be a directory owned by you with mode '
+                          '0700'.format(directory))
+        socketserver.UnixStreamServer.__init__(self, path, RenderHandler)
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            if listening(self.server_address):
+                raise OSError('a jsoncolor daemon is already listening on '
+                              '{}'.format(self.server_address))
+            os.remove(self.server_address)
+        umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.server_bind(self)
+        finally:
+            os.umask(umask)
+        self._bound = True
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if self._bound:
+            try:
+                os.remove(self.server_address)
+            except OSError:
+                pass
+
+
+def listening(path):
+    """Tell if a daemon accepts connections on the socket file path."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def warm_up():
+    """Load what every request needs: the backend and the styles."""
+    get_backend()
+    for colors in COLOR_DEPTHS:
+        default_escape_codes(colors)
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(command, path=None):
+    """
+    Serve requests of thin clients until interrupted or terminated.
+
+    Args:
+        command (click.Command): jsoncolor.cli.main
+        path (str): socket file, default: client.socket_path()
+    """
+    path = socket_path() if path is None else path
+    with RenderServer(path, command) as server:
+        warm_up()
+        signal.signal(signal.SIGTERM, _stop)
+        print('jsoncolor daemon listening on ' + path, file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
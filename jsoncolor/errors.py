@@ -0,0 +1,13 @@
+"""jsoncolor exceptions."""
+
+
+class JsonColorError(Exception):
+    """Base class for jsoncolor exceptions."""
+
+
+class TokenizeError(JsonColorError, ValueError):
+    """Raised when streamed input is not valid JSON."""
+
+
+class DecompressError(JsonColorError, ValueError):
+    """Raised when compressed input is corrupt or truncated."""
@@ -0,0 +1,143 @@
+"""
+Multi-File Input
+
+Colors many JSON files named on the command line, e.g. the fixtures of a
+test suite, in one call.  Files are read, decompressed, parsed and colored
+a few at a time ahead of the one being written, in a pool of threads (or
+of processes with --jobs), so that reading overlaps with parsing and
+coloring; output keeps the order of the arguments.
+
+Glob patterns are expanded here too, for shells that do not and for
+patterns quoted to get past a command-line length limit.
+"""
+
+import glob
+import io
+import os
+from collections import deque
+
+from jsoncolor.compress import decompress
+from jsoncolor.core import get_backend
+from jsoncolor.core import render_json
+from jsoncolor.errors import TokenizeError
+
+# the default of concurrent.futures.ThreadPoolExecutor
+THREADS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def expand_paths(patterns):
+    """
+    Expand glob patterns, recursively for '**'.
+
+    Args:
+        patterns (iterable): file names and glob patterns
+
+    Returns:
+        list of file names, sorted for each pattern; an argument that
+            names a file, or matches nothing, is kept so that it gets
+            reported
+    """
+    paths = []
+    for pattern in patterns:
+        if glob.escape(pattern) == pattern or os.path.exists(pattern):
+            paths.append(pattern)
+            continue
+        matches = [name for name in glob.glob(pattern, recursive=True)
+                   if not os.path.isdir(name)]
+        paths.extend(sorted(matches) or [pattern])
+    return paths
+
+
+def render_file(source, compact=False, indent=2, escapes=None, backend=None,
+                limits=None):
+    """
+    Read, parse and color one file.
+
+    Args:
+        source (str|bytes): path of a file, or content already read
+        compact (boolean): non-indended output
+        indent (int): set indenting for compact=False mode
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+        backend (str): JSON backend name, see get_backend()
+        limits (dict): max_* limits of a preview, see render_json()
+
+    Returns:
+        colored output followed by a newline, or '' for an empty file
+
+    Raises:
+        OSError: the file cannot be read
+        TokenizeError: the file is not valid JSON
+        DecompressError: the file is corrupt compressed input
+    """
+    fileobj = io.BytesIO(source) if isinstance(source, bytes) else open(
+        source, 'rb')
+    with fileobj:
+        content = decompress(fileobj).read()
+    if not content.strip():
+        return ''
+    backend = get_backend(backend)
+    try:
+        data = backend.loads(content)
+    except ValueError as err:
+        # the json error holds the whole document; keep only the message
+        raise TokenizeError(str(err))
+    if escapes is None and not limits:
+        return backend.dumps(data, compact, indent, True) + '\n'
+    return render_json(data, compact, indent, escapes, **(limits or {})) + '\n'
+
+
+def _render(source, *args):
+    """Run render_file(), returning an error rather than raising it."""
+    try:
+        return render_file(source, *args), None
+    except (OSError, ValueError) as err:
+        return None, err
+
+
+def iter_files(sources, compact=False, indent=2, escapes=None, jobs=None,
+               backend=None, limits=None):
+    """
+    Color many files concurrently.
+
+    At most two files per worker are in flight, so memory stays bounded
+    however many files there are.  A file that cannot be read or parsed
+    does not stop the others.
+
+    Args:
+        sources (iterable): paths of files, or content already read (bytes)
+        compact (boolean): non-indended output
+        indent (int): set indenting for compact=False mode
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+        jobs (int): number of worker processes; default: a pool of THREADS
+            threads, 1: every file is colored in this thread
+        backend (str): JSON backend name, see get_backend()
+        limits (dict): max_* limits of a preview, see render_json()
+
+    Yields:
+        (output, error) for each file, in the order of sources; output is
+            None if error, an OSError or ValueError, is set
+    """
+    args = (compact, indent, escapes, backend, limits)
+    if jobs == 1:
+        for source in sources:
+            yield _render(source, *args)
+        return
+
+    if jobs is None:
+        from concurrent.futures import ThreadPoolExecutor as Executor
+
+        workers = THREADS
+    else:
+        from concurrent.futures import ProcessPoolExecutor as Executor
+
+        workers = jobs
+    with Executor(max_workers=workers) as pool:
+        pending = deque()
+        for source in sources:
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+            pending.append(pool.submit(_render, source, *args))
+        while pending:
+            yield pending.popleft().result()
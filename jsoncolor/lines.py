@@ -0,0 +1,281 @@
+"""
+JSON Lines Coloring
+
+Colors newline-delimited JSON (NDJSON / JSON Lines), where each line is a
+document of its own.  Lines are grouped into batches that are colored in a
+pool of worker processes; output keeps the order of the input.
+
+follow() reads a growing log file like tail -F, so that each record can be
+colored as soon as it is complete.
+"""
+
+import os
+import stat
+import time
+from collections import deque
+from itertools import chain
+
+from jsoncolor.core import get_backend
+from jsoncolor.core import render_json
+from jsoncolor.errors import TokenizeError
+
+BATCH_SIZE = 256 * 1024
+
+# seconds between checks for new data while following a file
+FOLLOW_INTERVAL = 0.2
+
+# lines shown from the end of a followed file before following it
+FOLLOW_LINES = 10
+
+READ_SIZE = 64 * 1024
+
+
+def iter_batches(fileobj, size=BATCH_SIZE):
+    """
+    Group the lines of a file object into batches.
+
+    Args:
+        fileobj (file): binary or text file object
+        size (int): approximate number of bytes per batch
+
+    Yields:
+        (lineno, lines) tuples, where lineno is the line number of the
+            first line in the batch
+    """
+    lines, nbytes, start = [], 0, 1
+    for lineno, line in enumerate(fileobj, 1):
+        lines.append(line)
+        nbytes += len(line)
+        if nbytes >= size:
+            yield start, lines
+            lines, nbytes, start = [], 0, lineno + 1
+    if lines:
+        yield start, lines
+
+
+def render_batch(batch, compact=False, indent=2, escapes=None, backend=None,
+                 strict=True):
+    """
+    Color a batch of JSON lines.
+
+    Args:
+        batch (tuple): (lineno, lines) as produced by iter_batches()
+        compact (boolean): non-indended output
+        indent (int): set indenting for compact=False mode
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+        backend (str): JSON backend name, see get_backend()
+        strict (boolean): raise TokenizeError for a line that is not valid
+            JSON; if False, it is output unchanged
+
+    Returns:
+        colored output with every document terminated by a newline;
+            blank lines are skipped
+
+    Raises:
+        TokenizeError: a line is not valid JSON; its 'output' attribute
+            holds the output of the lines before it
+    """
+    start, lines = batch
+    backend = get_backend(backend)
+    out = []
+    for lineno, line in enumerate(lines, start):
+        if not line.strip():
+            continue
+        try:
+            data = backend.loads(line)
+        except ValueError as err:
+            if strict:
+                error = TokenizeError('line {}: {}'.format(lineno, err))
+                error.output = ''.join(out)
+                raise error
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', 'replace')
+            out.append(line.rstrip('\r\n') + '\n')
+            continue
+        if escapes is None:
+            out.append(backend.dumps(data, compact, indent, True))
+        else:
+            out.append(render_json(data, compact, indent, escapes))
+        out.append('\n')
+    return ''.join(out)
+
+
+def iter_lines(fileobj, compact=False, indent=2, escapes=None, jobs=None,
+               size=BATCH_SIZE, backend=None):
+    """
+    Color a JSON Lines file.
+
+    Input that fits in a single batch, or jobs=1, is colored in this
+    process; otherwise batches are spread over a process pool with at most
+    two batches per worker in flight, so memory stays bounded.
+
+    Args:
+        fileobj (file): binary or text file object
+        compact (boolean): non-indended output
+        indent (int): set indenting for compact=False mode
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+        jobs (int): number of worker processes, default: number of CPUs
+        size (int): approximate number of bytes per batch
+        backend (str): JSON backend name, see get_backend()
+
+    Yields:
+        colored output, one piece per batch, in input order
+
+    Raises:
+        TokenizeError: a line is not valid JSON, once the output of the
+            lines before it was yielded
+    """
+    jobs = jobs or os.cpu_count() or 1
+    batches = iter_batches(fileobj, size)
+    head = [b for b in (next(batches, None), next(batches, None)) if b]
+    try:
+        if jobs == 1 or len(head) < 2:
+            for batch in chain(head, batches):
+                yield render_batch(batch, compact, indent, escapes, backend)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            pending = deque()
+            for batch in chain(head, batches):
+                if len(pending) >= jobs * 2:
+                    yield pending.popleft().result()
+                pending.append(pool.submit(render_batch, batch, compact,
+                                           indent, escapes, backend))
+            while pending:
+                yield pending.popleft().result()
+    except TokenizeError as err:
+        yield err.output
+        raise
+
+
+def tail_offset(fileobj, count, size=READ_SIZE):
+    """
+    Find where the last lines of a seekable file start.
+
+    Args:
+        fileobj (file): binary file object
+        count (int): number of lines
+        size (int): number of bytes read at once, backwards from the end
+
+    Returns:
+        offset of the first of the last count lines; 0 if the file has
+            fewer lines
+    """
+    end = pos = fileobj.seek(0, os.SEEK_END)
+    if count <= 0:
+        return end
+    found = 0
+    while pos > 0:
+        start = max(pos - size, 0)
+        fileobj.seek(start)
+        block = fileobj.read(pos - start)
+        stop = len(block)
+        if pos == end and block.endswith(b'\n'):
+            # the last newline ends the last line, it does not start one
+            stop -= 1
+        while True:
+            stop = block.rfind(b'\n', 0, stop)
+            if stop < 0:
+                break
+            found += 1
+            if found == count:
+                return start + stop + 1
+        pos = start
+    return 0
+
+
+def _reopen(fileobj, path):
+    """
+    Check a followed file once the end of it was read.
+
+    Returns:
+        None if it may still grow; the same file, rewound, if it was
+            truncated; the new file if path names another file (the log
+            was rotated)
+    """
+    try:
+        info = os.fstat(fileobj.fileno())
+        if info.st_size < fileobj.tell():
+            fileobj.seek(0)
+            return fileobj
+        current = os.stat(path)
+    except OSError:
+        return None
+    if (current.st_dev, current.st_ino) == (info.st_dev, info.st_ino):
+        return None
+    try:
+        return open(path, 'rb')
+    except OSError:
+        return None
+
+
+def follow(fileobj, lines=FOLLOW_LINES, interval=FOLLOW_INTERVAL,
+           sleep=time.sleep):
+    """
+    Follow a growing JSON Lines file, like tail -F.
+
+    Starts with the last lines of the file and then waits for more; a
+    line is only yielded once its newline has been written.  If the file
+    is truncated it is read again from the start, and if it is replaced
+    (rotated) the new file is followed; a last line without a newline
+    before that is yielded as it is.  Pipes are read line by line until
+    they are closed.  Memory use is bounded by the longest line.
+
+    Args:
+        fileobj (file): binary file object, opened from a path
+        lines (int): number of lines shown from the end of the file
+        interval (float): seconds between checks for more data
+        sleep (callable): called with interval while waiting
+
+    Yields:
+        (lineno, lines) batches of complete lines, one per read, as
+            expected by render_batch(); lineno counts from 1 at the first
+            line yielded
+    """
+    path = getattr(fileobj, 'name', None)
+    try:
+        regular = stat.S_ISREG(os.fstat(fileobj.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):
+        regular = False
+    if not regular or not isinstance(path, str):
+        for lineno, line in enumerate(iter(fileobj.readline, b''), 1):
+            yield lineno, [line]
+        return
+
+    fileobj.seek(tail_offset(fileobj, lines))
+    lineno, partial = 1, []
+    try:
+        while True:
+            data = fileobj.read(READ_SIZE)
+            if data:
+                cut = data.rfind(b'\n') + 1
+                if not cut:
+                    partial.append(data)
+                    continue
+                batch = b''.join(partial + [data[:cut]]).split(b'\n')
+                batch.pop()
+                partial = [data[cut:]] if cut < len(data) else []
+                yield lineno, batch
+                lineno += len(batch)
+                continue
+            reopened = _reopen(fileobj, path)
+            if reopened is None:
+                sleep(interval)
+                continue
+            if reopened is not fileobj:
+                # what was written to the old file since it was last read
+                partial.append(fileobj.read())
+                fileobj.close()
+            batch = b''.join(partial).split(b'\n')
+            if not batch[-1]:
+                batch.pop()
+            if batch:
+                yield lineno, batch
+                lineno += len(batch)
+            fileobj, partial = reopened, []
+    finally:
+        fileobj.close()
@@ -0,0 +1,202 @@
+"""
+Interactive Paging
+
+A built-in pager that colors only what is on screen.  The document is
+formatted incrementally with the streaming renderer, so the first screen
+only needs the first chunk of input, and lines are colored in blocks as
+they scroll into view (plus a look-ahead), with a small cache of colored
+blocks for scrolling back.
+"""
+
+import shutil
+import sys
+from collections import OrderedDict
+
+import click
+
+from jsoncolor.core import colorize_raw
+
+BLOCK_SIZE = 128
+
+CACHE_SIZE = 32
+
+KEYS = {
+    'q': 'quit', 'Q': 'quit', '\x03': 'quit',
+    'j': 'down', 'e': 'down', '\r': 'down', '\n': 'down', '\x1b[B': 'down',
+    'k': 'up', 'y': 'up', '\x1b[A': 'up',
+    ' ': 'page_down', 'f': 'page_down', '\x1b[6~': 'page_down',
+    'b': 'page_up', '\x1b[5~': 'page_up',
+    'd': 'half_down', 'u': 'half_up',
+    'g': 'top', '<': 'top', '\x1b[H': 'top',
+    'G': 'bottom', '>': 'bottom', '\x1b[F': 'bottom',
+}
+
+
+class Pager:
+    """
+    Lazily formatted and colored lines of a JSON document.
+
+    Plain lines are kept once formatted (memory grows with how far the
+    document was scrolled, not with its size); colored lines are kept for
+    the most recently viewed blocks only.
+    """
+
+    def __init__(self, chunks, escapes=None, block_size=BLOCK_SIZE,
+                 cache_size=CACHE_SIZE):
+        """
+        Args:
+            chunks (iterable): formatted, uncolored pieces of the document,
+                e.g. from iter_stream()
+            escapes (dict): return value from create_escape_codes(), or
+                None for output without color codes
+            block_size (int): number of lines colored at once
+            cache_size (int): number of colored blocks kept
+        """
+        self._chunks = iter(chunks)
+        self._lines = []
+        self._partial = ''
+        self._blocks = OrderedDict()
+        self.escapes = escapes
+        self.block_size = block_size
+        self.cache_size = cache_size
+        self.complete = False
+        self.top = 0
+
+    def __len__(self):
+        """Number of lines formatted so far."""
+        return len(self._lines)
+
+    def _fill(self, count):
+        """Format lines until there are at least count, or the input ends."""
+        while len(self._lines) < count and not self.complete:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.complete = True
+                if self._partial:
+                    self._lines.append(self._partial)
+                    self._partial = ''
+                break
+            lines = (self._partial + chunk).split('\n')
+            self._partial = lines.pop()
+            self._lines.extend(lines)
+
+    def _block(self, index):
+        """Return the colored lines of a block, from the cache if possible."""
+        if index in self._blocks:
+            self._blocks.move_to_end(index)
+            return self._blocks[index]
+        start = index * self.block_size
+        lines = self._lines[start:start + self.block_size]
+        if self.escapes is not None:
+            on, off = self.escapes['Token']
+            text = colorize_raw('\n'.join(lines).encode(), self.escapes)
+            lines = text.decode().split('\n')
+            lines = [line + off for line in lines[:-1]] + lines[-1:]
+            lines = lines[:1] + [on + line for line in lines[1:]]
+        self._blocks[index] = lines
+        if len(self._blocks) > self.cache_size:
+            self._blocks.popitem(last=False)
+        return lines
+
+    def lines(self, start, stop, lookahead=0):
+        """
+        Return colored lines start to stop.
+
+        Args:
+            start (int): first line (0-based)
+            stop (int): line after the last line
+            lookahead (int): number of lines to format and color past stop
+
+        Returns:
+            list of colored lines; shorter than stop - start at the end
+                of the document
+        """
+        self._fill(stop + lookahead)
+        stop = min(stop, len(self._lines))
+        last = min(stop + lookahead, len(self._lines))
+        out = []
+        for index in range(start // self.block_size,
+                           (last - 1) // self.block_size + 1):
+            block = self._block(index)
+            offset = index * self.block_size
+            out.extend(block[max(start - offset, 0):stop - offset])
+        return out[:max(stop - start, 0)]
+
+    def scroll(self, action, height):
+        """
+        Move the viewport.
+
+        Args:
+            action (str): one of the values of KEYS
+            height (int): number of lines in the viewport
+        """
+        moves = {'down': 1, 'up': -1, 'page_down': height,
+                 'page_up': -height, 'half_down': height // 2,
+                 'half_up': -(height // 2)}
+        if action == 'top':
+            self.top = 0
+        elif action == 'bottom':
+            self._fill(float('inf'))
+            self.top = len(self._lines) - height
+        elif action in moves:
+            self.top += moves[action]
+            self._fill(self.top + height)
+            self.top = min(self.top, len(self._lines) - height)
+        self.top = max(self.top, 0)
+
+    def screen(self, width, height, lookahead=None):
+        """
+        Draw the viewport.
+
+        Args:
+            width (int): terminal width, used for the status line
+            height (int): terminal height, including the status line
+            lookahead (int): lines prepared past the viewport, default
+                one screen
+
+        Returns:
+            text that redraws the whole terminal
+        """
+        rows = max(height - 1, 1)
+        if lookahead is None:
+            lookahead = rows
+        lines = self.lines(self.top, self.top + rows, lookahead)
+        out = ['\x1b[H']
+        for line in lines:
+            out.append(line + '\x1b[K\r\n')
+        out.extend(['~\x1b[K\r\n'] * (rows - len(lines)))
+        last = self.top + len(lines)
+        end = '(END)' if self.complete and last >= len(self) else ''
+        status = ' lines {}-{} {}'.format(self.top + 1, last, end)
+        out.append('\x1b[7m' + status[:width - 1] + '\x1b[0m\x1b[K')
+        return ''.join(out)
+
+
+def page(chunks, escapes=None):
+    """
+    Show a formatted JSON document in an interactive pager.
+
+    Keys: j/k or arrows scroll a line, space/b or PgDn/PgUp a page,
+    d/u half a page, g/G jump to the top/bottom, q quits.
+
+    Args:
+        chunks (iterable): formatted, uncolored pieces of the document,
+            e.g. from iter_stream()
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+    """
+    pager = Pager(chunks, escapes)
+    # alternate screen, no line wrapping, hidden cursor
+    sys.stdout.write('\x1b[?1049h\x1b[?7l\x1b[?25l')
+    try:
+        while True:
+            width, height = shutil.get_terminal_size()
+            sys.stdout.write(pager.screen(width, height))
+            sys.stdout.flush()
+            action = KEYS.get(click.getchar())
+            if action == 'quit':
+                break
+            pager.scroll(action, max(height - 1, 1))
+    finally:
+        sys.stdout.write('\x1b[?25h\x1b[?7h\x1b[?1049l')
+        sys.stdout.flush()
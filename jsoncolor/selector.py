@@ -0,0 +1,402 @@
+"""
+Path Selection
+
+Streaming selection of the values of a JSON document addressed by a small
+JSONPath-style expression, e.g. ``.data[*].status``.  The document is
+scanned as bytes: subtrees off the path are skipped without decoding or
+parsing them, and only the selected values are handed on as json text, so
+memory use is bounded by the chunk size and the largest selected value.
+
+Path syntax::
+
+    .               the whole document ($ may be used in front of any path)
+    .name           member "name" of an object
+    ."any name"     member of an object, quoted as a JSON string
+    ["any name"]    the same
+    [2]             item 2 of an array
+    [*] .* []       every item of an array or member of an object
+"""
+
+import json
+import re
+
+from jsoncolor.errors import TokenizeError
+
+# larger than CHUNK_SIZE: skipping is cheap, so reads dominate
+READ_SIZE = 1024 * 1024
+
+STEP_RE = re.compile(r'''
+    \.?\[ (?:
+        (?P<index>[0-9]+)
+      | (?P<quoted>"(?:[^"\\]|\\.)*")
+      | (?P<all>\*?)
+    ) \]
+  | \. (?:
+        (?P<name>(?:[^\W\d]|\$)[\w$-]*)
+      | (?P<key>"(?:[^"\\]|\\.)*")
+      | (?P<star>\*)
+    )''', re.VERBOSE)
+
+WS_RE = re.compile(rb'[ \t\n\r]*')
+
+STRING_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+
+# an object key and the colon after it
+MEMBER_RE = re.compile(rb'("[^"\\]*(?:\\.[^"\\]*)*")[ \t\n\r]*:', re.S)
+
+# the rest of a string, up to its closing quote or a trailing backslash
+STRING_BODY_RE = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+
+# numbers and keywords
+SCALAR_RE = re.compile(rb'[^ \t\n\r,:\[\]{}"]*')
+
+# everything up to the next bracket, complete strings included
+SKIP_RE = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*',
+                     re.S)
+
+# brackets and quotes, the only bytes counted when skipping ahead
+NOT_MARKS = bytes(c for c in range(256) if c not in b'"[]{}')
+
+MARKS_STRING_RE = re.compile(rb'"[^"]*"')
+
+# bytes scanned token by token before skipping ahead
+SCAN_WINDOW = 16 * 1024
+
+QUOTE, BACKSLASH = b'"\\'
+OPENERS = frozenset(b'[{')
+
+# what is done with the next value
+NAV, CAPTURE, SKIP = range(3)
+
+# where the selector is in the document
+VALUE, SCAN, KEY_FIRST, KEY, COLON, ITEM_FIRST, ITEM, NEXT = range(8)
+
+
+def parse_path(path):
+    """
+    Parse a path expression.
+
+    Args:
+        path (str): e.g. '.data[*].status'
+
+    Returns:
+        tuple of steps: a member name (str), an array index (int), or None
+            for every item or member
+
+    Raises:
+        ValueError: path is not a valid expression
+    """
+    rest = path[1:] if path.startswith('$') else path
+    if rest in ('', '.'):
+        return ()
+    steps, pos = [], 0
+    while pos < len(rest):
+        m = STEP_RE.match(rest, pos)
+        if m is None:
+            raise ValueError('Invalid path {!r} at {!r}'.format(
+                path, rest[pos:]))
+        if m.group('index') is not None:
+            steps.append(int(m.group('index')))
+        elif m.group('name') is not None:
+            steps.append(m.group('name'))
+        elif m.group('quoted') or m.group('key'):
+            steps.append(json.loads(m.group('quoted') or m.group('key')))
+        else:
+            steps.append(None)
+        pos = m.end()
+    return tuple(steps)
+
+
+class PathSelector:
+    """
+    Incremental path selection.
+
+    Input is fed as bytes in arbitrary pieces; concatenated top-level
+    values (e.g. JSON Lines) are each searched.  Skipped subtrees are only
+    scanned for brackets and strings, so errors in them go unnoticed;
+    selected values are returned unparsed.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str|tuple): path expression, or steps from parse_path()
+        """
+        self.steps = parse_path(path) if isinstance(path, str) else path
+        self._names = {step: json.dumps(step, ensure_ascii=False).encode()
+                       for step in self.steps if isinstance(step, str)}
+        self._root = CAPTURE if not self.steps else NAV
+        self._buffer = b''
+        self._started = False
+        # navigated containers: [closer, index of the current item]
+        self._frames = []
+        self._state = VALUE
+        self._action = self._root
+        # inside the value being skipped or captured
+        self._depth = 0
+        self._in_string = False
+        self._parts = None
+
+    def _member(self, raw):
+        """Return the action for the object member with key raw."""
+        step = self.steps[len(self._frames) - 1]
+        if step is not None and raw != self._names.get(step):
+            if BACKSLASH not in raw or json.loads(raw) != step:
+                return SKIP
+        return CAPTURE if len(self._frames) == len(self.steps) else NAV
+
+    def _item(self):
+        """Return the action for the current item of an array."""
+        step = self.steps[len(self._frames) - 1]
+        if step is not None and step != self._frames[-1][1]:
+            return SKIP
+        return CAPTURE if len(self._frames) == len(self.steps) else NAV
+
+    def _skip_ahead(self, buf, pos):
+        """
+        Move to the end of buf if the value being scanned goes on past it.
+
+        Brackets outside strings are counted with bytes methods, which is
+        many times faster than scanning the input token by token.
+
+        Returns:
+            the position to resume at, or None if the value ends in buf
+        """
+        text = buf[pos:]
+        tail = len(text) - len(text.rstrip(b'\\'))
+        if tail:
+            # may escape the first byte of the next piece
+            text = text[:-tail]
+        if BACKSLASH in text:
+            text = text.replace(b'\\\\', b'').replace(b'\\"', b'')
+        # adjacent quotes only enclose bytes that are not brackets
+        marks = text.translate(None, NOT_MARKS).replace(b'""', b'')
+        in_string = False
+        if QUOTE in marks:
+            marks = MARKS_STRING_RE.sub(b'', marks)
+            if QUOTE in marks:
+                marks = marks[:marks.index(b'"')]
+                in_string = True
+        # drop balanced pairs, leaving the unmatched closers and openers
+        size = None
+        while size != len(marks):
+            size = len(marks)
+            marks = marks.replace(b'[]', b'').replace(b'{}', b'')
+        opens = len(marks.lstrip(b']}'))
+        if len(marks) - opens >= self._depth:
+            return None
+        self._depth += 2 * opens - len(marks)
+        self._in_string = in_string
+        return len(buf) - tail
+
+    def _scan(self, buf, pos):
+        """
+        Move through the value being skipped or captured.
+
+        Returns:
+            (position, done): the position after the value and True, or
+                where to resume once more input arrives and False
+        """
+        end = len(buf)
+        limit = min(end, pos + SCAN_WINDOW)
+        depth = self._depth
+        while True:
+            if self._in_string:
+                pos = STRING_BODY_RE.match(buf, pos).end()
+                if pos == end or buf[pos] == BACKSLASH:
+                    break
+                pos += 1
+                self._in_string = False
+                if not depth:
+                    return pos, True
+            if pos >= limit and limit < end:
+                self._depth = depth
+                resume = self._skip_ahead(buf, pos)
+                if resume is not None:
+                    return resume, False
+                limit = end
+            pos = SKIP_RE.match(buf, pos, limit).end()
+            if pos == end:
+                break
+            if pos == limit:
+                continue
+            char = buf[pos]
+            pos += 1
+            if char == QUOTE:
+                self._in_string = True
+            elif char in OPENERS:
+                depth += 1
+            else:
+                depth -= 1
+                if not depth:
+                    self._depth = 0
+                    return pos, True
+        self._depth = depth
+        return pos, False
+
+    def _done(self):
+        """Continue after a complete value."""
+        if self._frames:
+            self._state = NEXT
+        else:
+            self._state = VALUE
+            self._action = self._root
+
+    def feed(self, data, final=False):
+        """
+        Select from the next piece of the document.
+
+        Args:
+            data (bytes): next piece of the document
+            final (boolean): no more input will follow
+
+        Returns:
+            list of the json text (bytes) of every value completed by this
+                piece that the path selects
+
+        Raises:
+            TokenizeError: the document is not valid JSON along the path
+        """
+        buf = self._buffer + data if self._buffer else bytes(data)
+        if not self._started and buf:
+            if buf.startswith(b'\xef\xbb\xbf'[:len(buf)]) and len(buf) < 3:
+                self._buffer = buf
+                return []
+            self._started = True
+            if buf.startswith(b'\xef\xbb\xbf'):
+                buf = buf[3:]
+        selected = []
+        frames = self._frames
+        end = len(buf)
+        pos = 0
+        start = 0
+        while True:
+            state = self._state
+            if state == SCAN:
+                pos, done = self._scan(buf, pos)
+                if not done:
+                    if self._parts is not None:
+                        self._parts.append(buf[start:pos])
+                    break
+                if self._parts is not None:
+                    self._parts.append(buf[start:pos])
+                    selected.append(b''.join(self._parts))
+                    self._parts = None
+                self._done()
+                continue
+            pos = WS_RE.match(buf, pos).end()
+            if pos == end:
+                break
+            char = buf[pos:pos + 1]
+            if state == VALUE:
+                action = self._action
+                if action == NAV:
+                    step = self.steps[len(frames)]
+                    if char == b'{' and not isinstance(step, int):
+                        frames.append([b'}', None])
+                        self._state = KEY_FIRST
+                        pos += 1
+                        continue
+                    if char == b'[' and not isinstance(step, str):
+                        frames.append([b']', 0])
+                        self._state = ITEM_FIRST
+                        pos += 1
+                        continue
+                    action = SKIP
+                if char == b'"' or char in b'[{':
+                    self._in_string = char == b'"'
+                    self._depth = 0 if self._in_string else 1
+                    self._parts = [] if action == CAPTURE else None
+                    self._state = SCAN
+                    start = pos
+                    pos += 1
+                    continue
+                m = SCALAR_RE.match(buf, pos)
+                if m.end() == end and not final:
+                    break
+                if m.end() == pos:
+                    raise TokenizeError('Invalid JSON near: {!r}'.format(
+                        buf[pos:pos + 20]))
+                if action == CAPTURE:
+                    selected.append(buf[pos:m.end()])
+                pos = m.end()
+                self._done()
+            elif state in (KEY_FIRST, ITEM_FIRST) and char == frames[-1][0]:
+                frames.pop()
+                pos += 1
+                self._done()
+            elif state in (KEY_FIRST, KEY):
+                m = MEMBER_RE.match(buf, pos)
+                if m is not None:
+                    self._action = self._member(m.group(1))
+                    self._state = VALUE
+                    pos = m.end()
+                    continue
+                m = STRING_RE.match(buf, pos)
+                if m is None:
+                    if char != b'"' or final:
+                        raise TokenizeError(
+                            'Expecting property name near: {!r}'.format(
+                                buf[pos:pos + 20]))
+                    break
+                self._action = self._member(m.group())
+                self._state = COLON
+                pos = m.end()
+            elif state == COLON:
+                if char != b':':
+                    raise TokenizeError('Expecting \':\' delimiter')
+                self._state = VALUE
+                pos += 1
+            elif state in (ITEM_FIRST, ITEM):
+                self._action = self._item()
+                self._state = VALUE
+            elif char == b',':
+                pos += 1
+                frame = frames[-1]
+                if frame[1] is None:
+                    self._state = KEY
+                    continue
+                frame[1] += 1
+                step = self.steps[len(frames) - 1]
+                if step is not None and frame[1] > step:
+                    # past the selected item: skip the rest of the array
+                    frames.pop()
+                    self._in_string = False
+                    self._depth = 1
+                    self._state = SCAN
+                    continue
+                self._state = ITEM
+            elif char == frames[-1][0]:
+                frames.pop()
+                pos += 1
+                self._done()
+            else:
+                raise TokenizeError('Expecting \',\' delimiter near: '
+                                    '{!r}'.format(buf[pos:pos + 20]))
+        self._buffer = buf[pos:]
+        if final and (self._buffer.strip() or self._state != VALUE or
+                      frames):
+            raise TokenizeError('Unexpected end of JSON input')
+        return selected
+
+    def close(self):
+        """Select from whatever is left once the input is exhausted."""
+        return self.feed(b'', final=True)
+
+
+def iter_select(chunks, path):
+    """
+    Select values of a JSON document incrementally.
+
+    Args:
+        chunks (iterable): bytes-like pieces of json text, e.g. from
+            iter_chunks()
+        path (str): path expression, see parse_path()
+
+    Yields:
+        json text (bytes) of each selected value, in document order
+    """
+    selector = PathSelector(path)
+    for chunk in chunks:
+        yield from selector.feed(chunk)
+    yield from selector.close()
@@ -0,0 +1,394 @@
+"""
+Streaming JSON Coloring
+
+Incremental tokenizer and renderer used to color JSON documents that are
+too large to load into memory.  Input is read in fixed-size chunks and each
+chunk is colored and written out as soon as its tokens are complete, so
+memory use is bounded by the chunk size (plus the longest single string).
+"""
+
+import codecs
+import io
+import mmap
+import os
+import re
+import stat
+from functools import partial
+from json.decoder import scanstring
+from json.encoder import encode_basestring_ascii
+
+from jsoncolor.core import STYLE_KEYS
+from jsoncolor.core import _floatstr
+from jsoncolor.errors import TokenizeError
+
+CHUNK_SIZE = 64 * 1024
+
+TOKEN_RE = re.compile(r'''
+    [ \t\n\r]*
+    (?:
+        (?P<punct>[{}\[\],:])
+      | (?P<string>"[^"\\]*(?:\\.[^"\\]*)*")
+      | (?P<number>-?[0-9][0-9.eE+\-]*)
+      | (?P<keyword>true|false|null|NaN|Infinity|-Infinity)
+    )''', re.VERBOSE)
+
+# the rest of a string, up to its closing quote or a trailing backslash
+STRING_BODY_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*')
+
+NUMBER_RE = re.compile(r'-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?\Z')
+
+KEYWORDS = ('true', 'false', 'null', 'NaN', 'Infinity', '-Infinity')
+
+CLOSERS = {'}': '{', ']': '['}
+
+
+def map_file(fileobj):
+    """
+    Memory-map a file object read-only.
+
+    Returns:
+        mmap of the whole file, or None if fileobj is not a regular file
+            (a pipe, a terminal, stdin), is empty, or was already read from
+    """
+    try:
+        fd = fileobj.fileno()
+        if fileobj.tell() != 0:
+            return None
+        info = os.fstat(fd)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+    if not stat.S_ISREG(info.st_mode) or info.st_size == 0:
+        return None
+    try:
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def iter_chunks(fileobj, size=CHUNK_SIZE):
+    """
+    Read a file object in fixed-size chunks without decoding them.
+
+    Regular files are memory-mapped and yielded as memoryview slices of the
+    mapping, so no copy is made until a chunk is decoded or colored; other
+    files are read with buffered reads.  The mapping is closed once the
+    last slice is garbage collected.
+
+    Args:
+        fileobj (file): binary or text file object
+        size (int): number of bytes (or characters) per chunk
+
+    Yields:
+        memoryview, bytes or str chunks
+    """
+    mapped = map_file(fileobj)
+    if mapped is None:
+        yield from iter(partial(fileobj.read, size), fileobj.read(0))
+        return
+    view = memoryview(mapped)
+    for start in range(0, len(view), size):
+        yield view[start:start + size]
+
+
+def read_chunks(fileobj, size=CHUNK_SIZE):
+    """
+    Read a file object in fixed-size chunks.
+
+    Args:
+        fileobj (file): binary or text file object
+        size (int): number of bytes (or characters) per read
+
+    Yields:
+        decoded text chunks; a UTF-8 byte order mark is dropped
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    for chunk in iter_chunks(fileobj, size):
+        if not isinstance(chunk, str):
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def _is_partial(rest):
+    """Check whether the end of a chunk may be completed by the next one."""
+    if rest.startswith('"'):
+        return True
+    if any(k.startswith(rest) for k in KEYWORDS):
+        return True
+    return False
+
+
+class Tokenizer:
+    """
+    Incremental JSON tokenizer.
+
+    Text is fed in arbitrary pieces; tokens split across pieces are held
+    back until the rest of them arrives.  A string that goes on past a
+    piece is kept as a list of pieces and only its new text is scanned, so
+    long strings take linear time.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        # pieces of an unfinished string, and a backslash ending the last
+        self._parts = None
+        self._carry = ''
+
+    def _string(self, buf, start, scan, final):
+        """
+        Continue the unfinished string buf[start:], scanning from scan.
+
+        Returns:
+            the position after the closing quote, or None if the string
+                goes on past buf
+        """
+        pos = STRING_BODY_RE.match(buf, scan).end()
+        if pos < len(buf) and buf[pos] == '"':
+            self._parts.append(buf[start:pos + 1])
+            return pos + 1
+        if pos < len(buf) - 1 or final:
+            head = self._parts[0] if self._parts else buf[start:]
+            raise TokenizeError('Invalid JSON near: {!r}'.format(head[:20]))
+        # a trailing backslash escapes the first character of the next piece
+        self._parts.append(buf[start:pos])
+        self._carry = buf[pos:]
+        return None
+
+    def feed(self, text, final=False):
+        """
+        Tokenize the next piece of text.
+
+        Args:
+            text (str): next piece of the document
+            final (boolean): no more text will follow
+
+        Returns:
+            list of (kind, text) tuples, where kind is one of 'punct',
+                'string', 'number' or 'keyword'
+
+        Raises:
+            TokenizeError: the text is not a valid sequence of JSON tokens
+        """
+        tokens = []
+        if self._parts is not None:
+            text = self._carry + text
+            end = self._string(text, 0, 0, final)
+            if end is None:
+                return tokens
+            tokens.append(('string', ''.join(self._parts)))
+            self._parts = None
+            text = text[end:]
+        buf = self._buffer + text if self._buffer else text
+        pos = 0
+        end = len(buf)
+        match = TOKEN_RE.match
+        while True:
+            m = match(buf, pos)
+            if m is None:
+                rest = buf[pos:].lstrip(' \t\n\r')
+                if not rest:
+                    pos = end
+                elif final or not _is_partial(rest):
+                    raise TokenizeError('Invalid JSON near: {!r}'.format(
+                        rest[:20]))
+                elif rest.startswith('"'):
+                    start = end - len(rest)
+                    self._parts = []
+                    self._string(buf, start, start + 1, final)
+                    pos = end
+                else:
+                    pos = end - len(rest)
+                break
+            kind = m.lastgroup
+            if kind == 'number' and m.end() == end and not final:
+                pos = m.start(kind)
+                break
+            tokens.append((kind, m.group(kind)))
+            pos = m.end()
+        self._buffer = buf[pos:]
+        return tokens
+
+    def close(self):
+        """Tokenize whatever is left over once the input is exhausted."""
+        return self.feed('', final=True)
+
+
+class StreamRenderer:
+    """
+    Incremental JSON formatter and colorizer.
+
+    Produces the same layout as format_json()/render_json() from a token
+    stream, only keeping the stack of open containers in memory.
+    Concatenated top-level values are each written on their own line.
+    """
+
+    def __init__(self, compact=False, indent=2, escapes=None):
+        """
+        Args:
+            compact (boolean): non-indended output
+            indent (int): set indenting for compact=False mode
+            escapes (dict): return value from create_escape_codes(), or
+                None for output without color codes
+        """
+        if escapes is None:
+            escapes = dict.fromkeys(STYLE_KEYS, ('', ''))
+        if indent is not None and not isinstance(indent, str):
+            indent = ' ' * indent
+        if compact:
+            item_sep, key_sep = ',', ':'
+        elif indent is not None:
+            item_sep, key_sep = ',', ': '
+        else:
+            item_sep, key_sep = ', ', ': '
+        self._escapes = escapes
+        self._indent = indent
+        self._item_sep = self._paint('Token', item_sep)
+        self._key_sep = self._paint('Token', key_sep)
+        self._marks = {c: self._paint('Token', c) for c in '{}[]'}
+        self._newlines = {}
+        self._tokenizer = Tokenizer()
+        self._stack = []
+        self._pending = False
+        self._expect_key = False
+        self._after_key = False
+        self._after_value = False
+
+    def _paint(self, key, text):
+        on, off = self._escapes[key]
+        return on + text + off if on else text
+
+    def _newline(self, level):
+        if self._indent is None:
+            return ''
+        nl = self._newlines.get(level)
+        if nl is None:
+            nl = self._newlines[level] = '\n' + self._indent * level
+        return nl
+
+    def _scalar(self, kind, text):
+        if kind == 'string':
+            key = 'Name_Tag' if self._expect_key else 'String'
+            if not (text.isascii() and text.isprintable() and
+                    '\\' not in text):
+                try:
+                    text = encode_basestring_ascii(scanstring(text, 1)[0])
+                except ValueError as err:
+                    raise TokenizeError(str(err))
+            return self._paint(key, text)
+        if self._expect_key:
+            raise TokenizeError('Expecting property name: {!r}'.format(text))
+        if kind == 'number':
+            m = NUMBER_RE.match(text)
+            if m is None:
+                raise TokenizeError('Invalid number: {!r}'.format(text))
+            if m.group(1) or m.group(2):
+                text = _floatstr(float(text))
+            else:
+                text = int.__repr__(int(text))
+            return self._paint('Number', text)
+        if text in ('true', 'false', 'null'):
+            return self._paint('Keyword', text)
+        return self._paint('Number', text)
+
+    def _render(self, tokens):
+        out = []
+        stack = self._stack
+        for kind, text in tokens:
+            if self._after_key and text != ':':
+                raise TokenizeError('Expecting \':\' delimiter')
+            if kind != 'punct' or text in '{[':
+                if self._after_value:
+                    raise TokenizeError('Expecting \',\' delimiter')
+            if kind != 'punct':
+                if self._pending:
+                    out.append(self._newline(len(stack)))
+                    self._pending = False
+                out.append(self._scalar(kind, text))
+                self._after_key = self._expect_key
+                self._after_value = bool(stack) and not self._expect_key
+                self._expect_key = False
+                if not stack:
+                    out.append('\n')
+            elif text in '{[':
+                if self._expect_key:
+                    raise TokenizeError('Expecting property name')
+                if self._pending:
+                    out.append(self._newline(len(stack)))
+                out.append(self._marks[text])
+                stack.append(text)
+                self._pending = True
+                self._expect_key = text == '{'
+            elif text in '}]':
+                if not stack or stack[-1] != CLOSERS[text] or not (
+                        self._pending or self._after_value):
+                    raise TokenizeError('Unexpected {!r}'.format(text))
+                stack.pop()
+                if self._pending:
+                    out.append(self._marks[text])
+                    self._pending = False
+                else:
+                    out.append(self._newline(len(stack)) + self._marks[text])
+                self._expect_key = False
+                self._after_value = bool(stack)
+                if not stack:
+                    out.append('\n')
+            elif text == ',':
+                if not self._after_value:
+                    raise TokenizeError('Unexpected \',\'')
+                out.append(self._item_sep + self._newline(len(stack)))
+                self._expect_key = stack[-1] == '{'
+                self._after_value = False
+            else:
+                if not self._after_key:
+                    raise TokenizeError('Unexpected \':\'')
+                out.append(self._key_sep)
+                self._after_key = False
+        return ''.join(out)
+
+    def feed(self, text):
+        """
+        Render the next piece of the document.
+
+        Returns:
+            colored output for every token completed by this piece
+        """
+        return self._render(self._tokenizer.feed(text))
+
+    def close(self):
+        """
+        Render the rest of the document.
+
+        Raises:
+            TokenizeError: the document ended inside a value
+        """
+        out = self._render(self._tokenizer.close())
+        if self._stack:
+            raise TokenizeError('Unexpected end of JSON input')
+        return out
+
+
+def iter_stream(chunks, compact=False, indent=2, escapes=None):
+    """
+    Color a JSON document incrementally.
+
+    Args:
+        chunks (iterable): pieces of json text, e.g. from read_chunks()
+        compact (boolean): non-indended output
+        indent (int): set indenting for compact=False mode
+        escapes (dict): return value from create_escape_codes(), or None
+            for output without color codes
+
+    Yields:
+        colored output, one piece per input chunk
+    """
+    renderer = StreamRenderer(compact, indent, escapes)
+    for chunk in chunks:
+        out = renderer.feed(chunk)
+        if out:
+            yield out
+    out = renderer.close()
+    if out:
+        yield out
@@ -0,0 +1,148 @@
+"""
+Compiled Color Styles
+
+The escape codes of every style in the config file, for every color depth,
+compiled once and kept next to the render cache.  Later runs load them with
+a single read, without importing jsonconfig, parsing the config file or
+resolving colors.  The compiled file is keyed by the config file's
+modification time and size, and by a hash of its content, so touching the
+config file costs one hash and editing it one recompile.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import click
+
+from jsoncolor.cache import cache_dir
+from jsoncolor.core import COLOR_DEPTHS
+from jsoncolor.core import create_escape_codes
+
+# bumped whenever the compiled form or the escape codes change
+STYLES_VERSION = 1
+
+CONFIG_FILE = 'config.json'
+
+STYLES_FILE = 'styles.json'
+
+
+def config_path():
+    """Return the path of the config file, where jsonconfig keeps it."""
+    return os.path.join(click.get_app_dir('jsoncolor'), CONFIG_FILE)
+
+
+def compiled_path():
+    """Return the path of the compiled styles, in the cache directory."""
+    return os.path.join(cache_dir(), STYLES_FILE)
+
+
+def compile_styles(config):
+    """
+    Compile the styles of a config.
+
+    Args:
+        config (dict): content of the config file
+
+    Returns:
+        dict with the 'default' style name and the escape codes of each
+            style, by name and color depth, as create_escape_codes()
+            returns them
+
+    Raises:
+        KeyError: the config has no styles or no valid default style
+    """
+    styles = {name: {colors: create_escape_codes(style, colors)
+                     for colors in COLOR_DEPTHS}
+              for name, style in config['styles'].items()}
+    if config['default'] not in styles:
+        raise KeyError(config['default'])
+    return {'default': config['default'], 'styles': styles}
+
+
+def _read(path):
+    try:
+        with open(path, 'rb') as fileobj:
+            return json.loads(fileobj.read().decode('utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path, compiled):
+    """Replace the compiled styles at once, so readers never see half."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path),
+                                   suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w') as fileobj:
+            json.dump(compiled, fileobj)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_styles(path=None, compiled=None):
+    """
+    Load the compiled styles of the config file, compiling them if needed.
+
+    Args:
+        path (str): config file, default: config_path()
+        compiled (str): compiled styles file, default: compiled_path()
+
+    Returns:
+        dict from compile_styles(), or None if the config file is missing
+            or holds no valid styles
+    """
+    path = config_path() if path is None else path
+    compiled = compiled_path() if compiled is None else compiled
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    key = {'version': STYLES_VERSION, 'config': path,
+           'mtime': info.st_mtime_ns, 'size': info.st_size}
+    cached = _read(compiled)
+    if isinstance(cached, dict) and all(
+            cached.get(k) == v for k, v in key.items()):
+        return cached
+    try:
+        with open(path, 'rb') as fileobj:
+            content = fileobj.read()
+    except OSError:
+        return None
+    key['digest'] = hashlib.blake2b(content, digest_size=20).hexdigest()
+    if not (isinstance(cached, dict) and all(
+            cached.get(k) == key[k] for k in ('version', 'config', 'digest'))):
+        try:
+            cached = compile_styles(json.loads(content.decode('utf-8-sig')))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+    cached.update(key)
+    _write(compiled, cached)
+    return cached
+
+
+def default_escape_codes(colors='256'):
+    """
+    Return the escape codes of the default style from the compiled styles.
+
+    Args:
+        colors (str): color depth, one of COLOR_DEPTHS
+
+    Returns:
+        dict like create_escape_codes(), or None if there are no compiled
+            styles
+    """
+    compiled = load_styles()
+    try:
+        codes = compiled['styles'][compiled['default']][colors]
+        return {key: tuple(pair) for key, pair in codes.items()}
+    except (KeyError, TypeError, AttributeError):
+        return None
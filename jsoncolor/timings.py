@@ -0,0 +1,234 @@
+"""
+Stage Timings
+
+Wall time, bytes in and out and token counts for each stage of a jsoncolor
+run (read, parse, format, write), to find out where the time goes on a
+given payload.  Stages may be nested, e.g. a formatter pulling chunks from
+a reader: each stage is charged only its own time, not that of the stages
+it waits for.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+_END = object()
+
+# the stages of a jsoncolor run, in report order
+STAGES = ('read', 'parse', 'format', 'write')
+
+
+class Stage:
+    """Statistics of one stage; counters are None until measured."""
+
+    __slots__ = ('name', 'calls', 'seconds', 'bytes_in', 'bytes_out',
+                 'tokens')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.bytes_in = None
+        self.bytes_out = None
+        self.tokens = None
+
+    def add(self, field, count):
+        """Add count to the bytes_in, bytes_out or tokens counter."""
+        setattr(self, field, (getattr(self, field) or 0) + count)
+
+    def as_dict(self):
+        """Return the statistics as a json-serializable dict."""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+class Timings:
+    """
+    Statistics of the stages of a run.
+
+    Hooks are called with the Stage each time a measure() block ends and
+    once a stage's iter() or stream() is exhausted or closed, e.g. to send
+    the numbers to a metrics system as they come in.
+    """
+
+    def __init__(self, hooks=(), stages=STAGES):
+        """
+        Args:
+            hooks (iterable): callables taking a Stage
+            stages (iterable): names of the stages reported first, in this
+                order; others follow in the order they were first used
+        """
+        self.stages = OrderedDict((name, Stage(name)) for name in stages)
+        self.hooks = list(hooks)
+        self.started = time.perf_counter()
+        # time spent in nested stages, per active stage
+        self._nested = []
+
+    def stage(self, name):
+        """Return the Stage for name, created on first use."""
+        if name not in self.stages:
+            self.stages[name] = Stage(name)
+        return self.stages[name]
+
+    def _start(self):
+        self._nested.append(0.0)
+        return time.perf_counter()
+
+    def _stop(self, stage, start):
+        elapsed = time.perf_counter() - start
+        stage.seconds += elapsed - self._nested.pop()
+        stage.calls += 1
+        if self._nested:
+            self._nested[-1] += elapsed
+
+    def _done(self, stage):
+        for hook in self.hooks:
+            hook(stage)
+
+    @contextmanager
+    def measure(self, name):
+        """
+        Time a block of code as stage name.
+
+        Yields:
+            the Stage, to add byte and token counts to
+        """
+        stage = self.stage(name)
+        start = self._start()
+        try:
+            yield stage
+        finally:
+            self._stop(stage, start)
+            self._done(stage)
+
+    def iter(self, name, iterable, field='bytes_out'):
+        """
+        Time producing each item of an iterable as stage name.
+
+        Args:
+            name (str): stage name
+            iterable (iterable): str or bytes-like chunks
+            field (str): counter the length of each chunk is added to
+
+        Yields:
+            the items of iterable
+        """
+        stage = self.stage(name)
+        items = iter(iterable)
+        try:
+            while True:
+                start = self._start()
+                try:
+                    item = next(items, _END)
+                finally:
+                    self._stop(stage, start)
+                if item is _END:
+                    return
+                stage.add(field, len(item))
+                yield item
+        finally:
+            self._done(stage)
+
+    def stream(self, name, stream):
+        """Wrap a file object so its writes are timed as stage name."""
+        return _TimedStream(self, self.stage(name), stream)
+
+    @property
+    def total(self):
+        """Wall time in seconds since the Timings were created."""
+        return time.perf_counter() - self.started
+
+    def used(self):
+        """Return the stages that were measured, in report order."""
+        return [s for s in self.stages.values() if s.calls]
+
+    def as_dict(self):
+        """Return all statistics as a json-serializable dict."""
+        return {'stages': [s.as_dict() for s in self.used()],
+                'total_seconds': self.total}
+
+    def format(self, fmt='text'):
+        """
+        Format the statistics.
+
+        Args:
+            fmt (str): 'text' for a table, 'json' for a JSON object
+
+        Returns:
+            the report, ending with a newline
+        """
+        if fmt == 'json':
+            return json.dumps(self.as_dict()) + '\n'
+        rows = [('stage', 'calls', 'seconds', 'bytes in', 'bytes out',
+                 'tokens', 'MB/s')]
+        for s in self.used():
+            size = max(s.bytes_in or 0, s.bytes_out or 0)
+            rate = size / s.seconds / 1e6 if size and s.seconds else None
+            rows.append((s.name, str(s.calls), '{:.4f}'.format(s.seconds),
+                         _count(s.bytes_in), _count(s.bytes_out),
+                         _count(s.tokens), _count(rate, '{:.1f}')))
+        rows.append(('total', '', '{:.4f}'.format(self.total), '', '', '',
+                     ''))
+        widths = [max(len(row[i]) for row in rows) for i in range(7)]
+        return ''.join(
+            row[0].ljust(widths[0]) + ''.join(
+                '  ' + cell.rjust(width)
+                for cell, width in zip(row[1:], widths[1:])) + '\n'
+            for row in rows)
+
+
+def _count(value, fmt='{}'):
+    return '-' if value is None else fmt.format(value)
+
+
+class _TimedStream:
+    """File object wrapper that times write() and flush()."""
+
+    def __init__(self, timings, stage, stream):
+        self._timings = timings
+        self._stage = stage
+        self._stream = stream
+
+    def write(self, data):
+        start = self._timings._start()
+        try:
+            return self._stream.write(data)
+        finally:
+            self._timings._stop(self._stage, start)
+            self._stage.add('bytes_out', len(data))
+
+    def flush(self):
+        start = self._timings._start()
+        try:
+            self._stream.flush()
+        finally:
+            self._timings._stop(self._stage, start)
+            self._timings._done(self._stage)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def count_tokens(data):
+    """
+    Count the JSON tokens of a python object.
+
+    Tokens are counted like the streaming tokenizer does: scalars, keys,
+    brackets, commas and colons.
+
+    Returns:
+        number of tokens in format_json(data)
+    """
+    count, stack = 0, [data]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, dict):
+            # brackets, keys, colons and commas
+            count += 2 + 3 * len(o) - (1 if o else 0)
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple)):
+            count += 2 + len(o) - (1 if o else 0)
+            stack.extend(o)
+        else:
+            count += 1
+    return count
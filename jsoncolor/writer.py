@@ -0,0 +1,124 @@
+"""
+Buffered Output
+
+Writes output chunks to the binary stdout stream through one reusable
+buffer, so the colored document never has to be held in memory as a whole,
+neither as text nor encoded, and output reaches the reader while the rest
+is still being rendered.
+"""
+
+import codecs
+import sys
+
+BUFFER_SIZE = 1024 * 1024
+
+# most text chunks, and characters, joined before they are encoded
+BATCH_SIZE = 1024
+BATCH_CHARS = 64 * 1024
+
+
+class ChunkWriter:
+    """
+    Buffered writer for text and bytes chunks.
+
+    Text chunks are joined in batches and encoded into a preallocated
+    buffer; the buffer is written to the stream whenever it is full.
+    Chunks larger than the buffer bypass it.
+    """
+
+    def __init__(self, stream=None, buffer_size=BUFFER_SIZE, encoding=None):
+        """
+        Args:
+            stream (file): binary stream, default: sys.stdout.buffer (or
+                sys.stdout itself if it is a text-only stream)
+            buffer_size (int): bytes written at once; 0 writes every
+                chunk as soon as it is given
+            encoding (str): encoding of text chunks, default: the encoding
+                of sys.stdout, or utf-8
+        """
+        if stream is None:
+            sys.stdout.flush()
+            stream = getattr(sys.stdout, 'buffer', None)
+            if encoding is None:
+                encoding = getattr(sys.stdout, 'encoding', None)
+            if stream is None:
+                stream, encoding = sys.stdout, None
+            elif encoding is None:
+                encoding = 'utf-8'
+        elif encoding is None:
+            encoding = 'utf-8'
+        self.stream = stream
+        self.encoding = encoding
+        self.buffer_size = buffer_size
+        # pending text and its encoded copy come on top of the buffer
+        self._batch_chars = min(buffer_size, BATCH_CHARS)
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._used = 0
+        self._pieces = []
+        self._pending = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8')('replace')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def write(self, chunk):
+        """Write a str or bytes-like chunk."""
+        if isinstance(chunk, str):
+            self._pieces.append(chunk)
+            self._pending += len(chunk)
+            if (len(self._pieces) >= BATCH_SIZE or
+                    self._pending >= self._batch_chars):
+                self._encode()
+        elif self.encoding is None:
+            self._encode()
+            self.stream.write(self._decoder.decode(bytes(chunk)))
+        else:
+            self._encode()
+            self._copy(chunk)
+
+    def writelines(self, chunks):
+        """Write every chunk of an iterable."""
+        for chunk in chunks:
+            self.write(chunk)
+
+    def _encode(self):
+        """Move the pending text chunks into the buffer."""
+        if not self._pieces:
+            return
+        text = ''.join(self._pieces)
+        self._pieces.clear()
+        self._pending = 0
+        if self.encoding is None:
+            self.stream.write(text)
+            return
+        # encode a batch at a time, not a copy of all the text
+        for start in range(0, len(text), BATCH_CHARS):
+            self._copy(text[start:start + BATCH_CHARS].encode(self.encoding,
+                                                              'replace'))
+
+    def _copy(self, data):
+        """Add bytes to the buffer, writing it out when it is full."""
+        size = len(data)
+        if self._used + size > self.buffer_size:
+            self._drain()
+        if size >= self.buffer_size:
+            self.stream.write(data)
+            return
+        self._view[self._used:self._used + size] = data
+        self._used += size
+
+    def _drain(self):
+        """Write the buffered bytes to the stream."""
+        if self._used:
+            self.stream.write(self._view[:self._used])
+            self._used = 0
+
+    def flush(self):
+        """Write everything that is buffered and flush the stream."""
+        self._encode()
+        self._drain()
+        self.stream.flush()
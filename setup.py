@@ -50,13 +50,19 @@ setup(
     classifiers=[
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2',
         'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
         'Topic :: Utilities',
     ],
 
+    python_requires='>=3.7',
+
     install_requires=[
-        'jsoncore>=0.6.8',
         'jsonconfig-tool',
         'click>=6.0',
         'pygments',
@@ -73,7 +79,7 @@ setup(
     entry_points={
         'console_scripts': [
             'jsoncolor='
-            'jsoncolor.cli:main']
+            'jsoncolor.client:main']
     },
     cmdclass={
         'install': PostInstallCommand,
@@ -0,0 +1,138 @@
+"""jsoncolor.cache tests"""
+
+import io
+import os
+
+from jsoncolor.cache import RenderCache
+from jsoncolor.cache import TeeStream
+from jsoncolor.cache import render_digest
+
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+def add(cache, key, data, mtime):
+    """Store data under key and set its last use to mtime."""
+    with cache.store(key) as fileobj:
+        fileobj.write(data)
+    os.utime(cache.path(key), (mtime, mtime))
+
+
+##############################################################################
+# TESTS: render_digest()
+##############################################################################
+
+def test_render_digest():
+    """
+    GIVEN the same input rendered with different settings
+    WHEN hashing them
+    THEN assert every setting changes the key
+    """
+    keys = set()
+    for settings in [{'indent': 2}, {'indent': 4}, {'indent': 2, 'c': 1},
+                     {'indent': 2, 'backend': 'orjson'}]:
+        digest = render_digest(**settings)
+        digest.update(b'[1]')
+        keys.add(digest.hexdigest())
+    digest = render_digest(indent=2)
+    digest.update(b'[2]')
+    keys.add(digest.hexdigest())
+    assert len(keys) == 5
+
+
+##############################################################################
+# TESTS: RenderCache
+##############################################################################
+
+def test_store_get(tmpdir):
+    """
+    GIVEN an empty cache
+    WHEN storing an entry
+    THEN assert it is found afterwards, and only then
+    """
+    cache = RenderCache(str(tmpdir.join('cache')))
+    assert cache.get('k') is None
+    with cache.store('k') as fileobj:
+        fileobj.write(b'colored')
+    with open(cache.get('k'), 'rb') as fileobj:
+        assert fileobj.read() == b'colored'
+
+
+def test_store_failed(tmpdir):
+    """
+    GIVEN a cache
+    WHEN rendering an entry fails
+    THEN assert nothing is stored
+    """
+    cache = RenderCache(str(tmpdir))
+    try:
+        with cache.store('k') as fileobj:
+            fileobj.write(b'part')
+            raise KeyboardInterrupt
+    except KeyboardInterrupt:
+        pass
+    assert cache.get('k') is None
+    assert tmpdir.listdir() == []
+
+
+def test_evict(tmpdir):
+    """
+    GIVEN a cache with room for two 4-byte entries
+    WHEN a third entry is stored after the first one was used again
+    THEN assert the least recently used entry is removed
+    """
+    cache = RenderCache(str(tmpdir), max_size=8)
+    add(cache, 'a', b'aaaa', 100)
+    add(cache, 'b', b'bbbb', 200)
+    assert cache.get('a') is not None
+    add(cache, 'c', b'cccc', 300)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+
+
+def test_store_tooLarge(tmpdir):
+    """
+    GIVEN a cache with a size cap
+    WHEN storing an entry larger than the cap
+    THEN assert it is dropped and other entries are kept
+    """
+    cache = RenderCache(str(tmpdir), max_size=8)
+    add(cache, 'a', b'aaaa', 100)
+    with cache.store('big') as fileobj:
+        fileobj.write(b'x' * 9)
+    assert cache.get('big') is None
+    assert cache.get('a') is not None
+
+
+def test_clear(tmpdir):
+    """
+    GIVEN a cache with entries
+    WHEN clearing it
+    THEN assert every entry is removed and counted
+    """
+    cache = RenderCache(str(tmpdir))
+    add(cache, 'a', b'a', 100)
+    add(cache, 'b', b'b', 100)
+    assert cache.clear() == 2
+    assert cache.entries() == []
+    assert RenderCache(str(tmpdir.join('missing'))).clear() == 0
+
+
+##############################################################################
+# TESTS: TeeStream
+##############################################################################
+
+def test_tee_stream():
+    """
+    GIVEN a stream and a copy
+    WHEN writing text and bytes
+    THEN assert both receive everything, the copy encoded
+    """
+    stream, copy = io.StringIO(), io.BytesIO()
+    tee = TeeStream(stream, copy)
+    tee.write('é')
+    tee.flush()
+    assert stream.getvalue() == 'é'
+    assert copy.getvalue() == 'é'.encode()
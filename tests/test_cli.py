@@ -2,19 +2,28 @@
 
 from unittest.mock import patch, call
 
+import gzip
+import io
+import json
 import os
 import pytest
 
-import jsoncore
 import click._termui_impl
 from click import Context
 from click.testing import CliRunner
 
 import jsoncolor.cli
+from jsoncolor.cli import cached_output
+from jsoncolor.cli import color_depth
 from jsoncolor.cli import create_style
+from jsoncolor.cli import lines_output
+from jsoncolor.cli import load_json
 from jsoncolor.cli import main
 from jsoncolor.cli import output
+from jsoncolor.cli import pager_output
+from jsoncolor.cli import raw_output
 from jsoncolor.cli import sample_styles
+from jsoncolor.cli import stream_output
 from jsoncolor.cli import set_default
 from jsoncolor.cli import SAMPLE
 
@@ -40,17 +49,12 @@ def test_create_style(cfg_mock, capsys):
 # TESTS: main()
 ##############################################################################
 
-# skip this test if jsoncore is not the correct version
-minversion = pytest.mark.skipif(jsoncore.__version__ < '0.6.8',
-                    reason='not compatible with jsoncore version <= 0.6.8')
-
 # skip this test if on travs-ci
 travis = pytest.mark.skipif("TRAVIS" in os.environ and
                     os.environ["TRAVIS"] == "true",
                     reason='skipping test if on travis-ci')
 
 
-@minversion
 def test_main_noArgs(monkeypatch):
     """
     GIVEN a call to jsoncolor
@@ -81,7 +85,6 @@ def test_main_jsonfile(o_mk):
     assert o_mk.call_count == 1
 
 
-@minversion
 @patch('jsoncolor.cli.sample_styles')
 def test_main_stylesSet(style_mock):
     """
@@ -94,7 +97,6 @@ def test_main_stylesSet(style_mock):
     assert style_mock.call_count == 1
 
 
-@minversion
 @patch('jsoncolor.cli.output')
 @patch('jsoncolor.cli.set_default')
 def test_main_setDefault(def_mk, o_mk):
@@ -109,7 +111,234 @@ def test_main_setDefault(def_mk, o_mk):
     assert o_mk.call_count == 1
 
 
-@minversion
+@patch('jsoncolor.cli.output')
+@patch('jsoncolor.cli.stream_output')
+def test_main_stream(stream_mk, o_mk):
+    """
+    GIVEN a call to jsoncolor
+    WHEN the --stream option is used
+    THEN assert stream_output() is called instead of output()
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['--stream'], input='[1]')
+    assert stream_mk.call_count == 1
+    assert o_mk.call_count == 0
+
+
+@patch('jsoncolor.cli.lines_output')
+def test_main_lines(lines_mk):
+    """
+    GIVEN a call to jsoncolor
+    WHEN the --lines and --jobs options are used
+    THEN assert lines_output() is called with the number of jobs
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['--lines', '-j', '3'], input='[1]')
+    assert lines_mk.call_count == 1
+    assert lines_mk.call_args[1]['jobs'] == 3
+
+
+@patch('jsoncolor.cli.follow_output')
+def test_main_follow(follow_mk):
+    """
+    GIVEN a call to jsoncolor
+    WHEN the --follow option is used
+    THEN assert follow_output() is called
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['--follow'], input='[1]')
+    assert follow_mk.call_count == 1
+
+
+@patch('jsoncolor.cli.raw_output')
+def test_main_raw(raw_mk):
+    """
+    GIVEN a call to jsoncolor
+    WHEN the --raw option is used
+    THEN assert raw_output() is called
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['--raw'], input='[1]')
+    assert raw_mk.call_count == 1
+
+
+@patch('jsoncolor.cli.output')
+def test_main_preview(o_mk):
+    """
+    GIVEN a call to jsoncolor
+    WHEN the --max-depth, --max-items and --max-string options are used
+    THEN assert output() is called with the limits
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['--max-depth', '1', '--max-items', '0',
+                                  '--max-string', '5'], input='[1]')
+    assert o_mk.call_args[0][2] == 2
+    assert o_mk.call_args[1] == {'max_depth': 1, 'max_items': 0,
+                                 'max_string': 5}
+
+
+@patch('jsoncolor.cli.output')
+def test_main_backend(o_mk):
+    """
+    GIVEN a call to jsoncolor
+    WHEN the --backend option is used
+    THEN assert the backend is kept in the context, or a usage error is
+        reported if it is not installed
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['--backend', 'json'], input='[1]')
+    assert o_mk.call_args[0][1].meta['jsoncolor.backend'] == 'json'
+    with patch.dict('jsoncolor.core.BACKENDS', clear=True):
+        result = runner.invoke(main, ['--backend', 'ujson'], input='[1]')
+    assert result.exit_code == 2
+    assert "Invalid value for '--backend'" in result.output
+
+
+def test_main_timings():
+    """
+    GIVEN a call to jsoncolor
+    WHEN the --timings-format json option is used
+    THEN assert the output is unchanged and the report goes to stderr
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['-n', '--timings-format', 'json'],
+                           input='{"k": [1, 2]}')
+    assert json.loads(result.stdout) == {'k': [1, 2]}
+    report = json.loads(result.stderr)
+    names = [s['name'] for s in report['stages']]
+    assert names == ['read', 'parse', 'format', 'write']
+    assert report['stages'][1]['tokens'] == 9
+
+
+def test_main_previewStream():
+    """
+    GIVEN a call to jsoncolor
+    WHEN --max-depth is combined with --stream
+    THEN assert a usage error is reported
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['--stream', '--max-depth', '1'],
+                           input='[1]')
+    assert result.exit_code == 2
+    assert 'cannot be used with --stream' in result.output
+
+
+def test_main_path():
+    """
+    GIVEN a call to jsoncolor
+    WHEN the --path option is used
+    THEN assert each selected value is output as a document, and the
+        rest is skipped without being parsed
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['-n', '--path', '.a[*]'],
+                           input='{"a": [1, false, {"b": "c"}], "d": [1 2 x]}')
+    assert result.exit_code == 0
+    assert result.output == '1\nfalse\n{\n  "b": "c"\n}\n'
+
+
+def test_main_compressed(tmpdir):
+    """
+    GIVEN a gzip-compressed json file
+    WHEN jsoncolor is called with it, and with a corrupt one
+    THEN assert it is decompressed, or the error is reported
+    """
+    path = tmpdir.join('doc.json.gz')
+    path.write_binary(gzip.compress(b'{"k": [1]}'))
+    runner = CliRunner()
+    result = runner.invoke(main, ['-n', str(path)])
+    assert json.loads(result.output) == {'k': [1]}
+    path.write_binary(gzip.compress(b'{"k": [1]}')[:-4])
+    result = runner.invoke(main, ['-n', '--stream', str(path)])
+    assert result.exit_code == 1
+    assert 'Invalid gzip input' in result.output
+
+
+def test_main_files(tmpdir):
+    """
+    GIVEN json files, an invalid one and a missing one
+    WHEN jsoncolor is called with them, as names and a glob pattern
+    THEN assert they are output in argument order with headers, errors are
+        reported and the exit status is 1
+    """
+    tmpdir.join('b.json').write('[2]')
+    tmpdir.join('a.json').write('{"k": 1}')
+    tmpdir.join('c.json').write('[3')
+    runner = CliRunner()
+    with tmpdir.as_cwd():
+        result = runner.invoke(main, ['-n', '-H', 'b.json', 'missing.json',
+                                      '[ac].json'])
+    assert result.exit_code == 1
+    assert result.stdout == ('==> b.json <==\n[\n  2\n]\n\n'
+                             '==> missing.json <==\n\n'
+                             '==> a.json <==\n{\n  "k": 1\n}\n\n'
+                             '==> c.json <==\n')
+    assert result.stderr.startswith(
+        'Error: missing.json: No such file or directory\nError: c.json: ')
+
+
+def test_main_filesModes(tmpdir):
+    """
+    GIVEN two json files
+    WHEN jsoncolor is called with them in another output mode
+    THEN assert they are output one after the other, or the mode is
+        rejected if it takes a single file
+    """
+    tmpdir.join('a.json').write('{"k": 1}')
+    tmpdir.join('b.json').write('[2]')
+    runner = CliRunner()
+    with tmpdir.as_cwd():
+        result = runner.invoke(main, ['-n', '--path', '.k', 'a.json',
+                                      'a.json'])
+        assert result.output == '1\n1\n'
+        result = runner.invoke(main, ['-n', '--follow', 'a.json', 'b.json'])
+        assert result.exit_code == 2
+        assert '--follow takes a single file' in result.output
+
+
+def test_main_filesStdin(tmpdir):
+    """
+    GIVEN stdin named among json files
+    WHEN jsoncolor outputs them one after the other
+    THEN assert stdin is left open for a later read
+    """
+    tmpdir.join('a.json').write('{"k": 1}')
+    with tmpdir.as_cwd():
+        result = CliRunner().invoke(main, ['-n', '-r', '-', 'a.json', '-'],
+                                    input='[1]')
+    assert result.exit_code == 0
+    assert result.stdout == '[1]{"k": 1}'
+
+
+@pytest.mark.parametrize('args,message', [
+    (['--path', '.a['], "Invalid value for '--path'"),
+    (['--path', '.a', '--lines'], '--path cannot be used with --lines'),
+    (['--path', '.a'], 'Expecting property name'),
+])
+def test_main_pathInvalid(args, message):
+    """
+    GIVEN a call to jsoncolor
+    WHEN --path is invalid, used with another mode or with invalid json
+    THEN assert an error is reported
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['-n'] + args, input='{a: 1}')
+    assert result.exit_code != 0
+    assert message in result.output
+
+
+@patch('jsoncolor.cli.output')
+def test_main_colors(o_mk):
+    """
+    GIVEN a call to jsoncolor
+    WHEN the --colors option is used
+    THEN assert the color depth is passed on in the context
+    """
+    runner = CliRunner()
+    result = runner.invoke(main, ['--colors', '16'], input='[1]')
+    assert o_mk.call_args[0][1].meta['jsoncolor.colors'] == '16'
+
+
 @patch('jsoncolor.cli.create_style')
 def test_main_create(create_mk):
     """
@@ -122,6 +351,24 @@ def test_main_create(create_mk):
     assert create_mk.call_count == 1
 
 
+##############################################################################
+# TESTS: color_depth()
+##############################################################################
+
+def test_color_depth(ctx_mock, monkeypatch):
+    """
+    GIVEN no --colors option, --colors auto and --colors 16
+    WHEN the color depth is looked up
+    THEN assert it is detected from the environment unless it is set
+    """
+    monkeypatch.setenv('COLORTERM', 'truecolor')
+    assert color_depth(ctx_mock) == 'truecolor'
+    ctx_mock.meta['jsoncolor.colors'] = 'auto'
+    assert color_depth(ctx_mock) == 'truecolor'
+    ctx_mock.meta['jsoncolor.colors'] = '16'
+    assert color_depth(ctx_mock) == '16'
+
+
 ##############################################################################
 # TESTS: output()
 ##############################################################################
@@ -140,33 +387,49 @@ def tty_fix(monkeypatch):
     yield
 
 
-@patch('jsoncolor.cli.format_json')
-@patch('jsoncolor.cli.highlighter')
-@patch('click.echo')
-def test_output_expectedArgs_styleNone_ttyTrue(e_mk, h_mk, f_mk,
-                                               out_fix, tty_fix):
+@patch('jsoncolor.cli.iter_json_parallel')
+@patch('jsoncolor.cli.create_escape_codes')
+def test_output_jobs(c_mk, p_mk, out_fix, tty_fix, capsys):
+    """
+    GIVEN json data to print in color and --jobs 4
+    WHEN output is called
+    THEN assert the document is rendered in a process pool
+    """
+    data, ctx = out_fix
+    c_mk.return_value = escapes = {'escapes'}
+    p_mk.return_value = iter(['{', '}'])
+    ctx.meta['jsoncolor.jobs'] = 4
+    output(data, ctx, indent=2)
+    p_mk.assert_called_once_with(data, False, 2, escapes, 4)
+    assert capsys.readouterr()[0] == '{}\n'
+
+
+@patch('jsoncolor.cli.iter_json')
+@patch('jsoncolor.cli.create_escape_codes')
+def test_output_expectedArgs_styleNone_ttyTrue(c_mk, r_mk, out_fix, tty_fix,
+                                               capsys):
     """
     GIVEN json data to print
     WHEN output is called with the expected args and style=None
     THEN assert the proper functions are called
     """
     data, ctx = out_fix
-    f_mk.return_value = data
-    h_mk.return_value = data
+    escapes = {'escapes'}
+    c_mk.return_value = escapes
+    r_mk.return_value = iter(['{', '}'])
+    ctx.meta['jsoncolor.colors'] = '256'
 
     output(data, ctx, indent=3, style=None)
 
-    f_mk.assert_called_once_with(data, False, 3)
-    h_mk.assert_called_once_with(data)
-    e_mk.assert_called_once_with(data)
+    c_mk.assert_called_once_with(None, '256')
+    r_mk.assert_called_once_with(data, False, 3, escapes)
+    assert capsys.readouterr()[0] == '{}\n'
 
 
-@patch('jsoncolor.cli.format_json')
-@patch('jsoncolor.cli.highlighter')
-@patch('jsoncolor.cli.create_style_class')
-@patch('click.echo')
-def test_output_expectedArgs_styleSet_ttyTrue(e_mk, c_mk, h_mk, f_mk,
-                                              out_fix, tty_fix):
+@patch('jsoncolor.cli.iter_json')
+@patch('jsoncolor.cli.create_escape_codes')
+def test_output_expectedArgs_styleSet_ttyTrue(c_mk, r_mk, out_fix, tty_fix,
+                                              capsys):
     """
     GIVEN json data to print
     WHEN output is called with the expected args and style is set
@@ -174,46 +437,291 @@ def test_output_expectedArgs_styleSet_ttyTrue(e_mk, c_mk, h_mk, f_mk,
     """
     data, ctx = out_fix
     style = {'style'}
-    f_mk.return_value = data
-    h_mk.return_value = data
-    c_mk.return_value = style
+    escapes = {'escapes'}
+    c_mk.return_value = escapes
+    r_mk.return_value = iter(['{', '}'])
+    ctx.meta['jsoncolor.colors'] = 'truecolor'
 
     output(data, ctx, indent=3, style=style)
 
-    f_mk.assert_called_once_with(data, False, 3)
-    c_mk.assert_called_once_with(style)
-    h_mk.assert_called_once_with(data, style)
-    e_mk.assert_called_once_with(data)
+    c_mk.assert_called_once_with(style, 'truecolor')
+    r_mk.assert_called_once_with(data, False, 3, escapes)
+    assert capsys.readouterr()[0] == '{}\n'
 
 
 @patch('jsoncolor.cli.format_json')
-@patch('click.echo')
-def test_output_expectedArgs_styleNone_ttyFalse_indentSet(e_mk, f_mk,
-                                                          out_fix):
+def test_output_expectedArgs_styleNone_ttyFalse_indentSet(f_mk, out_fix,
+                                                          capsys):
     """
     GIVEN json data to print and invoked from other than a tty
     WHEN output is called with style=None and indent=3
     THEN assert the proper functions are called
     """
     data, ctx = out_fix
-    f_mk.return_value = data
+    f_mk.return_value = '{}'
     output(data, ctx, indent=3, style=None)
-    f_mk.assert_called_once_with(data, False, 3)
+    f_mk.assert_called_once_with(data, False, 3, None, True)
+    assert capsys.readouterr()[0] == '{}\n'
 
 
 @patch('jsoncolor.cli.format_json')
-@patch('click.echo')
-def test_output_expectedArgs_styleNone_ttyFalse_indentNone(e_mk, f_mk,
-                                                           out_fix):
+def test_output_expectedArgs_styleNone_ttyFalse_indentNone(f_mk, out_fix,
+                                                           capsys):
     """
     GIVEN json data to print and invoked from other than a tty
     WHEN output is called with style=None and indent=None
     THEN assert the proper functions are called
     """
     data, ctx = out_fix
-    f_mk.return_value = data
+    f_mk.return_value = '{}'
     output(data, ctx, indent=None, style=None)
-    f_mk.assert_called_once_with(data, True, None)
+    f_mk.assert_called_once_with(data, True, None, None, True)
+
+
+def test_output_bufferSize(out_fix, capsysbinary):
+    """
+    GIVEN a --buffer-size smaller than the output
+    WHEN output is called
+    THEN assert the whole document is written
+    """
+    data, ctx = out_fix
+    ctx.meta['jsoncolor.buffer_size'] = 4
+    output(data, ctx, indent=None, style=None)
+    assert capsysbinary.readouterr()[0] == b'{"k1":"v1","k2":"v2"}\n'
+
+
+##############################################################################
+# TESTS: cached_output()
+##############################################################################
+
+def test_cached_output(ctx_mock, tty_fix, monkeypatch, tmpdir,
+                       capsysbinary):
+    """
+    GIVEN a document above the cache threshold
+    WHEN it is output in color twice
+    THEN assert the second output is copied from the cache unchanged
+    """
+    monkeypatch.setenv('JSONCOLOR_CACHE_DIR', str(tmpdir))
+    monkeypatch.setattr(jsoncolor.cli, 'MIN_SIZE', 1)
+    outputs = []
+    with patch('jsoncolor.cli.parse_json',
+               wraps=jsoncolor.cli.parse_json) as parse:
+        for _ in range(2):
+            cached_output(io.BytesIO(b'{"k": [1, 2]}'), ctx_mock, None,
+                          style={'Number': '#af005f'})
+            outputs.append(capsysbinary.readouterr()[0])
+        assert parse.call_count == 1
+    assert b'\x1b[' in outputs[0]
+    assert outputs[1] == outputs[0]
+    assert len(tmpdir.listdir()) == 1
+
+
+def test_cached_output_noColor(ctx_mock, monkeypatch, tmpdir, capsysbinary):
+    """
+    GIVEN a document above the cache threshold
+    WHEN it is output without colors, to a pipe
+    THEN assert it is not cached
+    """
+    monkeypatch.setenv('JSONCOLOR_CACHE_DIR', str(tmpdir))
+    monkeypatch.setattr(jsoncolor.cli, 'MIN_SIZE', 1)
+    cached_output(io.BytesIO(b'{"k": [1, 2]}'), ctx_mock, None)
+    assert capsysbinary.readouterr()[0] == b'{"k":[1,2]}\n'
+    assert tmpdir.listdir() == []
+
+
+def test_cached_output_small(ctx_mock, monkeypatch, tmpdir, capsysbinary):
+    """
+    GIVEN a document below the cache threshold
+    WHEN it is output
+    THEN assert it is not cached
+    """
+    monkeypatch.setenv('JSONCOLOR_CACHE_DIR', str(tmpdir))
+    cached_output(io.BytesIO(b'[1]'), ctx_mock, None)
+    assert capsysbinary.readouterr()[0] == b'[1]\n'
+    assert tmpdir.listdir() == []
+
+
+def test_main_clearCache(monkeypatch, tmpdir):
+    """
+    GIVEN a cache directory with an entry
+    WHEN jsoncolor runs with --clear-cache
+    THEN assert the entry is removed
+    """
+    monkeypatch.setenv('JSONCOLOR_CACHE_DIR', str(tmpdir))
+    tmpdir.join('0123.out').write('cached')
+    monkeypatch.setattr(click._termui_impl, 'isatty', lambda x: True)
+    result = CliRunner().invoke(main, ['--clear-cache'])
+    assert result.exit_code == 0
+    assert 'Removed 1 cached document' in result.output
+    assert tmpdir.listdir() == []
+
+
+##############################################################################
+# TESTS: load_json()
+##############################################################################
+
+def test_load_json():
+    """
+    GIVEN a file with json content
+    WHEN loading it
+    THEN assert the parsed data is returned
+    """
+    assert load_json(io.BytesIO(b'{"k": [1]}')) == {'k': [1]}
+
+
+def test_load_json_file(tmpdir):
+    """
+    GIVEN a regular file with json content and a byte order mark
+    WHEN loading it
+    THEN assert the memory-mapped content is parsed
+    """
+    path = tmpdir.join('doc.json')
+    path.write_binary(b'\xef\xbb\xbf{"k": "\xc3\xa9"}')
+    with open(str(path), 'rb') as jsonfile:
+        assert load_json(jsonfile) == {'k': '\u00e9'}
+
+
+def test_load_json_empty():
+    """
+    GIVEN no file or a file without content
+    WHEN loading it
+    THEN assert None is returned
+    """
+    assert load_json(None) is None
+    assert load_json(io.BytesIO(b' \n')) is None
+
+
+def test_load_json_invalid():
+    """
+    GIVEN a file with invalid json content
+    WHEN loading it
+    THEN assert click.BadParameter is raised
+    """
+    with pytest.raises(click.BadParameter):
+        load_json(io.BytesIO(b'{"k": }'))
+
+
+@pytest.mark.parametrize('backend', ['json', 'auto'])
+def test_load_json_backend(backend):
+    """
+    GIVEN json content with NaN and an integer beyond 64 bits
+    WHEN loading it with a backend
+    THEN assert it is parsed like json.loads
+    """
+    data = load_json(io.BytesIO(b'[NaN, 123456789012345678901234]'),
+                     backend)
+    assert data[0] != data[0]
+    assert data[1] == 123456789012345678901234
+    data = load_json(io.BytesIO(b'[-9223372036854775809]'), backend)
+    assert data == [-9223372036854775809]
+
+
+def test_output_preview(ctx_mock, capsys):
+    """
+    GIVEN json data and no color terminal
+    WHEN output is called with a depth limit
+    THEN assert the preview is written without color codes
+    """
+    output({'k': [1, 2]}, ctx_mock, indent=None, max_depth=1)
+    out, err = capsys.readouterr()
+    assert out == '{"k":[\u20262 items]}\n'
+
+
+##############################################################################
+# TESTS: stream_output()
+##############################################################################
+
+def test_stream_output_ttyFalse(ctx_mock, capsys):
+    """
+    GIVEN json content piped from other than a tty
+    WHEN stream_output is called with indent=None
+    THEN assert compact output is written without color codes
+    """
+    stream_output(io.BytesIO(b'{"k": [1, 2]}'), ctx_mock, indent=None)
+    out, err = capsys.readouterr()
+    assert out == '{"k":[1,2]}\n'
+
+
+def test_stream_output_invalid(ctx_mock):
+    """
+    GIVEN invalid json content
+    WHEN stream_output is called
+    THEN assert click.ClickException is raised
+    """
+    with pytest.raises(click.ClickException):
+        stream_output(io.BytesIO(b'[1,'), ctx_mock, indent=2)
+
+
+##############################################################################
+# TESTS: lines_output()
+##############################################################################
+
+def test_lines_output_ttyFalse(ctx_mock, capsys):
+    """
+    GIVEN json lines piped from other than a tty
+    WHEN lines_output is called with indent=None
+    THEN assert every line is written as compact json
+    """
+    lines_output(io.BytesIO(b'{"k": 1}\n[2]\n'), ctx_mock, indent=None,
+                 jobs=1)
+    out, err = capsys.readouterr()
+    assert out == '{"k":1}\n[2]\n'
+
+
+def test_lines_output_invalid(ctx_mock):
+    """
+    GIVEN a json lines file with an invalid line
+    WHEN lines_output is called
+    THEN assert click.ClickException is raised
+    """
+    with pytest.raises(click.ClickException):
+        lines_output(io.BytesIO(b'1\n[\n'), ctx_mock, indent=2, jobs=1)
+
+
+##############################################################################
+# TESTS: raw_output()
+##############################################################################
+
+def test_raw_output_noColor(ctx_mock, capsysbinary):
+    """
+    GIVEN json content with irregular formatting
+    WHEN raw_output is called and stdout is not a tty
+    THEN assert the content is written unchanged
+    """
+    content = b'{"k" :[1,\n  2]}'
+    raw_output(io.BytesIO(content), ctx_mock)
+    out, err = capsysbinary.readouterr()
+    assert out == content
+
+
+##############################################################################
+# TESTS: pager_output()
+##############################################################################
+
+def test_pager_output_ttyFalse(ctx_mock, capsys):
+    """
+    GIVEN stdout that is not a tty
+    WHEN pager_output is called
+    THEN assert the content is streamed instead of paged
+    """
+    pager_output(io.BytesIO(b'{"k": [1, 2]}'), ctx_mock, indent=None)
+    out, err = capsys.readouterr()
+    assert out == '{"k":[1,2]}\n'
+
+
+@patch('jsoncolor.cli.page')
+def test_pager_output_ttyTrue(page_mock, ctx_mock, monkeypatch):
+    """
+    GIVEN stdout that is a tty
+    WHEN pager_output is called
+    THEN assert the pager gets indented lines and the escape codes
+    """
+    monkeypatch.setattr(click._termui_impl, 'isatty', lambda x: True)
+    pager_output(io.BytesIO(b'{"k": 1}'), ctx_mock, indent=2,
+                 style={'Number': '#af005f'})
+    chunks, escapes = page_mock.call_args[0]
+    assert ''.join(chunks) == '{\n  "k": 1\n}\n'
+    assert escapes['Number'] == ('\x1b[38;5;125m', '\x1b[39m')
 
 
 ##############################################################################
@@ -0,0 +1,73 @@
+"""jsoncolor.compress tests"""
+
+import bz2
+import gzip
+import io
+import lzma
+
+import pytest
+
+from jsoncolor.compress import decompress
+from jsoncolor.errors import DecompressError
+from jsoncolor.stream import iter_chunks
+
+##############################################################################
+# CONSTANTS
+##############################################################################
+
+DATA = b'[' + b','.join(b'{"n": %d}' % i for i in range(5000)) + b']'
+
+COMPRESS = [gzip.compress, bz2.compress, lzma.compress]
+
+
+##############################################################################
+# TESTS: decompress()
+##############################################################################
+
+@pytest.mark.parametrize('compress', COMPRESS)
+@pytest.mark.parametrize('size', [1, 100, 65536])
+def test_decompress(compress, size):
+    """
+    GIVEN gzip, bzip2 or xz input read through a buffer, like stdin
+    WHEN decompressing it in chunks of any size
+    THEN assert the original content is read back
+    """
+    fileobj = io.BufferedReader(io.BytesIO(compress(DATA)))
+    assert b''.join(iter_chunks(decompress(fileobj, size), 1000)) == DATA
+
+
+@pytest.mark.parametrize('compress', COMPRESS)
+def test_decompress_concatenated(compress, tmpdir):
+    """
+    GIVEN a file of two concatenated compressed streams
+    WHEN decompressing it
+    THEN assert both are read, one after the other, and never mapped
+    """
+    path = tmpdir.join('doc.json.z')
+    path.write_binary(compress(b'[1]\n') + compress(b'[2]\n'))
+    with open(str(path), 'rb') as fileobj:
+        assert list(decompress(fileobj)) == [b'[1]\n', b'[2]\n']
+
+
+def test_decompress_plain():
+    """
+    GIVEN uncompressed input
+    WHEN passing it to decompress()
+    THEN assert the same file object is returned, unread
+    """
+    fileobj = io.BytesIO(b'{"a": 1}')
+    assert decompress(fileobj) is fileobj
+    assert fileobj.tell() == 0
+    assert decompress(None) is None
+
+
+@pytest.mark.parametrize('compress', COMPRESS)
+def test_decompress_invalid(compress):
+    """
+    GIVEN truncated compressed input
+    WHEN decompressing it
+    THEN assert DecompressError is raised
+    """
+    fileobj = decompress(io.BytesIO(compress(DATA)[:-20]))
+    with pytest.raises(DecompressError):
+        fileobj.read()
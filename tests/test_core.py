@@ -2,13 +2,33 @@
 
 from unittest.mock import patch
 
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 import pygments.style
 
 from jsoncolor.core import validate_style
+from jsoncolor.core import closest_color
+from jsoncolor.core import colorize_raw
+from jsoncolor.core import colorize_stream
+from jsoncolor.core import create_escape_codes
 from jsoncolor.core import create_style_class
+from jsoncolor.core import detect_colors
+from jsoncolor.core import BACKENDS
 from jsoncolor.core import format_json
+from jsoncolor.core import get_backend
+from jsoncolor.core import get_highlighter
+from jsoncolor.core import highlight_many
 from jsoncolor.core import highlighter
+from jsoncolor.core import Highlighter
+from jsoncolor.core import iter_json_parallel
+from jsoncolor.core import iter_raw
+from jsoncolor.core import JSONBackend
+from jsoncolor.core import register_backend
+from jsoncolor.core import render_json
+from jsoncolor.errors import TokenizeError
 
 ##############################################################################
 # CONSTANTS
@@ -16,6 +36,12 @@ from jsoncolor.core import highlighter
 
 DATA = {'a': 'b', 'c': 'd'}
 
+NESTED = {'a': [1, -2.5, True, False, None, 'x"y\u00e9'], 'b': {}, 'c': [],
+          1: {'d': [[], {}, float('inf')]}, None: 'n'}
+
+SOLARIZED = {'Token': '#8a8a8a', 'Keyword': '#d75f00', 'Name_Tag': '#0087ff',
+             'String': '#00afaf', 'Number': '#af005f'}
+
 STYLE_TEST = {'Token': '#8a8a8a', 'Keyword': '#af0000', 'Name_Tag': '#268bd2',
               'String': '#af8700', 'Number': '#00afaf'}
 
@@ -76,6 +102,275 @@ def test_create_styleNone_class(style_mock):
     assert style.__class__ == pygments.style.StyleMeta
 
 
+def test_create_style_class_memoized():
+    """
+    GIVEN two color style dicts with the same contents
+    WHEN creating a style class for each
+    THEN assert the same class is returned
+    """
+    assert create_style_class(dict(SOLARIZED)) is create_style_class(
+        dict(SOLARIZED))
+
+
+##############################################################################
+# TESTS: create_escape_codes()
+##############################################################################
+
+def test_closest_color():
+    """
+    GIVEN colors that exist in the xterm 256-color palette
+    WHEN looking up the nearest palette index
+    THEN assert the exact palette entry is returned
+    """
+    assert closest_color(0x00, 0x00, 0x00) == 0
+    assert closest_color(0x00, 0x87, 0xff) == 33
+    assert closest_color(0x8a, 0x8a, 0x8a) == 245
+
+
+def test_create_escape_codes():
+    """
+    GIVEN a color style with valid and invalid color values
+    WHEN creating the escape codes for the style
+    THEN assert valid colors are used and invalid ones fall back to the
+        default style
+    """
+    escapes = create_escape_codes({'Token': '#000', 'Keyword': 'bad'})
+    assert escapes['Token'] == ('\x1b[38;5;0m', '\x1b[39m')
+    assert escapes['Keyword'] == ('\x1b[38;5;166m', '\x1b[39m')
+    assert escapes['Name_Tag'] == ('\x1b[38;5;33m', '\x1b[39m')
+    assert escapes['Comment'] == ('\x1b[38;5;240m', '\x1b[39m')
+
+
+def test_create_escape_codes_colors():
+    """
+    GIVEN a color style
+    WHEN creating the escape codes for 16 colors and for truecolor
+    THEN assert the nearest basic color and the exact color are used
+    """
+    escapes = create_escape_codes(SOLARIZED, '16')
+    assert escapes['Token'] == ('\x1b[90m', '\x1b[39m')
+    assert escapes['String'] == ('\x1b[36m', '\x1b[39m')
+    escapes = create_escape_codes(SOLARIZED, 'truecolor')
+    assert escapes['Number'] == ('\x1b[38;2;175;0;95m', '\x1b[39m')
+    with pytest.raises(ValueError):
+        create_escape_codes(SOLARIZED, '88')
+
+
+def test_create_escape_codes_memoized():
+    """
+    GIVEN the same style twice
+    WHEN creating its escape codes
+    THEN assert the codes are only built once and copies are returned
+    """
+    first = create_escape_codes(dict(SOLARIZED))
+    with patch('jsoncolor.core.closest_color') as closest_mk:
+        second = create_escape_codes(dict(SOLARIZED))
+    assert closest_mk.call_count == 0
+    assert first == second and first is not second
+
+
+@pytest.mark.parametrize('environ,colors', [
+    ({}, '256'), ({'TERM': 'xterm-256color'}, '256'),
+    ({'TERM': 'linux'}, '16'), ({'TERM': 'xterm-color'}, '16'),
+    ({'TERM': 'xterm', 'COLORTERM': 'truecolor'}, 'truecolor'),
+    ({'TERM': 'xterm-direct'}, 'truecolor'),
+    ({'COLORTERM': '24bit'}, 'truecolor'),
+])
+def test_detect_colors(environ, colors):
+    """
+    GIVEN TERM and COLORTERM environment variables
+    WHEN detecting the color depth
+    THEN assert the expected depth is returned
+    """
+    assert detect_colors(environ) == colors
+
+
+@patch('jsoncolor.styles.load_styles', return_value=None)
+@patch('jsoncolor.core.get_color_style')
+def test_create_escape_codes_styleNone(style_mock, load_mock):
+    """
+    GIVEN a call to create_escape_codes with no given style
+    WHEN creating the escape codes
+    THEN assert the default style is read from the config file
+    """
+    style_mock.return_value = SOLARIZED
+    create_escape_codes()
+    assert style_mock.call_count == 1
+
+
+@patch('jsoncolor.core.get_color_style')
+def test_create_escape_codes_compiled(style_mock):
+    """
+    GIVEN compiled styles of the config file
+    WHEN creating the escape codes of the default style
+    THEN assert they are taken from the compiled styles
+    """
+    escapes = create_escape_codes(SOLARIZED, '16')
+    compiled = {'default': 's', 'styles': {'s': {'16': escapes}}}
+    with patch('jsoncolor.styles.load_styles', return_value=compiled):
+        assert create_escape_codes(colors='16') == escapes
+    assert style_mock.call_count == 0
+
+
+##############################################################################
+# TESTS: render_json()
+##############################################################################
+
+renderargs = [
+    (False, 2), (False, 4), (False, 0), (False, None), (False, '\t'),
+    (True, None), (True, 2),
+]
+
+
+@pytest.mark.parametrize('comp,ind', renderargs)
+def test_render_json_noColor(comp, ind):
+    """
+    GIVEN a nested dict
+    WHEN rendering it without escape codes
+    THEN assert the output is identical to format_json()
+    """
+    assert render_json(NESTED, comp, ind) == format_json(NESTED, comp, ind)
+
+
+def test_render_json_color():
+    """
+    GIVEN a dict and a set of escape codes
+    WHEN rendering it with color
+    THEN assert each token is wrapped with the escape codes for its type
+    """
+    escapes = create_escape_codes(SOLARIZED)
+    out = render_json({'k': [1, 'v', None]}, True, None, escapes)
+    assert out == ('\x1b[38;5;245m{\x1b[39m\x1b[38;5;33m"k"\x1b[39m'
+                   '\x1b[38;5;245m:\x1b[39m\x1b[38;5;245m[\x1b[39m'
+                   '\x1b[38;5;125m1\x1b[39m\x1b[38;5;245m,\x1b[39m'
+                   '\x1b[38;5;37m"v"\x1b[39m\x1b[38;5;245m,\x1b[39m'
+                   '\x1b[38;5;166mnull\x1b[39m\x1b[38;5;245m]\x1b[39m'
+                   '\x1b[38;5;245m}\x1b[39m')
+
+
+def test_render_json_notSerializable():
+    """
+    GIVEN a dict with a value that can not be serialized
+    WHEN rendering it
+    THEN assert TypeError is raised like json.dumps
+    """
+    with pytest.raises(TypeError):
+        render_json({'k': object()})
+
+
+previewargs = [
+    ({'max_depth': 0}, '{\u20263 keys}'),
+    ({'max_depth': 1}, '{"a": [\u20264 items], "b": {\u20261 key}, '
+                       '"s": "hello"}'),
+    ({'max_items': 2}, '{"a": [1, 2, \u20262 more items], "b": {"c": {}}, '
+                       '\u20261 more key}'),
+    ({'max_items': 0}, '{\u20263 keys}'),
+    ({'max_string': 3}, '{"a": [1, 2, 3, 4], "b": {"c": {}}, '
+                        '"s": "hel\u2026"}'),
+    ({'max_string': 5}, '{"a": [1, 2, 3, 4], "b": {"c": {}}, "s": "hello"}'),
+]
+
+
+@pytest.mark.parametrize('limits,expected', previewargs)
+def test_render_json_preview(limits, expected):
+    """
+    GIVEN a nested dict
+    WHEN rendering it with depth, item or string limits
+    THEN assert hidden values are replaced by placeholders
+    """
+    data = {'a': [1, 2, 3, 4], 'b': {'c': {}}, 's': 'hello'}
+    assert render_json(data, False, None, **limits) == expected
+
+
+def test_render_json_previewNotWalked():
+    """
+    GIVEN a dict with values that can not be serialized below the limits
+    WHEN rendering a preview
+    THEN assert the hidden values are never serialized
+    """
+    data = {'a': {'b': object()}, 'c': [1, object()]}
+    out = render_json(data, True, None, max_depth=1, max_items=1)
+    assert out == '{"a":{\u20261 key},\u20261 more key}'
+
+
+def test_render_json_previewColor():
+    """
+    GIVEN a set of escape codes
+    WHEN rendering a preview
+    THEN assert placeholders are colored as Comment
+    """
+    escapes = create_escape_codes(SOLARIZED)
+    out = render_json(['abc'], True, None, escapes, max_depth=0)
+    assert out == '\x1b[38;5;240m[\u20261 item]\x1b[39m'
+    out = render_json('abc', True, None, escapes, max_string=1)
+    assert out == ('\x1b[38;5;37m"a\x1b[39m\x1b[38;5;240m\u2026\x1b[39m'
+                   '\x1b[38;5;37m"\x1b[39m')
+
+
+##############################################################################
+# TESTS: colorize_raw()
+##############################################################################
+
+RAW = (b'{"k" : [1, -2.5e3, true, null, "v\\\\"],\n "s": "a\\"b",'
+       b' "n": -Infinity}')
+
+
+def strip_codes(data):
+    """Remove ANSI escape codes from colored bytes."""
+    return re.sub(rb'\x1b\[[0-9;]*m', b'', data)
+
+
+def color_map(data):
+    """List (character, escape code) for the printable characters."""
+    chars, code = [], None
+    for m in re.finditer(rb'(\x1b\[[0-9;]*m)|(\S)', data):
+        if m.group(1):
+            code = m.group(1)
+        else:
+            chars.append((m.group(2), code))
+    return chars
+
+
+def test_colorize_raw():
+    """
+    GIVEN json text with escaped quotes and backslashes
+    WHEN colorizing it as-is
+    THEN assert each token gets the color of its type
+    """
+    escapes = create_escape_codes(SOLARIZED)
+    out = colorize_raw(b'{"k": [1, "v", null]}', escapes)
+    assert out == (b'\x1b[38;5;245m{\x1b[38;5;33m"k"\x1b[38;5;245m: ['
+                   b'\x1b[38;5;125m1\x1b[38;5;245m, \x1b[38;5;37m"v"'
+                   b'\x1b[38;5;245m, \x1b[38;5;166mnull\x1b[38;5;245m]}'
+                   b'\x1b[39m')
+
+
+def test_colorize_raw_identical():
+    """
+    GIVEN json text with irregular formatting
+    WHEN colorizing it as-is
+    THEN assert the input is returned once the escape codes are removed
+    """
+    escapes = create_escape_codes(SOLARIZED)
+    assert strip_codes(colorize_raw(RAW, escapes)) == RAW
+    assert colorize_raw(RAW) == RAW
+
+
+@pytest.mark.parametrize('size', [1, 2, 5, 16])
+def test_iter_raw_chunks(size):
+    """
+    GIVEN json text split into small chunks
+    WHEN colorizing the chunks as-is
+    THEN assert the colors are the same as for the whole text
+    """
+    escapes = create_escape_codes(SOLARIZED)
+    chunks = [RAW[i:i + size] for i in range(0, len(RAW), size)]
+    out = b''.join(iter_raw(chunks, escapes))
+    whole = colorize_raw(RAW, escapes)
+    assert strip_codes(out) == RAW
+    assert color_map(out) == color_map(whole)
+
+
 ##############################################################################
 # TESTS: format_json()
 ##############################################################################
@@ -93,20 +388,108 @@ testargs = [
 def test_format_json_defaults(dumps_mock, comp, ind, sep):
     """
     GIVEN a dict
-    WHEN converting to json
+    WHEN converting to json with the standard library backend
     THEN assert json.dumps is called with correct args
     """
-    format_json(STYLE_TEST, compact=comp, indent=ind)
+    format_json(STYLE_TEST, compact=comp, indent=ind, backend='json')
     dumps_mock.assert_called_once_with(STYLE_TEST, separators=sep, indent=ind)
 
 
+##############################################################################
+# TESTS: get_backend()
+##############################################################################
+
+BACKEND_DOCS = [
+    {'a': [1, 1.5, 0.1, -0.0, True, None], 'b': {}, 'c': [[]]},
+    {'s': 'caf\u00e9 \U0001f600 \x7f \x1f "/\\'},
+    [1e16, 1e-05, 0.0001, 1.5e300, 2 ** 64, -2 ** 63 - 1, 2 ** 70],
+    {1: 'int key'},
+    'scalar',
+    '\x7f',
+    [float('nan'), float('inf'), -float('inf'), None],
+]
+
+
+def test_get_backend(monkeypatch):
+    """
+    GIVEN the JSONCOLOR_BACKEND environment variable
+    WHEN getting the backend without a name
+    THEN assert the variable selects it, and unknown names are rejected
+    """
+    monkeypatch.setenv('JSONCOLOR_BACKEND', 'json')
+    assert get_backend().name == 'json'
+    assert isinstance(get_backend('auto'), JSONBackend)
+    monkeypatch.setenv('JSONCOLOR_BACKEND', 'nosuchlib')
+    with pytest.raises(ValueError):
+        get_backend()
+
+
+def test_get_backend_notInstalled():
+    """
+    GIVEN a registered backend whose library is not installed
+    WHEN getting it by name, or the first installed one
+    THEN assert it is reported, and skipped for 'auto'
+    """
+    class Missing(JSONBackend):
+        def __init__(self):
+            raise ImportError('missing')
+
+    with patch.dict(BACKENDS, clear=True):
+        register_backend('missing', Missing)
+        register_backend('json', JSONBackend)
+        with pytest.raises(ValueError, match='not installed'):
+            get_backend('missing')
+        assert get_backend('auto').name == 'json'
+    # forget the lookups made with the patched registry
+    register_backend('json', JSONBackend)
+
+
+@pytest.mark.parametrize('name', ['orjson', 'ujson', 'simplejson'])
+@pytest.mark.parametrize('comp,ind', [(False, 2), (True, None), (False, 4),
+                                      (False, None), (True, 2)])
+def test_backend_dumps(name, comp, ind):
+    """
+    GIVEN an installed fast backend
+    WHEN formatting documents with edge-case numbers, strings and keys,
+        and NaN and Infinity not read with loads()
+    THEN assert the output is the same as with the standard library
+    """
+    pytest.importorskip(name)
+    for doc in BACKEND_DOCS:
+        assert format_json(doc, comp, ind, backend=name) == (
+            format_json(doc, comp, ind, backend='json'))
+
+
+@pytest.mark.parametrize('name', ['orjson', 'ujson', 'simplejson'])
+def test_backend_loads(name):
+    """
+    GIVEN an installed fast backend
+    WHEN parsing NaN, Infinity and integers beyond 64 bits
+    THEN assert they are read like json.loads and written back unchanged
+    """
+    pytest.importorskip(name)
+    backend = get_backend(name)
+    text = '[NaN, -Infinity, 1e400, 123456789012345678901234, 1.5]'
+    data = backend.loads(text)
+    assert data[3] == 123456789012345678901234
+    assert backend.dumps(data, True, None) == (
+        '[NaN,-Infinity,Infinity,123456789012345678901234,1.5]')
+    assert backend.loads(text.encode())[3] == data[3]
+    # no NaN here: the fast library parses it unless it is sent to json
+    text = '[-9223372036854775809, 9999999999999999999]'
+    assert backend.dumps(backend.loads(text), True, None) == (
+        text.replace(' ', ''))
+    with pytest.raises(ValueError):
+        backend.loads('[1,')
+
+
 ##############################################################################
 # TESTS: highlighter()
 ##############################################################################
 
-@patch('jsoncolor.core.Terminal256Formatter')
+@patch('pygments.formatters.terminal256.Terminal256Formatter')
 @patch('pygments.highlight')
-@patch('jsoncolor.core.JsonLexer')
+@patch('pygments.lexers.data.JsonLexer')
 def test_highlighter(json_mock, highl_mock, term256_mock):
     """
     GIVEN json content to highlight
@@ -131,9 +514,9 @@ def test_higlighter_exception():
     assert h == DATA
 
 
-@patch('jsoncolor.core.Terminal256Formatter')
+@patch('pygments.formatters.terminal256.Terminal256Formatter')
 @patch('pygments.highlight')
-@patch('jsoncolor.core.JsonLexer')
+@patch('pygments.lexers.data.JsonLexer')
 @patch('jsoncolor.core.create_style_class')
 @patch('jsoncolor.core.get_color_style')
 def test_highlighter_styleNone(style_mock, create_mock, json_mock,
@@ -145,9 +528,202 @@ def test_highlighter_styleNone(style_mock, create_mock, json_mock,
         appropriate pygments classes/functions are used
     """
     style_mock.return_value = STYLE_TEST
+    get_highlighter.cache_clear()
     highlighter(DATA)
     assert style_mock.call_count == 1
     create_mock.assert_called_once_with(STYLE_TEST)
     assert term256_mock.call_count == 1
     assert json_mock.call_count == 1
     assert highl_mock.call_count == 1
+
+
+@patch('jsoncolor.core.get_color_style')
+def test_highlighter_styleNone_cached(style_mock):
+    """
+    GIVEN several calls to highlighter() with style=None
+    WHEN highlighting json content
+    THEN assert the config file is only read once
+    """
+    style_mock.return_value = SOLARIZED
+    get_highlighter.cache_clear()
+    first = highlighter('{"a": 1}')
+    second = highlighter('{"a": 1}')
+    assert first == second
+    assert '\x1b[38;5;33m' in first
+    assert style_mock.call_count == 1
+    get_highlighter.cache_clear()
+
+
+##############################################################################
+# TESTS: Highlighter
+##############################################################################
+
+def test_Highlighter():
+    """
+    GIVEN a Highlighter built for a style class
+    WHEN highlighting json content
+    THEN assert the output matches highlighter() with the same style
+    """
+    style = create_style_class(SOLARIZED)
+    instance = Highlighter(style)
+    assert instance.highlight('[1]') == highlighter('[1]', style)
+    assert get_highlighter(style) is get_highlighter(style)
+    with pytest.raises(AttributeError):
+        instance.other = None
+
+
+def test_Highlighter_badStyle():
+    """
+    GIVEN a Highlighter built with a style not of the pygments.style.Style
+        class
+    WHEN highlighting json content
+    THEN assert the original data is returned unhighlighted
+    """
+    assert Highlighter(SOLARIZED).highlight('[1]') == '[1]'
+
+
+##############################################################################
+# TESTS: highlight_many()
+##############################################################################
+
+@patch('jsoncolor.core.get_color_style')
+def test_highlight_many(style_mock):
+    """
+    GIVEN python objects and json text documents and no style
+    WHEN highlighting them together
+    THEN assert each is rendered in order and the style is read once
+    """
+    style_mock.return_value = SOLARIZED
+    escapes = create_escape_codes(SOLARIZED)
+    out = list(highlight_many([{'a': 1}, '[true]', b'"s"'], compact=True))
+    assert out == [render_json({'a': 1}, True, 2, escapes),
+                   render_json([True], True, 2, escapes),
+                   render_json('s', True, 2, escapes)]
+    assert style_mock.call_count == 1
+
+
+def test_highlight_many_jobs():
+    """
+    GIVEN many documents
+    WHEN highlighting them in a process pool with small batches
+    THEN assert the output keeps the input order
+    """
+    docs = [{'n': i} for i in range(50)]
+    out = list(highlight_many(iter(docs), SOLARIZED, jobs=2, batch_size=3))
+    escapes = create_escape_codes(SOLARIZED)
+    assert out == [render_json(d, escapes=escapes) for d in docs]
+
+
+##############################################################################
+# TESTS: iter_json_parallel()
+##############################################################################
+
+@pytest.mark.parametrize('comp,ind', [(False, 2), (True, None), (False, None),
+                                      (False, 0), (True, 2)])
+def test_iter_json_parallel(comp, ind):
+    """
+    GIVEN a large list and a large dict
+    WHEN rendering their top-level items in a process pool
+    THEN assert the output is identical to the serial rendering
+    """
+    escapes = create_escape_codes(SOLARIZED)
+    for data in ([{'n': i, 'v': [i, None]} for i in range(20)],
+                 {str(i): [i, {}] for i in range(20)}):
+        out = ''.join(iter_json_parallel(data, comp, ind, escapes, jobs=2,
+                                         batch_size=3))
+        assert out == render_json(data, comp, ind, escapes)
+
+
+@pytest.mark.parametrize('data', [[], {}, 'x', [1]])
+def test_iter_json_parallel_serial(data):
+    """
+    GIVEN values that cannot be split, or jobs=1
+    WHEN rendering them
+    THEN assert they are rendered in this process
+    """
+    with patch('concurrent.futures.ProcessPoolExecutor') as pool:
+        assert ''.join(iter_json_parallel(data, jobs=1)) == render_json(data)
+        if not data or data == 'x':
+            assert ''.join(iter_json_parallel(data, jobs=4)) == (
+                render_json(data))
+        assert pool.call_count == 0
+
+
+##############################################################################
+# TESTS: colorize_stream()
+##############################################################################
+
+class Reader:
+    """Async byte stream that counts its reads."""
+
+    def __init__(self, data):
+        self.data = data
+        self.reads = 0
+
+    async def read(self, size):
+        self.reads += 1
+        chunk, self.data = self.data[:size], self.data[size:]
+        return chunk
+
+
+def collect(stream, **kwds):
+    """Run colorize_stream() to completion; return the joined output."""
+    async def run():
+        return ''.join([c async for c in colorize_stream(stream, **kwds)])
+    return asyncio.run(run())
+
+
+def test_colorize_stream_reader():
+    """
+    GIVEN an asyncio.StreamReader with a json document
+    WHEN colorizing it without color
+    THEN assert the output is the same as format_json()
+    """
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'\xef\xbb\xbf{"a": [1, "\xc3\xa9"]}')
+        reader.feed_eof()
+        return ''.join([c async for c in colorize_stream(
+            reader, color=False, chunk_size=3)])
+    assert asyncio.run(run()) == format_json({'a': [1, '\u00e9']}) + '\n'
+
+
+def test_colorize_stream_asyncIterable():
+    """
+    GIVEN an async iterable of byte chunks and an executor
+    WHEN colorizing it with every chunk offloaded to the executor
+    THEN assert the output is the same as render_json()
+    """
+    async def chunks():
+        for chunk in (b'{"k": [tr', b'ue, null]}'):
+            yield chunk
+    escapes = create_escape_codes(SOLARIZED)
+    with ThreadPoolExecutor(1) as executor:
+        out = collect(chunks(), style=SOLARIZED, executor=executor,
+                      offload_size=1)
+    assert out == render_json({'k': [True, None]}, escapes=escapes) + '\n'
+
+
+def test_colorize_stream_backpressure():
+    """
+    GIVEN a stream of many chunks
+    WHEN only the first output chunk is consumed
+    THEN assert the stream is not read ahead of the consumer
+    """
+    async def run():
+        reader = Reader(b'[' + b'1,' * 1000 + b'1]')
+        chunks = colorize_stream(reader, color=False, chunk_size=10)
+        await chunks.__anext__()
+        await chunks.aclose()
+        return reader.reads
+    assert asyncio.run(run()) == 1
+
+
+def test_colorize_stream_invalid():
+    """
+    GIVEN a stream that is not valid json
+    WHEN colorizing it
+    THEN assert TokenizeError is raised
+    """
+    with pytest.raises(TokenizeError):
+        collect(Reader(b'[1,'), color=False)
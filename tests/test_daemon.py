@@ -0,0 +1,301 @@
+"""jsoncolor.daemon and jsoncolor.client tests"""
+
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from jsoncolor.cli import main
+from jsoncolor.config import CONFIG
+from jsoncolor.client import REJECT
+from jsoncolor.client import read_frame
+from jsoncolor.client import request
+from jsoncolor.client import runs_locally
+from jsoncolor.daemon import RenderServer
+from jsoncolor.daemon import listening
+
+##############################################################################
+# CONSTANTS
+##############################################################################
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA = b'{"a": [1, 2], "b": "x"}'
+
+PRETTY = b'{\n  "a": [\n    1,\n    2\n  ],\n  "b": "x"\n}\n'
+
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+class Stream(io.BytesIO):
+    """Binary stream standing in for a terminal or a pipe."""
+
+    def __init__(self, data=b'', tty=False):
+        io.BytesIO.__init__(self, data)
+        self.tty = tty
+
+    def isatty(self):
+        return self.tty
+
+
+@pytest.fixture()
+def daemon(tmpdir):
+    """Serve jsoncolor in a thread; returns the socket path."""
+    path = str(tmpdir.join('run', 'daemon.sock'))
+    server = RenderServer(path, main)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield path
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+@pytest.fixture()
+def process(tmpdir):
+    """Run jsoncolor --serve in a process of its own; returns the socket."""
+    path = str(tmpdir.join('run', 'daemon.sock'))
+    env = dict(os.environ, JSONCOLOR_SOCKET=path)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [ROOT, env.get('PYTHONPATH')]))
+    proc = subprocess.Popen([sys.executable, '-m', 'jsoncolor', '--serve'],
+                            env=env, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while not listening(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    yield path
+    proc.terminate()
+    proc.wait()
+    assert not os.path.exists(path)
+
+
+@pytest.fixture()
+def config(tmpdir, monkeypatch):
+    """Config file and cache of the clients; returns the config file."""
+    monkeypatch.setenv('XDG_CONFIG_HOME', str(tmpdir.join('config')))
+    monkeypatch.setenv('JSONCOLOR_CACHE_DIR', str(tmpdir.join('cache')))
+    monkeypatch.delenv('COLORTERM', raising=False)
+    monkeypatch.setenv('TERM', 'xterm-256color')
+    path = tmpdir.join('config', 'jsoncolor', 'config.json')
+    path.write(json.dumps(CONFIG), ensure=True)
+    return path
+
+
+def call(path, argv, data=b'', tty=False):
+    """Run argv in the daemon; returns (status, stdout, stderr, stdin)."""
+    stdin, stdout, stderr = Stream(data), Stream(tty=tty), Stream()
+    status = request(argv, path, stdin, stdout, stderr)
+    return status, stdout.getvalue(), stderr.getvalue(), stdin
+
+
+##############################################################################
+# TESTS: request()
+##############################################################################
+
+def test_request_file(daemon, tmpdir):
+    """
+    GIVEN a running daemon and a json file in the working directory
+    WHEN a client passes the file name relative to its working directory
+    THEN assert the daemon prints it and stdin is left unread
+    """
+    tmpdir.join('doc.json').write_binary(DATA)
+    with tmpdir.as_cwd():
+        status, out, err, stdin = call(daemon, ['-n', 'doc.json'], b'[9]')
+    assert (status, out, err) == (0, PRETTY, b'')
+    assert stdin.tell() == 0
+    assert os.getcwd() != str(tmpdir)
+
+
+def test_request_stdin(daemon):
+    """
+    GIVEN a running daemon
+    WHEN a client pipes a document to it
+    THEN assert the document is read from the client's stdin
+    """
+    assert call(daemon, ['-n', '-'], DATA)[:3] == (0, PRETTY, b'')
+
+
+def test_request_error(daemon):
+    """
+    GIVEN a running daemon
+    WHEN a client passes an unknown option
+    THEN assert click's usage error and exit status come back
+    """
+    status, out, err, _ = call(daemon, ['--nope'])
+    assert status == 2
+    assert out == b''
+    assert b'No such option' in err
+
+
+def test_request_colors(daemon, config, monkeypatch):
+    """
+    GIVEN a running daemon
+    WHEN clients with different terminals and pipes request colors
+    THEN assert each gets the colors of its own COLORTERM and stdout
+    """
+    colored = call(daemon, ['-'], DATA, tty=True)[1]
+    piped = call(daemon, ['-'], DATA)[1]
+    monkeypatch.setenv('COLORTERM', 'truecolor')
+    true = call(daemon, ['-'], DATA, tty=True)[1]
+    assert b'\x1b[38;5;' in colored and b'38;2;' not in colored
+    assert b'\x1b[38;2;' in true
+    assert piped == PRETTY
+
+
+def test_request_reload(daemon, config):
+    """
+    GIVEN a running daemon that has colored a document
+    WHEN the config file changes
+    THEN assert the next request uses the new default style
+    """
+    before = call(daemon, ['-'], DATA, tty=True)[1]
+    styles = {'default': 'red', 'styles': {'red': {'Token': '#ff0000'}}}
+    config.write(json.dumps(styles))
+    after = call(daemon, ['-'], DATA, tty=True)[1]
+    assert b'\x1b[38;5;9m{' in after
+    assert b'\x1b[38;5;9m{' not in before
+
+
+def test_request_concurrent(process):
+    """
+    GIVEN a client whose stdin stays open, as with tail -f | jsoncolor -l
+    WHEN another client makes a request meanwhile
+    THEN assert it is served without waiting for the first one
+    """
+    read, write = os.pipe()
+    stdin, stdout = os.fdopen(read, 'rb'), Stream()
+    first = threading.Thread(target=request, args=(
+        ['-n', '-l', '-'], process, stdin, stdout, Stream()))
+    first.start()
+    try:
+        os.write(write, b'{"a": 1}\n')
+        assert call(process, ['-n', '-'], DATA)[:3] == (0, PRETTY, b'')
+    finally:
+        os.close(write)
+        first.join()
+        stdin.close()
+    assert stdout.getvalue() == b'{\n  "a": 1\n}\n'
+
+
+def test_request_noDaemon(tmpdir):
+    """
+    GIVEN no daemon listening
+    WHEN a client makes a request
+    THEN assert None is returned, so the command runs locally
+    """
+    assert call(str(tmpdir.join('none.sock')), ['-n', '-'], DATA)[0] is None
+
+
+def test_request_disabled(daemon, monkeypatch):
+    """
+    GIVEN a running daemon and JSONCOLOR_NO_DAEMON set
+    WHEN a client makes a request
+    THEN assert the daemon is not used
+    """
+    monkeypatch.setenv('JSONCOLOR_NO_DAEMON', '1')
+    assert call(daemon, ['-n', '-'], DATA)[0] is None
+
+
+def test_request_version(daemon):
+    """
+    GIVEN a running daemon
+    WHEN a client of another protocol version connects
+    THEN assert the request is rejected
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(daemon)
+        sock.sendall(json.dumps({'version': 0}).encode() + b'\n')
+        assert read_frame(sock.makefile('rb')) == (REJECT, b'')
+
+
+##############################################################################
+# TESTS: runs_locally()
+##############################################################################
+
+@pytest.mark.parametrize('argv, local', [
+    (['-n', 'doc.json'], False),
+    (['--path', '.a', '-'], False),
+    (['--follow', 'log.jsonl'], True),
+    (['-nf', 'log.jsonl'], True),
+    (['--pager', 'doc.json'], True),
+    (['-d', 's1'], True),
+    (['--serve'], True),
+    (['-n', '--', '-f'], False),
+])
+def test_runs_locally(argv, local):
+    """
+    GIVEN a command line
+    WHEN deciding where it runs
+    THEN assert options that need the terminal or wait run locally
+    """
+    assert runs_locally(argv) is local
+
+
+##############################################################################
+# TESTS: RenderServer()
+##############################################################################
+
+def test_render_server_running(daemon):
+    """
+    GIVEN a running daemon
+    WHEN starting another one on the same socket
+    THEN assert it fails and the running daemon keeps its socket
+    """
+    with pytest.raises(OSError):
+        RenderServer(daemon, main)
+    assert os.path.exists(daemon)
+    assert call(daemon, ['-n', '-'], DATA)[0] == 0
+
+
+def test_render_server_stale(tmpdir):
+    """
+    GIVEN a socket file left behind by a daemon that died
+    WHEN starting a daemon on it
+    THEN assert the stale file is replaced by a private socket
+    """
+    path = str(tmpdir.join('daemon.sock'))
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    server = RenderServer(path, main)
+    try:
+        assert os.stat(path).st_mode & 0o077 == 0
+    finally:
+        server.server_close()
+    assert not os.path.exists(path)
+
+
+def test_render_server_shared(tmpdir):
+    """
+    GIVEN a socket directory that other users can enter
+    WHEN starting a daemon in it, or a client connecting to one there
+    THEN assert both refuse it
+    """
+    directory = tmpdir.join('shared')
+    directory.mkdir()
+    directory.chmod(0o755)
+    path = str(directory.join('daemon.sock'))
+    with pytest.raises(OSError):
+        RenderServer(path, main)
+    assert not os.path.exists(path)
+    directory.chmod(0o700)
+    server = RenderServer(path, main)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        directory.chmod(0o755)
+        assert call(path, ['-n', '-'], DATA)[0] is None
+        directory.chmod(0o700)
+        assert call(path, ['-n', '-'], DATA)[0] == 0
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
@@ -0,0 +1,132 @@
+"""jsoncolor.files tests"""
+
+import gzip
+import os
+
+import pytest
+
+from jsoncolor.core import create_escape_codes
+from jsoncolor.core import render_json
+from jsoncolor.errors import TokenizeError
+from jsoncolor.files import expand_paths
+from jsoncolor.files import iter_files
+from jsoncolor.files import render_file
+
+##############################################################################
+# CONSTANTS
+##############################################################################
+
+SOLARIZED = {'Token': '#8a8a8a', 'Keyword': '#d75f00', 'Name_Tag': '#0087ff',
+             'String': '#00afaf', 'Number': '#af005f'}
+
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+@pytest.fixture()
+def fixtures(tmpdir):
+    """Directory of small json files; returns their paths in order."""
+    paths = []
+    for n in range(20):
+        path = tmpdir.join('f{:02d}.json'.format(n))
+        path.write('{{"n": {}, "v": [true, null]}}'.format(n))
+        paths.append(str(path))
+    return paths
+
+
+##############################################################################
+# TESTS: expand_paths()
+##############################################################################
+
+def test_expand_paths(tmpdir):
+    """
+    GIVEN files in nested directories
+    WHEN expanding names and glob patterns
+    THEN assert each pattern gives its matching files, sorted, and names
+        are kept as they are
+    """
+    for name in ('b.json', 'a.json', 'sub/c.json', 'sub/d.txt'):
+        tmpdir.join(name).write('1', ensure=True)
+    with tmpdir.as_cwd():
+        paths = expand_paths(['sub/d.txt', '*.json', '**/*.json', '-'])
+    assert paths == ['sub/d.txt', 'a.json', 'b.json',
+                     'a.json', 'b.json', os.path.join('sub', 'c.json'), '-']
+
+
+def test_expand_paths_noMatch(tmpdir):
+    """
+    GIVEN a pattern that matches nothing, and a file named like a pattern
+    WHEN expanding them
+    THEN assert both are kept, so that a missing file gets reported
+    """
+    tmpdir.join('[1].json').write('1')
+    with tmpdir.as_cwd():
+        assert expand_paths(['*.yaml', '[1].json']) == ['*.yaml', '[1].json']
+
+
+##############################################################################
+# TESTS: render_file()
+##############################################################################
+
+def test_render_file(tmpdir):
+    """
+    GIVEN a gzip-compressed json file, and content already read
+    WHEN rendering them with and without colors
+    THEN assert the output is that of a single document
+    """
+    path = tmpdir.join('doc.json.gz')
+    path.write_binary(gzip.compress(b'{"a": [1, "x"]}'))
+    escapes = create_escape_codes(SOLARIZED)
+    assert render_file(str(path)) == '{\n  "a": [\n    1,\n    "x"\n  ]\n}\n'
+    assert render_file(b'[1]', True, None, escapes) == render_json(
+        [1], True, None, escapes) + '\n'
+    assert render_file(b'[1, 2]', limits={'max_items': 1}) == render_json(
+        [1, 2], max_items=1) + '\n'
+    assert render_file(b' \n') == ''
+
+
+def test_render_file_invalid(tmpdir):
+    """
+    GIVEN an invalid json file and a missing one
+    WHEN rendering them
+    THEN assert the errors are raised
+    """
+    with pytest.raises(TokenizeError):
+        render_file(b'{"a": }')
+    with pytest.raises(OSError):
+        render_file(str(tmpdir.join('missing.json')))
+
+
+##############################################################################
+# TESTS: iter_files()
+##############################################################################
+
+@pytest.mark.parametrize('jobs', [None, 1, 2])
+def test_iter_files_order(fixtures, jobs):
+    """
+    GIVEN many json files
+    WHEN coloring them in threads, in this thread or in processes
+    THEN assert the output keeps the order of the files
+    """
+    results = list(iter_files(fixtures, True, None, jobs=jobs))
+    assert results == [('{{"n":{},"v":[true,null]}}\n'.format(n), None)
+                       for n in range(len(fixtures))]
+
+
+@pytest.mark.parametrize('jobs', [None, 2])
+def test_iter_files_errors(fixtures, tmpdir, jobs):
+    """
+    GIVEN json files among a missing and an invalid one
+    WHEN coloring them
+    THEN assert each error is returned in its place and the others are
+        still colored
+    """
+    bad = tmpdir.join('bad.json')
+    bad.write('[1,')
+    sources = [fixtures[0], str(tmpdir.join('missing.json')), str(bad), b'2']
+    results = list(iter_files(sources, True, None, jobs=jobs))
+    assert [text for text, _ in results] == [
+        '{"n":0,"v":[true,null]}\n', None, None, '2\n']
+    assert isinstance(results[1][1], OSError)
+    assert isinstance(results[2][1], TokenizeError)
@@ -0,0 +1,232 @@
+"""jsoncolor.lines tests"""
+
+import io
+import os
+
+import pytest
+
+from jsoncolor.core import create_escape_codes
+from jsoncolor.errors import TokenizeError
+from jsoncolor.lines import follow
+from jsoncolor.lines import iter_batches
+from jsoncolor.lines import iter_lines
+from jsoncolor.lines import render_batch
+from jsoncolor.lines import tail_offset
+
+##############################################################################
+# CONSTANTS
+##############################################################################
+
+LINES = b''.join(b'{"n":%d,"v":[true,null]}\n' % i for i in range(50))
+
+SOLARIZED = {'Token': '#8a8a8a', 'Keyword': '#d75f00', 'Name_Tag': '#0087ff',
+             'String': '#00afaf', 'Number': '#af005f'}
+
+
+##############################################################################
+# TESTS: iter_batches()
+##############################################################################
+
+def test_iter_batches():
+    """
+    GIVEN a file with several lines
+    WHEN grouping the lines into small batches
+    THEN assert every line is kept and line numbers are tracked
+    """
+    batches = list(iter_batches(io.BytesIO(b'1\n2\n3\n'), size=4))
+    assert batches == [(1, [b'1\n', b'2\n']), (3, [b'3\n'])]
+
+
+##############################################################################
+# TESTS: render_batch()
+##############################################################################
+
+def test_render_batch():
+    """
+    GIVEN a batch of json lines including a blank line and an integer
+        below -2**63
+    WHEN rendering the batch in compact mode
+    THEN assert each document is written on its own line, unchanged
+    """
+    out = render_batch((1, [b'{"a": 1}\n', b'\n', b'[2]\n',
+                            b'-9223372036854775809\n']), True, None)
+    assert out == '{"a":1}\n[2]\n-9223372036854775809\n'
+
+
+def test_render_batch_color():
+    """
+    GIVEN a batch of json lines and a set of escape codes
+    WHEN rendering the batch
+    THEN assert the output is colored
+    """
+    escapes = create_escape_codes(SOLARIZED)
+    out = render_batch((1, [b'1\n']), True, None, escapes)
+    assert out == '\x1b[38;5;125m1\x1b[39m\n'
+
+
+def test_render_batch_invalid():
+    """
+    GIVEN a batch with an invalid json line
+    WHEN rendering the batch
+    THEN assert TokenizeError is raised with the line number and the
+        output of the lines before it
+    """
+    with pytest.raises(TokenizeError) as exc:
+        render_batch((7, [b'1\n', b'{\n', b'2\n']))
+    assert str(exc.value).startswith('line 8:')
+    assert exc.value.output == '1\n'
+
+
+def test_render_batch_notStrict():
+    """
+    GIVEN a batch with an invalid line
+    WHEN rendering it with strict=False
+    THEN assert the invalid line is output unchanged
+    """
+    out = render_batch((1, [b'[1]', b'not json\r\n']), True, None,
+                       strict=False)
+    assert out == '[1]\nnot json\n'
+
+
+##############################################################################
+# TESTS: iter_lines()
+##############################################################################
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_iter_lines_order(jobs):
+    """
+    GIVEN a json lines file spanning many batches
+    WHEN coloring it with one or more processes
+    THEN assert the output keeps the input order
+    """
+    out = ''.join(iter_lines(io.BytesIO(LINES), True, None, jobs=jobs,
+                             size=64))
+    assert out == LINES.decode()
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_iter_lines_invalid(jobs):
+    """
+    GIVEN a json lines file with an invalid line after many valid ones
+    WHEN coloring it with one or more processes
+    THEN assert every line before the invalid one is output before
+        TokenizeError is raised
+    """
+    out = []
+    with pytest.raises(TokenizeError) as exc:
+        for chunk in iter_lines(io.BytesIO(LINES + b'bad\n[1]\n'), True,
+                                None, jobs=jobs, size=64):
+            out.append(chunk)
+    assert ''.join(out) == LINES.decode()
+    assert str(exc.value).startswith('line 51:')
+
+
+def test_iter_lines_empty():
+    """
+    GIVEN an empty file
+    WHEN coloring it
+    THEN assert nothing is output
+    """
+    assert list(iter_lines(io.BytesIO(b''))) == []
+
+
+##############################################################################
+# TESTS: tail_offset() / follow()
+##############################################################################
+
+@pytest.mark.parametrize('data,count,offset', [
+    (b'a\nb\nc\n', 2, 2), (b'a\nb\nc', 2, 2), (b'a\nb\nc\n', 5, 0),
+    (b'a\nb\nc\n', 0, 6), (b'', 3, 0), (b'aa\nbb\ncc\n', 1, 6),
+])
+def test_tail_offset(data, count, offset):
+    """
+    GIVEN a file and a number of lines
+    WHEN finding where the last lines start, reading 2 bytes at a time
+    THEN assert the offset of the first of them
+    """
+    assert tail_offset(io.BytesIO(data), count, size=2) == offset
+
+
+def follow_file(path, actions, lines=1):
+    """Follow path, running one of actions each time follow() waits."""
+    actions = iter(actions)
+
+    def sleep(interval):
+        action = next(actions, None)
+        if action is None:
+            raise KeyboardInterrupt
+        action()
+
+    out = []
+    try:
+        for batch in follow(open(path, 'rb'), lines, sleep=sleep):
+            out.append(batch)
+    except KeyboardInterrupt:
+        pass
+    return out
+
+
+def append(path, data):
+    """Return an action that appends data to path."""
+    def action():
+        with open(path, 'ab') as f:
+            f.write(data)
+    return action
+
+
+def test_follow(tmpdir):
+    """
+    GIVEN a log file that grows by a partial and then a complete line
+    WHEN following it
+    THEN assert the last line is shown, then each line once complete
+    """
+    path = str(tmpdir.join('app.log'))
+    append(path, b'{"n": 1}\n{"n": 2}\n')()
+    out = follow_file(path, [append(path, b'{"n": '),
+                             append(path, b'3}\n{"n": 4}\n')])
+    assert out == [(1, [b'{"n": 2}']), (2, [b'{"n": 3}', b'{"n": 4}'])]
+
+
+def test_follow_rotated(tmpdir):
+    """
+    GIVEN a log file that is rotated, with a last write to the old file
+    WHEN following it
+    THEN assert the old file is read to its end, then the new file
+    """
+    path = str(tmpdir.join('app.log'))
+    append(path, b'1\n')()
+
+    def rotate():
+        os.rename(path, path + '.1')
+        append(path + '.1', b'2\n3')()
+        append(path, b'4\n')()
+
+    out = follow_file(path, [rotate])
+    assert out == [(1, [b'1']), (2, [b'2']), (3, [b'3']), (4, [b'4'])]
+
+
+def test_follow_truncated(tmpdir):
+    """
+    GIVEN a log file that is truncated and written again
+    WHEN following it
+    THEN assert it is read again from the start
+    """
+    path = str(tmpdir.join('app.log'))
+    append(path, b'1\n2\n')()
+
+    def truncate():
+        with open(path, 'wb') as f:
+            f.write(b'3\n')
+
+    out = follow_file(path, [truncate], lines=2)
+    assert out == [(1, [b'1', b'2']), (3, [b'3'])]
+
+
+def test_follow_pipe():
+    """
+    GIVEN a stream that is not a regular file
+    WHEN following it
+    THEN assert every line is yielded as soon as it is read
+    """
+    out = list(follow(io.BytesIO(b'1\n2\n')))
+    assert out == [(1, [b'1\n']), (2, [b'2\n'])]
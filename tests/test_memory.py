@@ -0,0 +1,114 @@
+"""jsoncolor peak-memory regression tests"""
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+import click._termui_impl
+import pytest
+
+from jsoncolor.cli import output
+from jsoncolor.cli import raw_output
+from jsoncolor.cli import stream_output
+from jsoncolor.core import create_escape_codes
+from jsoncolor.core import format_json
+from jsoncolor.core import render_json
+
+##############################################################################
+# CONSTANTS
+##############################################################################
+
+SOLARIZED = {'Token': '#8a8a8a', 'Keyword': '#d75f00', 'Name_Tag': '#0087ff',
+             'String': '#00afaf', 'Number': '#af005f'}
+
+# peak bytes allowed per input byte; document() is made of short tokens,
+# which cost more per byte than those of benchmarks/memory.py
+BUDGETS = {'format_json': 12, 'render_json': 16, 'output': 2}
+
+ALLOWANCE = 1024 * 1024
+
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+def document(records):
+    """Return a python object and its indented json text."""
+    data = [{'id': i, 'name': 'record {}'.format(i), 'ok': i % 2 == 0,
+             'score': i * 0.25, 'tags': ['a', 'b', None]}
+            for i in range(records)]
+    return data, json.dumps(data, indent=2)
+
+
+def peak(func, *args):
+    """Return the tracemalloc peak in bytes of calling func(*args)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture()
+def terminal(monkeypatch):
+    """Pretend stdin and stdout are a terminal; discard the output."""
+    monkeypatch.setattr(click._termui_impl, 'isatty', lambda x: True)
+    with open(os.devnull, 'w') as devnull:
+        monkeypatch.setattr(sys, 'stdout', devnull)
+        yield
+
+
+##############################################################################
+# TESTS: whole-document entry points
+##############################################################################
+
+def test_peak_format_json():
+    """
+    GIVEN a document of about 500 KB
+    WHEN formatting it with and without color
+    THEN assert peak memory per input byte stays within budget
+    """
+    data, text = document(4000)
+    escapes = create_escape_codes(SOLARIZED)
+    size = len(text)
+    assert peak(format_json, data) < BUDGETS['format_json'] * size + ALLOWANCE
+    assert peak(render_json, data, False, 2, escapes) < (
+        BUDGETS['render_json'] * size + ALLOWANCE)
+
+
+def test_peak_output(ctx_mock, terminal):
+    """
+    GIVEN a document of about 500 KB and a color terminal
+    WHEN outputting it
+    THEN assert peak memory per input byte stays within budget
+    """
+    data, text = document(4000)
+    assert peak(output, data, ctx_mock, 2, SOLARIZED) < (
+        BUDGETS['output'] * len(text) + ALLOWANCE)
+
+
+##############################################################################
+# TESTS: streaming entry points
+##############################################################################
+
+@pytest.mark.parametrize('func', [
+    lambda f, ctx: stream_output(f, ctx, 2, SOLARIZED),
+    lambda f, ctx: raw_output(f, ctx, SOLARIZED),
+])
+def test_peak_streaming_bounded(func, ctx_mock, terminal, tmpdir):
+    """
+    GIVEN a small and a four times larger document
+    WHEN outputting them with the streaming modes
+    THEN assert peak memory does not grow with the input size
+    """
+    peaks = []
+    for records in (1000, 4000):
+        path = tmpdir.join('{}.json'.format(records))
+        path.write(document(records)[1])
+        with open(str(path), 'rb') as jsonfile:
+            peaks.append(peak(func, jsonfile, ctx_mock))
+    assert peaks[1] < peaks[0] * 1.5
@@ -0,0 +1,151 @@
+"""jsoncolor.pager tests"""
+
+import re
+from unittest.mock import patch
+
+import pytest
+
+from jsoncolor.core import create_escape_codes
+from jsoncolor.pager import Pager
+from jsoncolor.pager import page
+
+##############################################################################
+# CONSTANTS
+##############################################################################
+
+SOLARIZED = {'Token': '#8a8a8a', 'Keyword': '#d75f00', 'Name_Tag': '#0087ff',
+             'String': '#00afaf', 'Number': '#af005f'}
+
+LINES = ['[', '  {', '    "n": 1,', '    "s": "a b"', '  },'] * 20 + [']']
+
+ESCAPE_RE = re.compile('\x1b\\[[0-9;]*m')
+
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+def chunks(lines, pulled, size=3):
+    """Yield lines as text chunks of size lines; record each pull."""
+    for i in range(0, len(lines), size):
+        pulled.append(i)
+        yield ''.join(line + '\n' for line in lines[i:i + size])
+
+
+##############################################################################
+# TESTS: Pager.lines()
+##############################################################################
+
+def test_lines_lazy():
+    """
+    GIVEN a long document
+    WHEN the first lines are requested
+    THEN assert only the input needed for them and the look-ahead is read
+    """
+    pulled = []
+    pager = Pager(chunks(LINES, pulled))
+    assert pager.lines(0, 4, lookahead=2) == LINES[:4]
+    assert pulled == [0, 3]
+    assert not pager.complete
+
+
+def test_lines_end():
+    """
+    GIVEN a document without a trailing newline
+    WHEN lines past its end are requested
+    THEN assert the lines up to the end are returned
+    """
+    pager = Pager(iter(['[\n  1\n', ']']))
+    assert pager.lines(1, 10) == ['  1', ']']
+    assert pager.complete
+    assert len(pager) == 3
+
+
+def test_lines_color():
+    """
+    GIVEN a set of escape codes
+    WHEN lines are requested from the middle of a block
+    THEN assert every line is colored on its own and matches the input
+    """
+    escapes = create_escape_codes(SOLARIZED)
+    pager = Pager(chunks(LINES, []), escapes, block_size=8)
+    lines = pager.lines(2, 6)
+    assert [ESCAPE_RE.sub('', line) for line in lines] == LINES[2:6]
+    for line in lines:
+        assert line.startswith(escapes['Token'][0])
+        assert line.endswith(escapes['Token'][1])
+    assert '\x1b[38;5;33m"n"' in lines[0]
+
+
+def test_lines_cache():
+    """
+    GIVEN a pager that keeps two colored blocks
+    WHEN three blocks are viewed
+    THEN assert the least recently used block is dropped
+    """
+    escapes = create_escape_codes(SOLARIZED)
+    pager = Pager(chunks(LINES, []), escapes, block_size=4, cache_size=2)
+    pager.lines(0, 4)
+    pager.lines(4, 8)
+    pager.lines(0, 4)
+    with patch('jsoncolor.pager.colorize_raw',
+               side_effect=lambda d, e: d) as colorize:
+        pager.lines(8, 12)
+        pager.lines(0, 4)
+        assert colorize.call_count == 1
+        pager.lines(4, 8)
+        assert colorize.call_count == 2
+
+
+##############################################################################
+# TESTS: Pager.scroll() / Pager.screen()
+##############################################################################
+
+@pytest.mark.parametrize('actions,top', [
+    (['down', 'down'], 2), (['down', 'up', 'up'], 0), (['page_down'], 10),
+    (['half_down'], 5), (['bottom'], 91), (['bottom', 'top'], 0),
+    (['page_down'] * 20, 91), ([None], 0),
+])
+def test_scroll(actions, top):
+    """
+    GIVEN a 101 line document and a 10 line viewport
+    WHEN scrolling
+    THEN assert the viewport stays within the document
+    """
+    pager = Pager(chunks(LINES, []))
+    for action in actions:
+        pager.scroll(action, 10)
+    assert pager.top == top
+
+
+def test_screen():
+    """
+    GIVEN a short document and a taller terminal
+    WHEN drawing the screen
+    THEN assert the lines, the filler rows and the status line are drawn
+    """
+    pager = Pager(iter(['[1,\n2]\n']))
+    screen = pager.screen(40, 5)
+    assert screen == ('\x1b[H[1,\x1b[K\r\n2]\x1b[K\r\n~\x1b[K\r\n~\x1b[K\r\n'
+                      '\x1b[7m lines 1-2 (END)\x1b[0m\x1b[K')
+
+
+##############################################################################
+# TESTS: page()
+##############################################################################
+
+def test_page(capsys):
+    """
+    GIVEN a document and the keys 'space' then 'q'
+    WHEN paging through it
+    THEN assert the second page is drawn and the terminal is restored
+    """
+    keys = iter([' ', 'q'])
+    with patch('jsoncolor.pager.click.getchar', lambda: next(keys)), \
+            patch('jsoncolor.pager.shutil.get_terminal_size',
+                  return_value=(80, 11)):
+        page(chunks(LINES, []))
+    out, err = capsys.readouterr()
+    assert out.startswith('\x1b[?1049h')
+    assert out.endswith('\x1b[?1049l')
+    assert 'lines 11-20' in out
@@ -0,0 +1,142 @@
+"""jsoncolor.selector tests"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from jsoncolor.errors import TokenizeError
+from jsoncolor.selector import PathSelector
+from jsoncolor.selector import iter_select
+from jsoncolor.selector import parse_path
+
+##############################################################################
+# CONSTANTS
+##############################################################################
+
+DATA = {'meta': {'n': 2, 'q"[': '}'},
+        'data': [{'id': 1, 'status': 'ok', 'tags': ['[', '\\', {}]},
+                 {'id': 2, 'status': None, 'tags': []},
+                 {'id': 3}],
+        'é': [[1, 2], [3, [4]]]}
+
+PATHS = [
+    ('.', [DATA]),
+    ('$', [DATA]),
+    ('.meta.n', [2]),
+    ('.meta["q\\"["]', ['}']),
+    ('.data[*].status', ['ok', None]),
+    ('.data[].id', [1, 2, 3]),
+    ('$.data[1].tags', [[]]),
+    ('.data[0].tags[*]', ['[', '\\', {}]),
+    ('."é"[1][1]', [[4]]),
+    ('.*.n', [2]),
+    ('.data[5]', []),
+    ('.meta[0]', []),
+    ('.data.id', []),
+]
+
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+def select(text, path, size):
+    """Select from text fed in pieces of size bytes."""
+    text = text.encode()
+    chunks = [text[i:i + size] for i in range(0, len(text), size)]
+    return [json.loads(value) for value in iter_select(chunks, path)]
+
+
+##############################################################################
+# TESTS: parse_path()
+##############################################################################
+
+def test_parse_path():
+    """
+    GIVEN path expressions
+    WHEN parsing them
+    THEN assert they are turned into names, indexes and wildcards
+    """
+    assert parse_path('.') == ()
+    steps = parse_path('$.a[2]["b c"].*[*][]')
+    assert steps == ('a', 2, 'b c', None, None, None)
+    assert parse_path('."x\\"y".$z') == ('x"y', '$z')
+
+
+@pytest.mark.parametrize('path', ['a', '.a[', '.[-1]', '.a..b', '.a[1:2]'])
+def test_parse_path_invalid(path):
+    """
+    GIVEN an invalid path expression
+    WHEN parsing it
+    THEN assert ValueError is raised
+    """
+    with pytest.raises(ValueError):
+        parse_path(path)
+
+
+##############################################################################
+# TESTS: iter_select()
+##############################################################################
+
+@pytest.mark.parametrize('path,expected', PATHS)
+@pytest.mark.parametrize('indent', [None, 2])
+@pytest.mark.parametrize('size', [1, 7, 4096])
+def test_iter_select(path, expected, indent, size):
+    """
+    GIVEN a document fed in pieces of any size
+    WHEN selecting values by path
+    THEN assert the selected values are returned in document order
+    """
+    text = json.dumps(DATA, indent=indent, ensure_ascii=False)
+    assert select(text, path, size) == expected
+
+
+@pytest.mark.parametrize('size', [1, 5, 4096])
+def test_iter_select_skipAhead(size):
+    """
+    GIVEN large subtrees off the path, with brackets, quotes and
+        backslashes in their strings
+    WHEN they are skipped by counting brackets
+    THEN assert the selection is the same as when scanning every token
+    """
+    data = {'skip': [{'s': '[{"\\', 'l': [['\\"]'], {}]}] * 50,
+            'keep': [1, {'skip': ['}' * 10]}, '\\']}
+    text = json.dumps(data) + json.dumps(data, indent=1)
+    with patch('jsoncolor.selector.SCAN_WINDOW', 3):
+        selected = select(text, '.keep', size)
+    assert selected == [data['keep']] * 2
+
+
+def test_iter_select_lines():
+    """
+    GIVEN concatenated documents with a byte order mark
+    WHEN selecting values by path
+    THEN assert every document is searched
+    """
+    text = '﻿{"a": 1}\n{"b": 2}\n{"a": [3]}\n"a"'
+    assert select(text, '.a', 1) == [1, [3]]
+
+
+def test_iter_select_raw():
+    """
+    GIVEN a selected value
+    WHEN it is returned
+    THEN assert it is the unparsed json text of the value
+    """
+    selector = PathSelector('.a')
+    assert selector.feed(b'{"a": [1, ') == []
+    assert selector.feed(b'1e2]}') == [b'[1, 1e2]']
+    assert selector.close() == []
+
+
+@pytest.mark.parametrize('text', ['{"a" 1}', '{"a": [1 2]}', '{a: 1}',
+                                  '{"a": [1,', '{"a": ,}', '{"a": 1]'])
+def test_iter_select_invalid(text):
+    """
+    GIVEN invalid json along the path
+    WHEN selecting values
+    THEN assert TokenizeError is raised
+    """
+    with pytest.raises(TokenizeError):
+        select(text, '.a[0]', 3)
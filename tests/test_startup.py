@@ -0,0 +1,76 @@
+"""jsoncolor start-up regression tests"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+##############################################################################
+# CONSTANTS
+##############################################################################
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+JSONFILE = os.path.join(ROOT, 'tests', 'data', 'test.json')
+
+# modules that must only be imported once highlighting actually runs
+DEFERRED = ('pygments', 'jsonconfig', 'multiprocessing')
+
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+def imported_modules(*args):
+    """Run python with -X importtime and return the names of all imports."""
+    env = dict(os.environ, JSONCOLOR_NO_DAEMON='1')
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [ROOT, env.get('PYTHONPATH')]))
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + list(args),
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          stdin=subprocess.DEVNULL, env=env,
+                          universal_newlines=True)
+    names = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            names.add(line.rsplit('|', 1)[1].strip().split('.')[0])
+    return names
+
+
+##############################################################################
+# TESTS: imports
+##############################################################################
+
+@pytest.mark.parametrize('module', DEFERRED)
+def test_import_cli(module):
+    """
+    GIVEN a fresh interpreter
+    WHEN the command-line interface is imported
+    THEN assert the deferred modules are not imported
+    """
+    assert module not in imported_modules('-c', 'import jsoncolor.cli')
+
+
+@pytest.mark.parametrize('option', ['--nocolor', '--stream'])
+def test_run_nocolor(option):
+    """
+    GIVEN a json file
+    WHEN jsoncolor runs without a color terminal
+    THEN assert pygments and jsonconfig are never imported
+    """
+    names = imported_modules('-m', 'jsoncolor', option, JSONFILE)
+    assert 'jsoncolor' in names
+    assert 'pygments' not in names
+    assert 'jsonconfig' not in names
+
+
+def test_import_client():
+    """
+    GIVEN a fresh interpreter
+    WHEN the thin client, the entry point of the command, is imported
+    THEN assert neither click nor the deferred modules are imported
+    """
+    names = imported_modules('-c', 'import jsoncolor.client')
+    assert 'jsoncolor' in names
+    assert not names.intersection(('click',) + DEFERRED)
@@ -0,0 +1,228 @@
+"""jsoncolor.stream tests"""
+
+import io
+import json
+import time
+
+import pytest
+
+from jsoncolor.core import create_escape_codes
+from jsoncolor.core import format_json
+from jsoncolor.errors import TokenizeError
+from jsoncolor.stream import Tokenizer
+from jsoncolor.stream import iter_chunks
+from jsoncolor.stream import iter_stream
+from jsoncolor.stream import map_file
+from jsoncolor.stream import read_chunks
+
+##############################################################################
+# CONSTANTS
+##############################################################################
+
+DATA = {'a': [1, -2.5, True, False, None, 'x"y\u00e9'], 'b': {}, 'c': [],
+        'd': {'e': [[], {}, 1e100, 12345678901234567890]}}
+
+SOLARIZED = {'Token': '#8a8a8a', 'Keyword': '#d75f00', 'Name_Tag': '#0087ff',
+             'String': '#00afaf', 'Number': '#af005f'}
+
+
+##############################################################################
+# TESTS: map_file() / iter_chunks()
+##############################################################################
+
+def test_map_file(tmpdir):
+    """
+    GIVEN a regular file
+    WHEN memory-mapping it
+    THEN assert the mapping holds the file content
+    """
+    path = tmpdir.join('doc.json')
+    path.write_binary(b'[1, 2]')
+    with open(str(path), 'rb') as fileobj:
+        mapped = map_file(fileobj)
+        assert mapped[:] == b'[1, 2]'
+        mapped.close()
+
+
+def test_map_file_notMappable(tmpdir):
+    """
+    GIVEN an in-memory stream, an empty file and a partly read file
+    WHEN memory-mapping them
+    THEN assert None is returned so buffered reads are used instead
+    """
+    assert map_file(io.BytesIO(b'[1]')) is None
+    path = tmpdir.join('empty.json')
+    path.write_binary(b'')
+    with open(str(path), 'rb') as fileobj:
+        assert map_file(fileobj) is None
+    path.write_binary(b'[1]')
+    with open(str(path), 'rb') as fileobj:
+        fileobj.read(1)
+        assert map_file(fileobj) is None
+
+
+def test_iter_chunks(tmpdir):
+    """
+    GIVEN a regular file and an in-memory stream with the same content
+    WHEN reading both in chunks
+    THEN assert the file is read as memoryview slices with the same bytes
+    """
+    path = tmpdir.join('doc.json')
+    path.write_binary(b'{"key": "value"}')
+    with open(str(path), 'rb') as fileobj:
+        chunks = list(iter_chunks(fileobj, size=5))
+    assert all(isinstance(c, memoryview) for c in chunks)
+    assert b''.join(chunks) == b'{"key": "value"}'
+    chunks = list(iter_chunks(io.BytesIO(b'{"key": "value"}'), size=5))
+    assert b''.join(chunks) == b'{"key": "value"}'
+
+
+##############################################################################
+# TESTS: read_chunks()
+##############################################################################
+
+def test_read_chunks_splitCharacters():
+    """
+    GIVEN utf-8 encoded content with a byte order mark
+    WHEN reading it in chunks that split multi-byte characters
+    THEN assert the characters are decoded and the BOM is dropped
+    """
+    raw = '\ufeff["\u00e9\u20ac"]'.encode('utf-8')
+    chunks = list(read_chunks(io.BytesIO(raw), size=1))
+    assert ''.join(chunks) == '["\u00e9\u20ac"]'
+
+
+##############################################################################
+# TESTS: Tokenizer
+##############################################################################
+
+def test_tokenizer_splitTokens():
+    """
+    GIVEN json text split in the middle of strings, numbers and keywords
+    WHEN tokenizing the pieces one by one
+    THEN assert tokens are only returned once they are complete
+    """
+    tokenizer = Tokenizer()
+    assert tokenizer.feed('{"ke') == [('punct', '{')]
+    assert tokenizer.feed('y": 12') == [('string', '"key"'), ('punct', ':')]
+    assert tokenizer.feed('.5, "n": nu') == [('number', '12.5'),
+                                             ('punct', ','),
+                                             ('string', '"n"'),
+                                             ('punct', ':')]
+    assert tokenizer.feed('ll}') == [('keyword', 'null'), ('punct', '}')]
+    assert tokenizer.close() == []
+
+
+def test_tokenizer_numberAtEnd():
+    """
+    GIVEN a document that ends with a number
+    WHEN the tokenizer is closed
+    THEN assert the number is returned
+    """
+    tokenizer = Tokenizer()
+    assert tokenizer.feed('42') == []
+    assert tokenizer.close() == [('number', '42')]
+
+
+def test_tokenizer_splitEscape():
+    """
+    GIVEN a string split right after a backslash
+    WHEN tokenizing the pieces one by one
+    THEN assert the escape is kept whole
+    """
+    tokenizer = Tokenizer()
+    assert tokenizer.feed('["a\\') == [('punct', '[')]
+    assert tokenizer.feed('"b') == []
+    assert tokenizer.feed('c"]') == [('string', '"a\\"bc"'), ('punct', ']')]
+
+
+def test_tokenizer_longString():
+    """
+    GIVEN a document holding a string of several MB
+    WHEN tokenizing it in 64 KiB pieces
+    THEN assert the string is returned whole, in linear time
+    """
+    text = json.dumps(['x\\"\u00e9' * (2 * 1024 * 1024), 1])
+    tokenizer = Tokenizer()
+    tokens = []
+    start = time.perf_counter()
+    for pos in range(0, len(text), 64 * 1024):
+        tokens += tokenizer.feed(text[pos:pos + 64 * 1024])
+    tokens += tokenizer.close()
+    # quadratic rescanning took over a minute for this
+    assert time.perf_counter() - start < 5
+    assert [kind for kind, _ in tokens] == ['punct', 'string', 'punct',
+                                           'number', 'punct']
+    assert json.loads(tokens[1][1]) == json.loads(text)[0]
+
+
+def test_tokenizer_invalid():
+    """
+    GIVEN text that is not json
+    WHEN tokenizing it
+    THEN assert TokenizeError is raised
+    """
+    with pytest.raises(TokenizeError):
+        Tokenizer().feed('[1, bad]')
+    tokenizer = Tokenizer()
+    tokenizer.feed('["unfinished')
+    with pytest.raises(TokenizeError):
+        tokenizer.close()
+
+
+##############################################################################
+# TESTS: iter_stream()
+##############################################################################
+
+streamargs = [
+    (False, 2, 1), (False, 4, 7), (False, None, 3), (True, None, 64),
+    (False, 0, 5),
+]
+
+
+@pytest.mark.parametrize('comp,ind,size', streamargs)
+def test_iter_stream_noColor(comp, ind, size):
+    """
+    GIVEN a json document read in small chunks
+    WHEN streaming it without escape codes
+    THEN assert the output is identical to format_json()
+    """
+    raw = json.dumps(DATA, ensure_ascii=False, indent=3).encode('utf-8')
+    chunks = read_chunks(io.BytesIO(raw), size=size)
+    out = ''.join(iter_stream(chunks, comp, ind))
+    assert out == format_json(DATA, comp, ind) + '\n'
+
+
+def test_iter_stream_color():
+    """
+    GIVEN a json document and a set of escape codes
+    WHEN streaming it with color
+    THEN assert keys and values are wrapped with their escape codes
+    """
+    escapes = create_escape_codes(SOLARIZED)
+    out = ''.join(iter_stream(['{"k": "v"}'], True, None, escapes))
+    assert out == ('\x1b[38;5;245m{\x1b[39m\x1b[38;5;33m"k"\x1b[39m'
+                   '\x1b[38;5;245m:\x1b[39m\x1b[38;5;37m"v"\x1b[39m'
+                   '\x1b[38;5;245m}\x1b[39m\n')
+
+
+def test_iter_stream_multipleValues():
+    """
+    GIVEN several concatenated json values
+    WHEN streaming them
+    THEN assert each value is written on its own line
+    """
+    out = ''.join(iter_stream(['{"a":1} [2]\n3'], True, None))
+    assert out == '{"a":1}\n[2]\n3\n'
+
+
+@pytest.mark.parametrize('text', ['[1,', '[1 2]', '{"a" 1}', '[1,]',
+                                  '{1: 2}', '{"a": 1]', ']'])
+def test_iter_stream_invalid(text):
+    """
+    GIVEN json text with a syntax error
+    WHEN streaming it
+    THEN assert TokenizeError is raised
+    """
+    with pytest.raises(TokenizeError):
+        ''.join(iter_stream([text]))
@@ -0,0 +1,147 @@
+"""jsoncolor.styles tests"""
+
+import json
+import os
+
+import pytest
+
+from jsoncolor.config import CONFIG
+from jsoncolor.core import COLOR_DEPTHS
+from jsoncolor.core import create_escape_codes
+from jsoncolor.styles import compile_styles
+from jsoncolor.styles import default_escape_codes
+from jsoncolor.styles import load_styles
+
+##############################################################################
+# CONSTANTS
+##############################################################################
+
+MONO = {'Token': '#ffffff', 'Keyword': '#ffffff', 'Name_Tag': '#ffffff',
+        'String': '#ffffff', 'Number': '#ffffff', 'Comment': '#ffffff'}
+
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+@pytest.fixture()
+def paths(tmpdir):
+    """Return the paths of a config file and of its compiled styles."""
+    config = tmpdir.join('config.json')
+    config.write(json.dumps(CONFIG))
+    return str(config), str(tmpdir.join('cache', 'styles.json'))
+
+
+##############################################################################
+# TESTS: compile_styles()
+##############################################################################
+
+def test_compile_styles():
+    """
+    GIVEN a config with styles
+    WHEN compiling it
+    THEN assert the escape codes of every style and depth are computed
+    """
+    config = {'default': 'mono', 'styles': {'mono': MONO, 'sol': {}}}
+    compiled = compile_styles(config)
+    assert compiled['default'] == 'mono'
+    assert sorted(compiled['styles']) == ['mono', 'sol']
+    for colors in COLOR_DEPTHS:
+        assert compiled['styles']['mono'][colors] == create_escape_codes(
+            MONO, colors)
+
+
+def test_compile_styles_noDefault():
+    """
+    GIVEN a config whose default style does not exist
+    WHEN compiling it
+    THEN assert KeyError is raised
+    """
+    with pytest.raises(KeyError):
+        compile_styles({'default': 'x', 'styles': {'mono': MONO}})
+
+
+##############################################################################
+# TESTS: load_styles()
+##############################################################################
+
+def test_load_styles(paths):
+    """
+    GIVEN a config file
+    WHEN loading its styles twice
+    THEN assert they are compiled once and then read back unchanged
+    """
+    config, compiled = paths
+    styles = load_styles(config, compiled)
+    assert os.path.exists(compiled)
+    with open(compiled, 'w') as fileobj:
+        json.dump(dict(styles, default='marker'), fileobj)
+    assert load_styles(config, compiled)['default'] == 'marker'
+
+
+def test_load_styles_touched(paths):
+    """
+    GIVEN compiled styles
+    WHEN the config file is touched without changing it
+    THEN assert the compiled styles are kept with the new mtime
+    """
+    config, compiled = paths
+    styles = load_styles(config, compiled)
+    with open(compiled, 'w') as fileobj:
+        json.dump(dict(styles, default='marker'), fileobj)
+    os.utime(config, (1, 1))
+    styles = load_styles(config, compiled)
+    assert styles['default'] == 'marker'
+    assert styles['mtime'] == 1000000000
+
+
+def test_load_styles_changed(paths):
+    """
+    GIVEN compiled styles
+    WHEN the config file changes
+    THEN assert the styles are compiled again
+    """
+    config, compiled = paths
+    load_styles(config, compiled)
+    with open(config, 'w') as fileobj:
+        json.dump({'default': 'mono', 'styles': {'mono': MONO}}, fileobj)
+    os.utime(config, (1, 1))
+    styles = load_styles(config, compiled)
+    assert styles['default'] == 'mono'
+    assert load_styles(config, compiled) == json.loads(json.dumps(styles))
+
+
+@pytest.mark.parametrize('content', [None, '{', '{}', '{"styles": {}}'])
+def test_load_styles_invalid(tmpdir, content):
+    """
+    GIVEN a missing or invalid config file
+    WHEN loading its styles
+    THEN assert None is returned and nothing is compiled
+    """
+    config = tmpdir.join('config.json')
+    if content is not None:
+        config.write(content)
+    compiled = tmpdir.join('styles.json')
+    assert load_styles(str(config), str(compiled)) is None
+    assert not compiled.exists()
+
+
+##############################################################################
+# TESTS: default_escape_codes()
+##############################################################################
+
+def test_default_escape_codes(paths, monkeypatch):
+    """
+    GIVEN a config file
+    WHEN getting the escape codes of its default style
+    THEN assert they equal those created from the style
+    """
+    config, compiled = paths
+    monkeypatch.setattr('jsoncolor.styles.config_path', lambda: config)
+    monkeypatch.setattr('jsoncolor.styles.compiled_path', lambda: compiled)
+    solarized = CONFIG['styles']['solarized']
+    for colors in COLOR_DEPTHS:
+        assert default_escape_codes(colors) == create_escape_codes(
+            solarized, colors)
+        assert default_escape_codes(colors) == create_escape_codes(
+            colors=colors)
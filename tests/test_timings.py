@@ -0,0 +1,134 @@
+"""jsoncolor.timings tests"""
+
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from jsoncolor.stream import Tokenizer
+from jsoncolor.timings import count_tokens
+from jsoncolor.timings import Timings
+
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+class Clock:
+    """perf_counter() replacement that advances when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock():
+    """Patch the clock of jsoncolor.timings."""
+    clock = Clock()
+    with patch('jsoncolor.timings.time.perf_counter', clock):
+        yield clock
+
+
+##############################################################################
+# TESTS: Timings
+##############################################################################
+
+def test_measure_nested(clock):
+    """
+    GIVEN a stage that pulls chunks from a timed reader
+    WHEN both take time
+    THEN assert each stage is charged only its own time
+    """
+    timings = Timings()
+
+    def chunks():
+        for chunk in (b'ab', b'cde'):
+            clock.sleep(1)
+            yield chunk
+
+    with timings.measure('format') as stage:
+        for chunk in timings.iter('read', chunks(), 'bytes_in'):
+            clock.sleep(10)
+        stage.add('bytes_out', 5)
+    read, fmt = timings.stages['read'], timings.stages['format']
+    assert (read.seconds, read.calls, read.bytes_in) == (2, 3, 5)
+    assert (fmt.seconds, fmt.calls, fmt.bytes_out) == (20, 1, 5)
+
+
+def test_stream(clock):
+    """
+    GIVEN a file object wrapped for timing
+    WHEN writing to it inside another stage
+    THEN assert the writes are timed and counted as their own stage
+    """
+    timings = Timings()
+    out = io.BytesIO()
+    timed = timings.stream('write', out)
+    with timings.measure('format'):
+        clock.sleep(1)
+        timed.write(b'abc')
+        timed.flush()
+    assert out.getvalue() == b'abc'
+    assert timings.stages['write'].bytes_out == 3
+    assert timings.stages['format'].seconds == 1
+
+
+def test_hooks():
+    """
+    GIVEN a hook
+    WHEN stages end
+    THEN assert the hook gets each finished stage
+    """
+    seen = []
+    timings = Timings(hooks=[lambda stage: seen.append(stage.name)])
+    with timings.measure('parse'):
+        pass
+    list(timings.iter('read', ['x']))
+    assert seen == ['parse', 'read']
+
+
+def test_format():
+    """
+    GIVEN timings of some stages
+    WHEN formatting them as text and as json
+    THEN assert only the measured stages are reported, in stage order
+    """
+    timings = Timings()
+    with timings.measure('write'):
+        pass
+    with timings.measure('read') as stage:
+        stage.add('bytes_in', 10)
+    text = timings.format()
+    lines = text.splitlines()
+    assert lines[0].split()[:3] == ['stage', 'calls', 'seconds']
+    names = [line.split()[0] for line in lines[1:]]
+    assert names == ['read', 'write', 'total']
+    report = json.loads(timings.format('json'))
+    assert [s['name'] for s in report['stages']] == ['read', 'write']
+    assert report['stages'][0]['bytes_in'] == 10
+    assert report['stages'][1]['bytes_in'] is None
+
+
+##############################################################################
+# TESTS: count_tokens()
+##############################################################################
+
+@pytest.mark.parametrize('data', [
+    1, [], {}, [1, [2, {}]], {'a': {'b': [True, None]}, 'c': 'd'},
+])
+def test_count_tokens(data):
+    """
+    GIVEN a python object
+    WHEN counting its tokens
+    THEN assert the count matches the streaming tokenizer's
+    """
+    tokenizer = Tokenizer()
+    tokens = tokenizer.feed(json.dumps(data)) + tokenizer.close()
+    assert count_tokens(data) == len(tokens)
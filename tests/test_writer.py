@@ -0,0 +1,108 @@
+"""jsoncolor.writer tests"""
+
+import io
+import sys
+
+from jsoncolor.writer import BATCH_CHARS
+from jsoncolor.writer import ChunkWriter
+
+
+##############################################################################
+# FIXTURES
+##############################################################################
+
+class Stream(io.BytesIO):
+    """BytesIO that records every write."""
+
+    def __init__(self):
+        io.BytesIO.__init__(self)
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        return io.BytesIO.write(self, data)
+
+
+##############################################################################
+# TESTS: ChunkWriter
+##############################################################################
+
+def test_write_buffered():
+    """
+    GIVEN a writer with an 8 byte buffer
+    WHEN writing text and bytes chunks
+    THEN assert the stream only gets full buffers, in order, until flushed
+    """
+    stream = Stream()
+    out = ChunkWriter(stream, buffer_size=8)
+    out.write('abc')
+    out.write(b'def')
+    assert stream.writes == []
+    out.write('ghé')
+    out.flush()
+    assert stream.writes == [b'abcdef', b'gh\xc3\xa9']
+    assert stream.getvalue() == 'abcdefghé'.encode()
+
+
+def test_write_largeChunk():
+    """
+    GIVEN a writer with a 4 byte buffer
+    WHEN writing chunks larger than the buffer
+    THEN assert they bypass the buffer, each in one write
+    """
+    stream = Stream()
+    with ChunkWriter(stream, buffer_size=4) as out:
+        out.write(b'0123456789')
+        out.write('abcdefghij')
+    assert stream.writes == [b'0123456789', b'abcdefghij']
+
+
+def test_write_unbuffered():
+    """
+    GIVEN a writer with buffer_size=0
+    WHEN writing chunks
+    THEN assert every chunk is written at once
+    """
+    stream = Stream()
+    out = ChunkWriter(stream, buffer_size=0)
+    out.writelines(['a', b'b', 'c'])
+    assert stream.writes == [b'a', b'b', b'c']
+
+
+def test_write_unbufferedLarge():
+    """
+    GIVEN a writer with buffer_size=0
+    WHEN writing a text chunk of several batches
+    THEN assert it is written a batch at a time, not character by
+        character
+    """
+    stream = Stream()
+    out = ChunkWriter(stream, buffer_size=0)
+    out.write('x' * (BATCH_CHARS * 3 + 1))
+    assert len(stream.writes) == 4
+    assert stream.getvalue() == b'x' * (BATCH_CHARS * 3 + 1)
+
+
+def test_write_textStream(monkeypatch):
+    """
+    GIVEN sys.stdout without a binary buffer
+    WHEN writing text and bytes that split a multi-byte character
+    THEN assert the text is written to sys.stdout decoded
+    """
+    stdout = io.StringIO()
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    with ChunkWriter() as out:
+        out.writelines(['x', b'\xc3', b'\xa9y'])
+    assert stdout.getvalue() == 'xéy'
+
+
+def test_write_stdout(capsysbinary):
+    """
+    GIVEN text already written to sys.stdout
+    WHEN writing through the default stream
+    THEN assert the output keeps its order
+    """
+    print('first')
+    with ChunkWriter() as out:
+        out.write('second\n')
+    assert capsysbinary.readouterr()[0] == b'first\nsecond\n'